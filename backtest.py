@@ -1,31 +1,75 @@
 """
 Backtest System for Strategy Validation
-Tests strategies against historical data
+Replays stored historical candles through the live strategy and confluence logic
 """
-from datetime import datetime, timedelta
-from typing import Dict, List
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import Dict, Iterator, List, Tuple
 from loguru import logger
+import numpy as np
 import pandas as pd
 from data_fetcher import DataFetcher
-from signal_engine import SignalEngine
-from database import DatabaseManager
+from signal_engine import SignalEngine, ConfluentSignal
+from signal_batch import SignalBatch
+from candle_store import CandleStore
+from history_dataset import HistoryDataset
+from result_cache import SeriesResultCache
+from trade_resolver import resolve_trades, horizon_bars, NS_PER_MINUTE
+from backtest_result import BacktestResult, TradeLog, pnl_bin_edges
+from monte_carlo import run_monte_carlo
+from strategies.ohlcv_view import OHLCVView
+import config
+
 
 class BacktestEngine:
     """Backtest trading strategies"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        store: CandleStore = None,
+        dataset: HistoryDataset = None,
+        result_cache: SeriesResultCache = None,
+        trade_log: TradeLog = None
+    ):
         self.data_fetcher = DataFetcher()
         self.signal_engine = SignalEngine()
-        self.db = DatabaseManager()
+        self.store = store or CandleStore()
+        self.dataset = dataset or HistoryDataset()
+        if result_cache is None and config.BACKTEST_RESULT_CACHE:
+            result_cache = SeriesResultCache()
+        self.result_cache = result_cache
+        if trade_log is None and config.BACKTEST_TRADE_LOG:
+            trade_log = TradeLog()
+        self.trade_log = trade_log
         logger.info("Backtest engine initialized")
     
-    def run_backtest(self, days: int = 30, symbols: List[str] = None) -> Dict:
+    def prepare_data(self, symbols: List[str], days: int):
+        """Download any missing candles for the test window plus indicator warm-up"""
+        end = pd.Timestamp.utcnow().tz_localize(None)
+        
+        for i, symbol in enumerate(symbols, 1):
+            for tf in config.TIMEFRAMES:
+                warmup = pd.Timedelta(minutes=config.TIMEFRAME_MINUTES[tf] * config.BACKTEST_WARMUP_BARS)
+                self.store.sync(self.data_fetcher, symbol, tf, end - pd.Timedelta(days=days) - warmup)
+            
+            if i % 50 == 0:
+                logger.info(f"Historical data ready for {i}/{len(symbols)} symbols")
+    
+    def run_backtest(
+        self,
+        days: int = 30,
+        symbols: List[str] = None,
+        download: bool = True,
+        workers: int = None
+    ) -> Dict:
         """
         Run backtest on historical data
         
         Args:
             days: Number of days to backtest
             symbols: List of symbols to test (None = all USDT pairs)
+            download: Fetch missing candles into the store before testing
+            workers: Worker processes (None = BACKTEST_WORKERS, 1 = run serially)
             
         Returns:
             Backtest results dictionary
@@ -34,102 +78,234 @@ class BacktestEngine:
         
         # Get symbols
         if not symbols:
-            symbols = self.data_fetcher.get_usdt_pairs()[:10]  # Test on first 10 pairs for demo
+            symbols = self.data_fetcher.get_usdt_pairs() if download else self.store.symbols()
         
         logger.info(f"Testing on {len(symbols)} symbols")
         
-        # Collect results
-        all_signals = []
-        total_wins = 0
-        total_losses = 0
-        total_profit = 0
-        total_loss = 0
+        if download:
+            self.prepare_data(symbols, days)
         
-        for symbol in symbols:
-            logger.info(f"Backtesting {symbol}...")
-            
-            # Fetch historical data (we'll simulate)
-            # In production, fetch actual historical data
-            results = self._backtest_symbol(symbol, days)
-            
-            all_signals.extend(results['signals'])
-            total_wins += results['wins']
-            total_losses += results['losses']
-            total_profit += results['total_profit']
-            total_loss += results['total_loss']
+        # Workers read candles from the memory-mapped dataset, not the store;
+        # it is only rebuilt when the download changed the store
+        if not self.dataset.exists() or (download and not self.dataset.is_current(self.store)):
+            self.dataset.build(self.store)
+        
+        if self.result_cache:
+            self.result_cache.prune()
+        
+        if self.trade_log:
+            self.trade_log.reset()
+        
+        # Per-symbol results are folded in as they arrive, in symbol order
+        workers = config.BACKTEST_WORKERS if workers is None else workers
+        if workers > 1 and len(symbols) > 1:
+            parts = self._run_parallel(symbols, days, workers)
+        else:
+            parts = (self._backtest_symbol(symbol, days) for symbol in symbols)
+        
+        result = BacktestResult.merge(parts)
+        
+        if self.trade_log:
+            self.trade_log.write_manifest(symbols)
         
         # Calculate metrics
-        total_trades = total_wins + total_losses
-        win_rate = (total_wins / total_trades * 100) if total_trades > 0 else 0
-        avg_profit = (total_profit / total_wins) if total_wins > 0 else 0
-        avg_loss = (total_loss / total_losses) if total_losses > 0 else 0
+        total_trades = result.wins + result.losses
+        win_rate = (result.wins / total_trades * 100) if total_trades > 0 else 0
+        avg_profit = (result.total_profit / result.wins) if result.wins > 0 else 0
+        avg_loss = (result.total_loss / result.losses) if result.losses > 0 else 0
         
         risk_reward = abs(avg_profit / avg_loss) if avg_loss != 0 else 0
         
         report = {
             'period': f"{days} days",
             'symbols_tested': len(symbols),
-            'total_signals': len(all_signals),
+            'total_signals': len(result),
             'total_trades': total_trades,
-            'wins': total_wins,
-            'losses': total_losses,
+            'wins': result.wins,
+            'losses': result.losses,
             'win_rate': round(win_rate, 2),
             'avg_profit': round(avg_profit, 2),
             'avg_loss': round(avg_loss, 2),
             'risk_reward': round(risk_reward, 2),
-            'signals': all_signals[:10]  # Return first 10 for display
+            'signals': result.preview,  # First trades, for display
+            'by_strategy': result.rollup_table('strategy').to_dict('records'),
+            'by_symbol': result.rollup_table('symbol').to_dict('records'),
+            'pnl_histogram': {'edges': pnl_bin_edges().tolist(), 'counts': result.pnl_histogram.tolist()},
         }
         
+        if len(result):
+            # Capped uniform sample, so memory does not grow with the trades (the trade log is for offline analysis)
+            report['monte_carlo'] = run_monte_carlo(result.pnl_sample, seed=config.MONTE_CARLO_SEED).summary()
+        
         logger.info(f"Backtest complete: {total_trades} trades, {win_rate:.1f}% win rate")
         return report
     
-    def _backtest_symbol(self, symbol: str, days: int) -> Dict:
-        """Backtest single symbol"""
-        # Simulate backtest results
-        # In production: fetch real historical data and run strategies
-        
-        import random
-        
-        # Generate random signals for demo
-        num_signals = random.randint(1, 5)
-        wins = 0
-        losses = 0
-        total_profit = 0
-        total_loss = 0
-        signals = []
-        
-        for _ in range(num_signals):
-            # Simulate signal outcome
-            is_win = random.random() > 0.45  # 55% win rate for demo
+    def _run_parallel(self, symbols: List[str], days: int, workers: int) -> Iterator[BacktestResult]:
+        """Backtest symbols across a process pool, yielding results in input order"""
+        workers = min(workers, len(symbols))
+        chunksize = max(1, len(symbols) // (workers * 4))
+        logger.info(f"Running backtest on {workers} worker processes")
+        
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(
+                str(self.store.root),
+                str(self.dataset.root),
+                str(self.result_cache.root) if self.result_cache else None,
+                str(self.trade_log.root) if self.trade_log else None
+            )
+        ) as executor:
+            # map() yields in submission order, so merging is deterministic
+            yield from executor.map(_backtest_worker, symbols, repeat(days), chunksize=chunksize)
+    
+    def _backtest_symbol(self, symbol: str, days: int) -> BacktestResult:
+        """
+        Backtest single symbol
+        
+        Every closed candle of the finest timeframe is one simulated cycle. At
+        each cycle the latest closed bar of every timeframe is analyzed (using the
+        vectorized whole-history strategy output), the market trend filter and
+        SignalEngine confluence are applied, the coin cooldown is enforced, and
+        each confluent signal opens a position. All positions are then resolved
+        together on the following candles of the finest timeframe.
+        """
+        logger.info(f"Backtesting {symbol}...")
+        results = BacktestResult(symbols_tested=1)
+        
+        data = self.dataset.load_symbol(symbol)
+        data = {tf: view for tf, view in data.items() if len(view) > 1}
+        if not data:
+            logger.warning(f"No stored candles for {symbol}, skipping")
+            return results
+        
+        # Simulated cycles: closes of the finest timeframe inside the test window
+        base_tf = min(data, key=lambda tf: config.TIMEFRAME_MINUTES[tf])
+        base = data[base_tf]
+        base_close_times = base.timestamps + config.TIMEFRAME_MINUTES[base_tf] * NS_PER_MINUTE
+        window_start = base_close_times[-1] - days * 1440 * NS_PER_MINUTE
+        cycle_bars = np.flatnonzero(base_close_times > window_start)
+        cycle_times = base_close_times[cycle_bars]
+        
+        # Strategy output per (timeframe, strategy), sampled at each cycle
+        columns = []
+        trend = np.zeros(len(cycle_bars), dtype=np.int8)
+        trend_known = np.zeros(len(cycle_bars), dtype=bool)
+        
+        for tf in config.TIMEFRAMES:
+            if tf not in data:
+                continue
+            view = data[tf]
+            close_times = view.timestamps + config.TIMEFRAME_MINUTES[tf] * NS_PER_MINUTE
+            bars = np.searchsorted(close_times, cycle_times, side='right') - 1
+            
+            for series in self.signal_engine.analyze_history(view, self.result_cache):
+                directions = np.where(bars >= 0, series.direction[np.clip(bars, 0, None)], 0)
+                columns.append((tf, series, bars, directions))
+        
+        # Market trend filter, same rule as SignalEngine._get_market_trend
+        for tf in ['1d', '4h']:
+            if tf not in data:
+                continue
+            view = data[tf]
+            close_times = view.timestamps + config.TIMEFRAME_MINUTES[tf] * NS_PER_MINUTE
+            bars = np.searchsorted(close_times, cycle_times, side='right') - 1
+            ema200 = self.signal_engine.trend_ema(view)
+            
+            applies = ~trend_known & (bars + 1 > 200)
+            safe_bars = np.clip(bars, 0, None)
+            trend[applies] = np.where(view.close[safe_bars] > ema200[safe_bars], 1, -1)[applies]
+            trend_known |= applies
+        
+        if not columns:
+            return results
+        
+        directions = np.column_stack([column[3] for column in columns])
+        aligned = (trend[:, None] == 0) | (directions == trend[:, None])
+        directions = np.where(aligned, directions, 0)
+        
+        buy_count = np.count_nonzero(directions == 1, axis=1)
+        sell_count = np.count_nonzero(directions == -1, axis=1)
+        confluent_cycles = np.flatnonzero(
+            (buy_count >= config.MIN_CONFLUENCE_SCORE) | (sell_count >= config.MIN_CONFLUENCE_SCORE)
+        )
+        
+        cooldown = config.SIGNAL_COOLDOWN_HOURS * 60 * NS_PER_MINUTE
+        last_signal_time = None
+        entries = []
+        
+        for cycle in confluent_cycles:
+            cycle_time = cycle_times[cycle]
+            if last_signal_time is not None and cycle_time - last_signal_time < cooldown:
+                continue
             
-            if is_win:
-                wins += 1
-                profit = random.uniform(1.5, 4.0)  # 1.5-4% profit
-                total_profit += profit
-                signals.append({
-                    'symbol': symbol,
-                    'direction': 'BUY' if random.random() > 0.5 else 'SELL',
-                    'result': 'WIN',
-                    'pnl': round(profit, 2)
-                })
-            else:
-                losses += 1
-                loss = random.uniform(0.8, 2.0)  # 0.8-2% loss
-                total_loss += loss
-                signals.append({
-                    'symbol': symbol,
-                    'direction': 'BUY' if random.random() > 0.5 else 'SELL',
-                    'result': 'LOSS',
-                    'pnl': round(-loss, 2)
-                })
-        
-        return {
-            'signals': signals,
-            'wins': wins,
-            'losses': losses,
-            'total_profit': total_profit,
-            'total_loss': total_loss
+            batch = SignalBatch()
+            for col, (tf, series, bars, _) in enumerate(columns):
+                if directions[cycle, col] != 0:
+                    batch.append(series.signal_at(bars[cycle], symbol, tf))
+            
+            signals = self.signal_engine.calculate_confluence(batch)
+            if not signals:
+                continue
+            last_signal_time = cycle_time
+            
+            for signal in signals:
+                entries.append((signal, cycle_bars[cycle]))
+        
+        if entries:
+            self._record_trades(results, entries, base, horizon_bars(base_tf))
+        
+        return results
+    
+    def _record_trades(
+        self,
+        results: BacktestResult,
+        entries: List[Tuple[ConfluentSignal, int]],
+        base: OHLCVView,
+        horizon: int
+    ):
+        """
+        Resolve all trades of a symbol at once and add the closed ones to results
+        
+        Trades still open when the stored data ends are left out. The full
+        trades go to the trade log (if enabled); results only keep aggregates.
+        """
+        signals = [signal for signal, _ in entries]
+        entry_bars = np.array([bar for _, bar in entries])
+        entry_price = np.array([signal.price for signal in signals])
+        
+        outcomes = resolve_trades(
+            entry_bars=entry_bars,
+            direction=np.array([1 if signal.direction == 'BUY' else -1 for signal in signals]),
+            entry_price=entry_price,
+            target=np.array([signal.target for signal in signals]),
+            stop_loss=np.array([signal.stop_loss for signal in signals]),
+            high=base.high,
+            low=base.low,
+            close=base.close,
+            horizon=horizon,
+        )
+        
+        closed = outcomes.resolved
+        if len(closed) == 0:
+            return
+        
+        trades = {
+            'symbol': [signals[i].symbol for i in closed],
+            'direction': [signals[i].direction for i in closed],
+            'timeframe': [signals[i].timeframe for i in closed],
+            'strategies': [signals[i].strategies for i in closed],
+            'entry_time': base.timestamps[entry_bars[closed]],
+            'exit_time': base.timestamps[outcomes.exit_bar[closed]],
+            'entry_price': entry_price[closed],
+            'exit_price': outcomes.exit_price[closed],
+            'outcome': outcomes.outcome[closed],
+            'pnl_percent': outcomes.pnl_percent[closed],
         }
+        results.add_trades(trades)
+        
+        if self.trade_log:
+            self.trade_log.write(signals[0].symbol, trades)
     
     def generate_report(self, results: Dict) -> str:
         """Generate text report from backtest results"""
@@ -152,7 +328,38 @@ class BacktestEngine:
 💰 Ortalama Kâr: +{results['avg_profit']}%
 📉 Ortalama Zarar: -{results['avg_loss']}%
 📊 Risk/Reward: 1:{results['risk_reward']}
+"""
+        
+        monte_carlo = results.get('monte_carlo')
+        if monte_carlo:
+            drawdown = monte_carlo['max_drawdown']
+            final_return = monte_carlo['final_return']
+            streak = monte_carlo['max_losing_streak']
+            report += f"""
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+🎲 **MONTE CARLO** ({monte_carlo['runs']} simülasyon, {monte_carlo['method']}, {monte_carlo['seconds']} sn)
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+ℹ️ İşlem başına sermaye payı: %{monte_carlo['position_size'] * 100:g} (işlemler sırayla bileşiklenir, eşzamanlı olanlar dahil)
 
+📉 Maks. Düşüş: %{drawdown['p50']} (medyan), %{drawdown['p95']} (kötü %5)
+💰 Toplam Getiri: %{final_return['p5']} / %{final_return['p50']} / %{final_return['p95']} (%5 / medyan / %95)
+❌ Ardışık Kayıp: {streak['p50']:g} (medyan), {streak['p95']:g} (kötü %5)
+⚠️ Zararla Bitme Olasılığı: %{monte_carlo['loss_probability']}
+💀 İflas Olasılığı: %{monte_carlo['ruin_probability']}
+"""
+        
+        top_strategies = results.get('by_strategy', [])[:5]
+        if top_strategies:
+            report += """
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+🏆 **STRATEJİLER**
+━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
+
+"""
+            for row in top_strategies:
+                report += f"• {row['strategy']}: {row['trades']} işlem, %{row['win_rate']} win, {row['total_pnl']:+}%\n"
+        
+        report += """
 ━━━━━━━━━━━━━━━━━━━━━━━━━━━━━
 💡 **DEĞERLENDİRME**
 """
@@ -170,10 +377,30 @@ class BacktestEngine:
         return report
 
 
+# Per-process engine used by the parallel runner
+_worker_engine: BacktestEngine = None
+
+
+def _init_worker(store_root: str, dataset_root: str, result_cache_root: str = None, trade_log_root: str = None):
+    """Build one engine per worker process"""
+    global _worker_engine
+    _worker_engine = BacktestEngine(
+        store=CandleStore(store_root),
+        dataset=HistoryDataset(dataset_root),
+        result_cache=SeriesResultCache(result_cache_root) if result_cache_root else None,
+        trade_log=TradeLog(trade_log_root) if trade_log_root else None
+    )
+
+
+def _backtest_worker(symbol: str, days: int) -> BacktestResult:
+    """Backtest one symbol in a worker process"""
+    return _worker_engine._backtest_symbol(symbol, days)
+
+
 if __name__ == "__main__":
     # Run backtest
     backtest = BacktestEngine()
-    results = backtest.run_backtest(days=30)
+    results = backtest.run_backtest(days=config.BACKTEST_DAYS)
     
     # Print report
     report = backtest.generate_report(results)
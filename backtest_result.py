@@ -0,0 +1,269 @@
+"""
+Backtest Result - Streaming, mergeable backtest aggregates and trade log
+"""
+import json
+import shutil
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+import pandas as pd
+
+from strategy_details import strategy_names
+from trade_resolver import OUTCOME_NAMES
+import config
+
+# Trades kept in full for display
+PREVIEW_TRADES = 10
+
+# Numeric and text columns of a trade batch
+TRADE_COLUMNS = (
+    'symbol', 'direction', 'timeframe', 'strategies',
+    'entry_time', 'exit_time', 'entry_price', 'exit_price', 'outcome', 'pnl_percent',
+)
+
+
+def pnl_bin_edges() -> np.ndarray:
+    """Edges of the PnL histogram; values outside fall into the first/last bin"""
+    low, high, step = config.BACKTEST_PNL_HISTOGRAM
+    return np.linspace(low, high, int(round((high - low) / step)) + 1)
+
+
+def _sample_keys(trades: Dict[str, object]) -> np.ndarray:
+    """
+    Pseudo-random uint64 priority per trade, derived from the trade itself
+
+    The same trade gets the same key whichever process resolved it, so the
+    bottom-k PnL sample does not depend on how symbols were split.
+    """
+    identity = np.array([
+        zlib.crc32(f"{symbol}|{direction}|{timeframe}|{','.join(details)}".encode())
+        for symbol, direction, timeframe, details in zip(
+            trades['symbol'], trades['direction'], trades['timeframe'], trades['strategies']
+        )
+    ], dtype=np.uint64)
+    # splitmix64 finalizer over entry time and identity
+    x = np.asarray(trades['entry_time'], dtype=np.int64).view(np.uint64) ^ (identity << np.uint64(32))
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+@dataclass(slots=True)
+class BacktestResult:
+    """
+    Running aggregates of a backtest shard
+
+    Trades are folded into counts, sums, a PnL histogram and per-strategy /
+    per-symbol rollups as they are resolved, so memory does not grow with
+    the number of trades. Only the first trades are kept for display, plus
+    a uniform sample of at most BACKTEST_PNL_SAMPLE_LIMIT trade PnLs for
+    Monte Carlo (bottom-k by a per-trade hash key, a mergeable reservoir).
+    Results from separate workers are combined with update() in a fixed
+    order, which reproduces the serial run's totals and sample exactly.
+    """
+    symbols_tested: int = 0
+    trades: int = 0
+    wins: int = 0
+    losses: int = 0
+    total_profit: float = 0
+    total_loss: float = 0
+    pnl_histogram: np.ndarray = field(default_factory=lambda: np.zeros(len(pnl_bin_edges()) - 1, dtype=np.int64))
+    by_strategy: Dict[str, List[float]] = field(default_factory=dict)  # name -> [trades, wins, pnl sum]
+    by_symbol: Dict[str, List[float]] = field(default_factory=dict)  # symbol -> [trades, wins, pnl sum]
+    preview: List[Dict] = field(default_factory=list)
+    pnl_sample: np.ndarray = field(default_factory=lambda: np.empty(0))
+    pnl_sample_keys: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.uint64))
+
+    def __len__(self) -> int:
+        return self.trades
+
+    def add_trades(self, trades: Dict[str, object]):
+        """
+        Fold a batch of closed trades into the aggregates
+
+        Args:
+            trades: Columns as in TRADE_COLUMNS (lists for text, arrays for numbers)
+        """
+        pnl_values = np.asarray(trades['pnl_percent']).tolist()
+        if not pnl_values:
+            return
+
+        for i in range(min(PREVIEW_TRADES - len(self.preview), len(pnl_values))):
+            self.preview.append(_trade_dict(trades, i))
+
+        self._sample(np.asarray(trades['pnl_percent'], dtype=np.float64), _sample_keys(trades))
+
+        edges = pnl_bin_edges()
+        bins = np.clip(np.searchsorted(edges, pnl_values, side='right') - 1, 0, len(edges) - 2)
+        self.pnl_histogram += np.bincount(bins, minlength=len(edges) - 1)
+
+        # Accumulate trade by trade so totals do not depend on batching
+        for i, pnl in enumerate(pnl_values):
+            win = pnl > 0
+            self.trades += 1
+            if win:
+                self.wins += 1
+                self.total_profit += pnl
+            else:
+                self.losses += 1
+                self.total_loss += abs(pnl)
+
+            _add_rollup(self.by_symbol, trades['symbol'][i], win, pnl)
+            for name in strategy_names(trades['strategies'][i]):
+                _add_rollup(self.by_strategy, name, win, pnl)
+
+    def update(self, other: 'BacktestResult'):
+        """Fold another result into this one"""
+        self.symbols_tested += other.symbols_tested
+        self.trades += other.trades
+        self.wins += other.wins
+        self.losses += other.losses
+        self.total_profit += other.total_profit
+        self.total_loss += other.total_loss
+        self.pnl_histogram += other.pnl_histogram
+
+        for rollup, other_rollup in ((self.by_strategy, other.by_strategy), (self.by_symbol, other.by_symbol)):
+            for key, (trades, wins, pnl_sum) in other_rollup.items():
+                totals = rollup.setdefault(key, [0, 0, 0])
+                totals[0] += trades
+                totals[1] += wins
+                totals[2] += pnl_sum
+
+        self.preview.extend(other.preview[:PREVIEW_TRADES - len(self.preview)])
+        self._sample(other.pnl_sample, other.pnl_sample_keys)
+
+    def _sample(self, pnl: np.ndarray, keys: np.ndarray):
+        """Add PnLs to the sample, keeping the BACKTEST_PNL_SAMPLE_LIMIT smallest keys"""
+        pnl_sample = np.concatenate((self.pnl_sample, pnl))
+        pnl_sample_keys = np.concatenate((self.pnl_sample_keys, keys))
+
+        limit = config.BACKTEST_PNL_SAMPLE_LIMIT
+        if len(pnl_sample) > limit:
+            keep = np.lexsort((pnl_sample, pnl_sample_keys))[:limit]
+            pnl_sample, pnl_sample_keys = pnl_sample[keep], pnl_sample_keys[keep]
+        self.pnl_sample, self.pnl_sample_keys = pnl_sample, pnl_sample_keys
+
+    @classmethod
+    def merge(cls, results: Iterable['BacktestResult']) -> 'BacktestResult':
+        """Combine results in the given order"""
+        merged = cls()
+        for result in results:
+            merged.update(result)
+        return merged
+
+    def rollup_table(self, by: str = 'strategy') -> pd.DataFrame:
+        """Per-strategy or per-symbol trades, win rate and PnL, best total PnL first"""
+        rollup = self.by_strategy if by == 'strategy' else self.by_symbol
+        rows = [
+            {
+                by: key,
+                'trades': int(trades),
+                'wins': int(wins),
+                'win_rate': round(wins / trades * 100, 2) if trades else 0.0,
+                'total_pnl': round(pnl_sum, 2),
+            }
+            for key, (trades, wins, pnl_sum) in rollup.items()
+        ]
+        table = pd.DataFrame(rows, columns=[by, 'trades', 'wins', 'win_rate', 'total_pnl'])
+        return table.sort_values('total_pnl', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def _add_rollup(rollup: Dict[str, List[float]], key: str, win: bool, pnl: float):
+    totals = rollup.get(key)
+    if totals is None:
+        totals = rollup[key] = [0, 0, 0]
+    totals[0] += 1
+    totals[1] += win
+    totals[2] += pnl
+
+
+def _trade_dict(trades: Dict[str, object], i: int) -> Dict:
+    """One trade of a column batch as a display dict"""
+    pnl_percent = float(trades['pnl_percent'][i])
+    return {
+        'symbol': trades['symbol'][i],
+        'direction': trades['direction'][i],
+        'timeframe': trades['timeframe'][i],
+        'strategies': trades['strategies'][i],
+        'entry_time': pd.Timestamp(trades['entry_time'][i]),
+        'exit_time': pd.Timestamp(trades['exit_time'][i]),
+        'entry_price': float(trades['entry_price'][i]),
+        'exit_price': float(trades['exit_price'][i]),
+        'outcome': OUTCOME_NAMES[trades['outcome'][i]],
+        'result': 'WIN' if pnl_percent > 0 else 'LOSS',
+        'pnl_percent': pnl_percent,
+        'pnl': round(pnl_percent, 2),
+    }
+
+
+class TradeLog:
+    """
+    Columnar on-disk trade log
+
+    Every symbol's trades are written as one .npz part by whichever process
+    backtested it; manifest.json records the part order of the run.
+    """
+
+    def __init__(self, root: Path = None):
+        self.root = Path(root or config.BACKTEST_TRADE_LOG_DIR)
+
+    def _part_path(self, part: str) -> Path:
+        return self.root / f"{part.replace('/', '_')}.npz"
+
+    def reset(self):
+        """Remove the previous run's log"""
+        if self.root.exists():
+            shutil.rmtree(self.root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def write(self, part: str, trades: Dict[str, object]):
+        """Write one part (e.g. a symbol's trades)"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        np.savez(
+            self._part_path(part),
+            symbol=np.array(trades['symbol'], dtype=str),
+            direction=np.array(trades['direction'], dtype=str),
+            timeframe=np.array(trades['timeframe'], dtype=str),
+            strategies=np.array([', '.join(details) for details in trades['strategies']], dtype=str),
+            entry_time=np.asarray(trades['entry_time'], dtype=np.int64),
+            exit_time=np.asarray(trades['exit_time'], dtype=np.int64),
+            entry_price=np.asarray(trades['entry_price'], dtype=np.float64),
+            exit_price=np.asarray(trades['exit_price'], dtype=np.float64),
+            outcome=np.asarray(trades['outcome'], dtype=np.int8),
+            pnl_percent=np.asarray(trades['pnl_percent'], dtype=np.float64),
+        )
+
+    def write_manifest(self, parts: List[str]):
+        """Record the order of the run's parts"""
+        with open(self.root / 'manifest.json', 'w') as f:
+            json.dump({'parts': parts}, f)
+
+    def parts(self) -> List[Path]:
+        """Existing part files in run order"""
+        manifest = self.root / 'manifest.json'
+        if not manifest.exists():
+            return []
+        with open(manifest) as f:
+            names = json.load(f)['parts']
+        return [path for path in map(self._part_path, names) if path.exists()]
+
+    def column(self, name: str) -> np.ndarray:
+        """One column across all parts"""
+        arrays = []
+        for path in self.parts():
+            with np.load(path, allow_pickle=False) as part:
+                arrays.append(part[name])
+        return np.concatenate(arrays) if arrays else np.empty(0)
+
+    def to_frame(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Load the log (or some columns of it) as a DataFrame"""
+        columns = list(columns or TRADE_COLUMNS)
+        frame = pd.DataFrame({name: self.column(name) for name in columns})
+        for name in ('entry_time', 'exit_time'):
+            if name in frame:
+                frame[name] = pd.to_datetime(frame[name])
+        if 'outcome' in frame:
+            frame['outcome'] = frame['outcome'].map(OUTCOME_NAMES)
+        return frame
@@ -0,0 +1,174 @@
+"""
+Database Benchmark - Write and read throughput under concurrent access
+
+Writer processes save signals and close earlier ones (as the signal loop
+does) while reader processes run the bot/dashboard queries against the
+same SQLite file. Every storage profile is measured on a fresh database
+seeded with the same history.
+"""
+import random
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+import numpy as np
+from sqlalchemy.exc import OperationalError
+
+from database import DatabaseManager
+import config
+
+PROFILES = ("default", "production")
+
+_SYMBOLS = [f"COIN{i}/USDT" for i in range(200)]
+_STRATEGIES = ["Channel Breakout", "RSI Divergence", "Volume Spike", "EMA Cross"]
+
+
+def _signal_data(rng: random.Random) -> Dict:
+    """A random signal in the shape produced by ConfluentSignal.to_dict()"""
+    price = rng.uniform(0.1, 100)
+    direction = rng.choice(("BUY", "SELL"))
+    sign = 1 if direction == "BUY" else -1
+    timeframe = rng.choice(config.TIMEFRAMES)
+    return {
+        'symbol': rng.choice(_SYMBOLS),
+        'timeframe': timeframe,
+        'strategies': [f"{name} ({timeframe})" for name in rng.sample(_STRATEGIES, 2)],
+        'direction': direction,
+        'entry_price': price,
+        'target': price * (1 + sign * 0.03),
+        'stop_loss': price * (1 - sign * 0.015),
+        'confidence_score': 2,
+        'reason': "benchmark",
+    }
+
+
+def _seed(db_path: str, profile: str, signals: int):
+    """Fill a database with history, about two thirds of it closed"""
+    db = DatabaseManager(db_path, profile)
+    rng = random.Random(0)
+    for _ in range(signals):
+        signal_id = db.save_signal(_signal_data(rng))
+        if rng.random() < 0.66:
+            db.update_signal_performance(signal_id, rng.uniform(0.1, 100), win=rng.random() < 0.5)
+    db.engine.dispose()
+
+
+def _writer(db_path: str, profile: str, start_at: float, seconds: float, seed: int) -> Dict:
+    """Save a signal, then close a random earlier one, until the deadline"""
+    db = DatabaseManager(db_path, profile)
+    rng = random.Random(seed)
+    saved: List[int] = []
+    latencies = []
+    errors = 0
+
+    time.sleep(max(0.0, start_at - time.time()))
+    deadline = start_at + seconds
+    while time.time() < deadline:
+        began = time.perf_counter()
+        try:
+            if saved and rng.random() < 0.5:
+                db.update_signal_performance(saved.pop(rng.randrange(len(saved))), rng.uniform(0.1, 100), win=True)
+            else:
+                saved.append(db.save_signal(_signal_data(rng)))
+        except OperationalError:
+            errors += 1
+            continue
+        latencies.append(time.perf_counter() - began)
+
+    db.engine.dispose()
+    return {'ops': len(latencies), 'errors': errors, 'latencies': latencies}
+
+
+def _reader(db_path: str, profile: str, start_at: float, seconds: float, seed: int) -> Dict:
+    """Cycle through the bot and dashboard queries until the deadline"""
+    db = DatabaseManager(db_path, profile)
+    queries = (db.get_overall_stats, db.get_recent_signals, db.get_open_signals, db.get_signal_history)
+    latencies = []
+    errors = 0
+
+    time.sleep(max(0.0, start_at - time.time()))
+    deadline = start_at + seconds
+    i = seed
+    while time.time() < deadline:
+        began = time.perf_counter()
+        try:
+            queries[i % len(queries)]()
+        except OperationalError:
+            errors += 1
+            continue
+        finally:
+            i += 1
+        latencies.append(time.perf_counter() - began)
+
+    db.engine.dispose()
+    return {'ops': len(latencies), 'errors': errors, 'latencies': latencies}
+
+
+def _summary(results: List[Dict], seconds: float) -> Dict:
+    latencies = np.array([value for result in results for value in result['latencies']]) * 1000
+    ops = sum(result['ops'] for result in results)
+    return {
+        'ops_per_second': round(ops / seconds, 1),
+        'p50_ms': round(float(np.percentile(latencies, 50)), 2) if len(latencies) else None,
+        'p95_ms': round(float(np.percentile(latencies, 95)), 2) if len(latencies) else None,
+        'errors': sum(result['errors'] for result in results),
+    }
+
+
+def run_benchmark(
+    profile: str,
+    writers: int = None,
+    readers: int = None,
+    seconds: float = None,
+    seed_signals: int = None
+) -> Dict:
+    """
+    Measure one storage profile
+
+    Args:
+        profile: Storage profile name (see database.sqlite_pragmas)
+        writers: Concurrent writer processes
+        readers: Concurrent reader processes
+        seconds: Length of the measured window
+        seed_signals: Signals in the database before measuring
+
+    Returns:
+        Writes and reads per second, latency percentiles and lock errors
+    """
+    writers = config.DB_BENCHMARK_WRITERS if writers is None else writers
+    readers = config.DB_BENCHMARK_READERS if readers is None else readers
+    seconds = seconds or config.DB_BENCHMARK_SECONDS
+    seed_signals = config.DB_BENCHMARK_SEED_SIGNALS if seed_signals is None else seed_signals
+
+    with tempfile.TemporaryDirectory(prefix="db_benchmark_") as tmp:
+        db_path = str(Path(tmp) / "benchmark.db")
+        _seed(db_path, profile, seed_signals)
+
+        with ProcessPoolExecutor(max_workers=writers + readers) as pool:
+            # Start every process at the same moment, after the pool has spun up
+            start_at = time.time() + 1.0
+            write_jobs = [pool.submit(_writer, db_path, profile, start_at, seconds, i) for i in range(writers)]
+            read_jobs = [pool.submit(_reader, db_path, profile, start_at, seconds, i) for i in range(readers)]
+            write_results = [job.result() for job in write_jobs]
+            read_results = [job.result() for job in read_jobs]
+
+    return {
+        'profile': profile,
+        'writers': writers,
+        'readers': readers,
+        'writes': _summary(write_results, seconds),
+        'reads': _summary(read_results, seconds),
+    }
+
+
+if __name__ == "__main__":
+    for profile in PROFILES:
+        report = run_benchmark(profile)
+        print(
+            f"{profile:>10}: "
+            f"{report['writes']['ops_per_second']:>8} writes/s "
+            f"(p95 {report['writes']['p95_ms']} ms, {report['writes']['errors']} lock errors) | "
+            f"{report['reads']['ops_per_second']:>8} reads/s "
+            f"(p95 {report['reads']['p95_ms']} ms, {report['reads']['errors']} lock errors)"
+        )
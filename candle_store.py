@@ -0,0 +1,89 @@
+"""
+Candle Store - On-disk history of closed OHLCV candles for backtesting
+"""
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import pandas as pd
+from loguru import logger
+import config
+
+
+class CandleStore:
+    """Stores closed candles per (symbol, timeframe) and syncs them incrementally"""
+
+    def __init__(self, root: Path = None):
+        self.root = Path(root or config.CANDLE_STORE_DIR)
+
+    def _path(self, symbol: str, timeframe: str) -> Path:
+        return self.root / timeframe / f"{symbol.replace('/', '_')}.pkl"
+
+    def load(self, symbol: str, timeframe: str) -> Optional[pd.DataFrame]:
+        """Load stored candles (None if nothing is stored)"""
+        path = self._path(symbol, timeframe)
+        if not path.exists():
+            return None
+        return pd.read_pickle(path)
+
+    def load_symbol(self, symbol: str, timeframes: Iterable[str] = None) -> Dict[str, pd.DataFrame]:
+        """Load all stored timeframes of a symbol"""
+        result = {}
+        for tf in timeframes or config.TIMEFRAMES:
+            df = self.load(symbol, tf)
+            if df is not None and not df.empty:
+                result[tf] = df
+        return result
+
+    def save(self, symbol: str, timeframe: str, df: pd.DataFrame):
+        """Replace the stored candles of a series"""
+        path = self._path(symbol, timeframe)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        df.to_pickle(path)
+
+    def symbols(self, timeframe: str = None) -> List[str]:
+        """Symbols with stored candles for a timeframe"""
+        timeframe = timeframe or config.TIMEFRAMES[0]
+        folder = self.root / timeframe
+        if not folder.exists():
+            return []
+        return sorted(path.stem.replace('_', '/') for path in folder.glob('*.pkl'))
+
+    def signature(self, timeframe: str) -> List[int]:
+        """[file count, latest mtime in ns] of a timeframe's stored series; changes whenever one is saved"""
+        folder = self.root / timeframe
+        if not folder.exists():
+            return [0, 0]
+        mtimes = [path.stat().st_mtime_ns for path in folder.glob('*.pkl')]
+        return [len(mtimes), max(mtimes, default=0)]
+
+    def sync(self, fetcher, symbol: str, timeframe: str, since: pd.Timestamp) -> Optional[pd.DataFrame]:
+        """
+        Make sure closed candles from `since` onwards are stored
+
+        Only candles after the last stored one are downloaded. The still-forming
+        candle is never stored.
+        """
+        stored = self.load(symbol, timeframe)
+        tf_delta = pd.Timedelta(minutes=config.TIMEFRAME_MINUTES[timeframe])
+        now = pd.Timestamp.utcnow().tz_localize(None)
+
+        if stored is not None and not stored.empty and stored.index[0] <= since:
+            fetch_from = stored.index[-1] + tf_delta
+        else:
+            stored = None
+            fetch_from = since
+
+        # Nothing new can have closed yet
+        if fetch_from + tf_delta > now:
+            return stored
+
+        fresh = fetcher.fetch_ohlcv_range(symbol, timeframe, int(fetch_from.timestamp() * 1000))
+        if fresh is None or fresh.empty:
+            return stored
+
+        fresh = fresh[fresh.index + tf_delta <= now]
+        merged = pd.concat([stored, fresh]) if stored is not None else fresh
+        merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+
+        self.save(symbol, timeframe, merged)
+        logger.debug(f"Stored {len(fresh)} new {timeframe} candles for {symbol}")
+        return merged
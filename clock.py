@@ -0,0 +1,35 @@
+"""
+Clock - Source of the current time, replaceable by a simulated clock
+"""
+from datetime import datetime, timedelta
+from typing import Optional
+
+
+class SimulatedClock:
+    """Clock that only moves when told to (for replays)"""
+
+    def __init__(self, start: datetime):
+        self.now = start
+
+    def utcnow(self) -> datetime:
+        return self.now
+
+    def set(self, now: datetime):
+        self.now = now
+
+    def advance(self, delta: timedelta):
+        self.now += delta
+
+
+_clock: Optional[SimulatedClock] = None
+
+
+def utcnow() -> datetime:
+    """Current UTC time (naive), simulated if a clock is installed"""
+    return _clock.utcnow() if _clock is not None else datetime.utcnow()
+
+
+def install(clock: Optional[SimulatedClock]):
+    """Use a simulated clock everywhere (None restores the wall clock)"""
+    global _clock
+    _clock = clock
@@ -12,6 +12,11 @@ load_dotenv()
 PROJECT_ROOT = Path(__file__).parent
 CHARTS_DIR = PROJECT_ROOT / "charts"
 LOGS_DIR = PROJECT_ROOT / "logs"
+DATA_DIR = PROJECT_ROOT / "data"
+CANDLE_STORE_DIR = DATA_DIR / "candles"
+HISTORY_DATASET_DIR = DATA_DIR / "dataset"
+RESULT_CACHE_DIR = DATA_DIR / "results"
+BACKTEST_TRADE_LOG_DIR = DATA_DIR / "trade_log"
 
 # Create directories if they don't exist
 CHARTS_DIR.mkdir(exist_ok=True)
@@ -23,6 +28,25 @@ TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID", "")
 
 # Database settings
 DATABASE_PATH = os.getenv("DATABASE_PATH", "./crypto_signals.db")
+DATABASE_PROFILE = os.getenv("DATABASE_PROFILE", "production")  # "production" (WAL, tuned pragmas) or "default"
+SQLITE_JOURNAL_MODE = "WAL"  # Readers and the writer do not block each other
+SQLITE_SYNCHRONOUS = "NORMAL"  # fsync at checkpoints only; safe against corruption in WAL mode
+SQLITE_CACHE_SIZE_MB = 64  # Page cache per connection
+SQLITE_MMAP_SIZE_MB = 256  # Memory-mapped reads
+SQLITE_BUSY_TIMEOUT_MS = 10000  # Wait this long for another process's write lock
+DATABASE_POOL_SIZE = 5  # Connections kept open per process
+DATABASE_MAX_OVERFLOW = 10  # Extra connections opened under load
+DATABASE_POOL_TIMEOUT = 30  # Seconds to wait for a free connection
+DB_WRITE_BEHIND = True  # Commit signal saves and closes on a writer thread instead of the cycle thread
+DB_WRITER_QUEUE_SIZE = 10000  # Pending writes before submitting blocks
+DB_WRITER_BATCH_SIZE = 500  # Max writes per commit
+DB_WRITER_FLUSH_SECONDS = 1.0  # Max wait before a partial batch is committed
+
+# Archival of closed signals to <database>_archive.db (python manage_db.py archive)
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "90"))  # Closed signals older than this leave the hot database
+ARCHIVE_BATCH_SIZE = 5000  # Signals moved per transaction
+ARCHIVE_VACUUM_PAGES = 0  # Free pages returned to the OS after archiving (0 = all)
+ARCHIVE_INTERVAL_HOURS = 24  # How often the signal loop runs the archival job (0 = never)
 
 # Logging settings
 LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -34,9 +58,11 @@ MARKET_FILTER_SYMBOL = "BTC/USDT"  # Symbol used for market trend filtering
 
 # Timeframes to analyze
 TIMEFRAMES = ["15m", "1h", "4h", "1d"]
+TIMEFRAME_MINUTES = {"15m": 15, "1h": 60, "4h": 240, "1d": 1440}
 
 # Data fetching settings
 OHLCV_LIMIT = 100  # Number of candles to fetch per request
+OHLCV_PAGE_LIMIT = 1000  # Max candles per request when paging through history
 RATE_LIMIT_DELAY = 0.05  # Delay between requests in seconds
 MAX_CONCURRENT_REQUESTS = 20  # Max parallel requests
 
@@ -97,4 +123,64 @@ DEFAULT_STOP_LOSS_PERCENT = 1.5  # 1.5% stop loss
 
 # Performance tracking
 BACKTEST_DAYS = 90  # Days of historical data for backtesting
+BACKTEST_WARMUP_BARS = 250  # Extra candles per timeframe before the test window (indicator warm-up)
+BACKTEST_WORKERS = max(1, (os.cpu_count() or 1) - 1)  # Processes for the backtest (1 = serial)
+BACKTEST_RESULT_CACHE = True  # Reuse strategy output for unchanged (candles, strategy code, params)
+RESULT_CACHE_MAX_AGE_DAYS = 7  # Cached strategy output unused for this long is deleted
+BACKTEST_TRADE_LOG = True  # Write every trade to a columnar log instead of keeping them in memory
+BACKTEST_PNL_HISTOGRAM = (-10.0, 10.0, 0.5)  # Trade PnL % histogram: low, high, bin width
+BACKTEST_PNL_SAMPLE_LIMIT = 100_000  # Trade PnLs sampled (uniformly, once over the cap) for Monte Carlo
 PERFORMANCE_REVIEW_HOURS = 24  # Hours to wait before marking signal as win/loss
+MONTE_CARLO_RUNS = 10000  # Resampled trade sequences in the backtest report
+MONTE_CARLO_METHOD = "bootstrap"  # "bootstrap" (with replacement) or "shuffle" (reorder, ~1.5x slower)
+MONTE_CARLO_POSITION_SIZE = 0.02  # Fraction of equity risked per trade; trades compound one after another
+MONTE_CARLO_SEED = 42  # Fixed seed so repeated backtest reports match
+PERFORMANCE_TIMEFRAME = "1h"  # Candles scanned for target/stop touches of open signals
+PERFORMANCE_DRILL_TIMEFRAME = "15m"  # Finer candles for bars touching both levels
+
+# Database benchmark (python benchmark_db.py)
+DB_BENCHMARK_WRITERS = 2  # Concurrent writer processes (signal loops)
+DB_BENCHMARK_READERS = 4  # Concurrent reader processes (bot commands, dashboard)
+DB_BENCHMARK_SECONDS = 10  # Measured window per profile
+DB_BENCHMARK_SEED_SIGNALS = 5000  # Signals stored before measuring
+
+# Replay benchmark (python replay.py)
+REPLAY_SYMBOLS = 50  # Pairs from the history dataset to replay
+REPLAY_HOURS = 24  # Simulated hours, ending at the last stored candle
+
+# Parameter sweep (python sweep.py)
+SWEEP_HISTORY_LIMIT = 1000  # Candles per series (Binance max per request)
+SWEEP_SYMBOLS = 10  # Number of pairs to sweep on
+SWEEP_MIN_TRADES = 5  # Hide configurations with fewer trades from the ranking
+WALK_FORWARD_FOLDS = 12  # Train/test splits (python walk_forward.py)
+WALK_FORWARD_TRAIN_DAYS = 60  # Days each train window covers
+WALK_FORWARD_TEST_DAYS = 7  # Days each test window covers (folds step by this much)
+WALK_FORWARD_SYMBOLS = 20  # Number of pairs to run the walk-forward on
+SWEEP_GRID = {
+    "rsi_divergence": {
+        "rsi_period": [9, 14, 21],
+        "rsi_oversold": [25, 30, 35],
+        "rsi_overbought": [65, 70, 75],
+        "min_price_swing": [0.02, 0.03],
+    },
+    "volume_spike": {
+        "volume_period": [10, 20, 30],
+        "spike_multiplier": [1.5, 2.0, 2.5, 3.0],
+        "min_candle_body": [0.005, 0.01, 0.02],
+    },
+    "ema_cross": {
+        "fast_period": [20, 50],
+        "slow_period": [100, 200],
+        "min_adx": [20, 25, 30],
+    },
+    "macd": {
+        "fast_period": [8, 12],
+        "slow_period": [21, 26],
+        "signal_period": [7, 9],
+    },
+    "bollinger_bands": {
+        "period": [14, 20, 30],
+        "std_dev": [1.5, 2.0, 2.5],
+        "squeeze_threshold": [0.03, 0.05, 0.08],
+    },
+}
@@ -0,0 +1,48 @@
+"""
+Cooldown Index - In-memory per-coin signal cooldowns
+"""
+from datetime import datetime, timedelta
+from typing import Dict, Iterable
+from loguru import logger
+
+from database import DatabaseManager
+import clock
+import config
+
+
+class CooldownIndex:
+    """
+    Last signal time per coin, kept in memory
+
+    Loaded from coin metadata in one query (at startup and once per cycle,
+    which also picks up signals saved by other processes) and updated on
+    every save, so cooldown checks do not touch the database. Reloads keep
+    newer in-memory times of saves still queued in the database writer.
+    """
+
+    def __init__(self, db: DatabaseManager, cooldown_hours: float = None):
+        self.db = db
+        self.cooldown = timedelta(hours=cooldown_hours or config.SIGNAL_COOLDOWN_HOURS)
+        self.last_signal: Dict[str, datetime] = {}
+
+    def refresh(self):
+        """Reload last signal times from the database"""
+        stored = self.db.get_last_signal_times()
+        for symbol, last in self.last_signal.items():
+            if symbol not in stored or last > stored[symbol]:
+                stored[symbol] = last
+        self.last_signal = stored
+        logger.debug(f"Cooldown index loaded: {len(self.last_signal)} coins")
+
+    def can_send(self, symbol: str, now: datetime = None) -> bool:
+        """Same rule as DatabaseManager.can_send_signal, without a query"""
+        last = self.last_signal.get(symbol)
+        if last is None:
+            return True
+        return (now or clock.utcnow()) - last >= self.cooldown
+
+    def record(self, symbols: Iterable[str], when: datetime = None):
+        """Start the cooldown of freshly saved signals"""
+        when = when or clock.utcnow()
+        for symbol in symbols:
+            self.last_signal[symbol] = when
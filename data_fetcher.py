@@ -74,21 +74,7 @@ class DataFetcher:
             if not ohlcv:
                 return None
             
-            # Convert to DataFrame
-            df = pd.DataFrame(
-                ohlcv,
-                columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
-            )
-            
-            # Convert timestamp to datetime
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            df.set_index('timestamp', inplace=True)
-            
-            # Ensure numeric types
-            for col in ['open', 'high', 'low', 'close', 'volume']:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-            
-            return df
+            return self._to_dataframe(ohlcv)
             
         except ccxt.NetworkError as e:
             logger.warning(f"Network error fetching {symbol} {timeframe}: {e}")
@@ -100,6 +86,77 @@ class DataFetcher:
             logger.error(f"Unexpected error fetching {symbol} {timeframe}: {e}")
             return None
     
+    def fetch_ohlcv_range(
+        self,
+        symbol: str,
+        timeframe: str,
+        since: int,
+        until: int = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Fetch OHLCV candles opened in [since, until), paging through the exchange limit
+        
+        Args:
+            symbol: Trading pair
+            timeframe: Timeframe string
+            since: Start timestamp in milliseconds
+            until: End timestamp in milliseconds (None = now)
+        """
+        until = until or self.exchange.milliseconds()
+        rows = []
+        cursor = since
+        
+        try:
+            while cursor < until:
+                batch = self.exchange.fetch_ohlcv(
+                    symbol,
+                    timeframe=timeframe,
+                    since=cursor,
+                    limit=config.OHLCV_PAGE_LIMIT
+                )
+                if not batch:
+                    break
+                
+                rows.extend(candle for candle in batch if candle[0] < until)
+                
+                if batch[-1][0] < cursor:
+                    break
+                cursor = batch[-1][0] + 1
+                time.sleep(config.RATE_LIMIT_DELAY)  # Rate limiting
+            
+        except ccxt.NetworkError as e:
+            logger.warning(f"Network error fetching history {symbol} {timeframe}: {e}")
+            return None
+        except ccxt.ExchangeError as e:
+            logger.warning(f"Exchange error fetching history {symbol} {timeframe}: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error fetching history {symbol} {timeframe}: {e}")
+            return None
+        
+        if not rows:
+            return None
+        
+        df = self._to_dataframe(rows)
+        return df[~df.index.duplicated(keep='last')]
+    
+    def _to_dataframe(self, ohlcv: list) -> pd.DataFrame:
+        """Convert raw exchange candles to an OHLCV DataFrame indexed by open time"""
+        df = pd.DataFrame(
+            ohlcv,
+            columns=['timestamp', 'open', 'high', 'low', 'close', 'volume']
+        )
+        
+        # Convert timestamp to datetime
+        df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+        df.set_index('timestamp', inplace=True)
+        
+        # Ensure numeric types
+        for col in ['open', 'high', 'low', 'close', 'volume']:
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+        
+        return df
+    
     def fetch_symbol_data(self, symbol: str, timeframes: List[str] = None) -> Dict[str, pd.DataFrame]:
         """Fetch data for a single symbol across multiple timeframes"""
         timeframes = timeframes or config.TIMEFRAMES
@@ -1,12 +1,19 @@
 """
 Database layer for signal storage and performance tracking
 """
+import re
 from datetime import datetime, timedelta
-from typing import Optional, List, Dict
-from sqlalchemy import create_engine, Column, Integer, String, Float, Boolean, DateTime, JSON, ForeignKey
+from pathlib import Path
+from typing import Optional, List, Dict, Tuple
+from sqlalchemy import create_engine, event, func, insert, select, delete, text, tuple_, literal_column, Index, MetaData, Column, Integer, String, Float, Boolean, DateTime, JSON, ForeignKey
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session, relationship
 from contextlib import contextmanager
+from loguru import logger
+from strategy_details import strategy_names
+import clock
 import config
 
 Base = declarative_base()
@@ -26,11 +33,19 @@ class Signal(Base):
     stop_loss = Column(Float, nullable=False)
     confidence_score = Column(Integer, nullable=False)  # Number of strategies agreeing
     reason = Column(String(500), nullable=True)
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    created_at = Column(DateTime, default=clock.utcnow, nullable=False, index=True)
     status = Column(String(10), default="open", nullable=False)  # open, closed, expired
     
     # Relationship
     performance = relationship("Performance", back_populates="signal", uselist=False)
+    
+    __table_args__ = (
+        # Per-coin newest-first listing and keyset pagination; across all coins
+        # the created_at index serves this, since SQLite appends the id to it
+        Index("ix_signals_symbol_created_id", "symbol", "created_at", "id"),
+        # Only open signals are indexed, so tracking them does not scan history
+        Index("ix_signals_open", "id", sqlite_where=text("status = 'open'")),
+    )
 
 
 class Performance(Base):
@@ -48,6 +63,23 @@ class Performance(Base):
     signal = relationship("Signal", back_populates="performance")
 
 
+class SignalStrategy(Base):
+    """One contributing strategy of a signal (normalized from Signal.strategies)"""
+    __tablename__ = "signal_strategies"
+    
+    id = Column(Integer, primary_key=True)
+    signal_id = Column(Integer, ForeignKey("signals.id"), nullable=False, index=True)
+    strategy = Column(String(50), nullable=False)
+    timeframe = Column(String(10), nullable=False)
+    confidence = Column(Float, nullable=True)  # Unknown for migrated rows
+    reason = Column(String(500), nullable=True)
+    created_at = Column(DateTime, nullable=False)  # Copy of the signal's, for range scans
+    
+    __table_args__ = (
+        Index("ix_signal_strategies_strategy_tf_created", "strategy", "timeframe", "created_at"),
+    )
+
+
 class CoinMetadata(Base):
     """Metadata for each coin - prevent spam"""
     __tablename__ = "coin_metadata"
@@ -59,14 +91,254 @@ class CoinMetadata(Base):
     total_losses = Column(Integer, default=0)
 
 
+class StatsRollup(Base):
+    """Running statistics per scope, kept up to date on every save and close"""
+    __tablename__ = "stats_rollup"
+    
+    scope = Column(String(10), primary_key=True)  # overall, strategy, symbol, timeframe, day
+    key = Column(String(50), primary_key=True)  # "" for overall; day = signal creation date
+    signals = Column(Integer, default=0, nullable=False)
+    closed = Column(Integer, default=0, nullable=False)
+    wins = Column(Integer, default=0, nullable=False)
+    losses = Column(Integer, default=0, nullable=False)
+    pnl_sum = Column(Float, default=0, nullable=False)
+    pnl_sq_sum = Column(Float, default=0, nullable=False)
+    profit_sum = Column(Float, default=0, nullable=False)  # Winning closes with non-zero PnL
+    profit_count = Column(Integer, default=0, nullable=False)
+    loss_sum = Column(Float, default=0, nullable=False)  # Losing closes with non-zero PnL
+    loss_count = Column(Integer, default=0, nullable=False)
+
+
+# Tables moved to the archive database, parents first
+ARCHIVED_TABLES = (Signal.__table__, Performance.__table__, SignalStrategy.__table__)
+
+ROLLUP_SCOPES = ("overall", "strategy", "symbol", "timeframe", "day")
+_ROLLUP_COLUMNS = (
+    "signals", "closed", "wins", "losses", "pnl_sum", "pnl_sq_sum",
+    "profit_sum", "profit_count", "loss_sum", "loss_count",
+)
+
+
+_STRATEGY_DETAIL = re.compile(r"^(?P<name>.*) \((?P<timeframe>[^)]*)\)$")
+
+
+def parse_strategy_components(strategies: List[str], timeframe: str, reason: Optional[str]) -> List[Dict]:
+    """
+    Per-strategy rows of a stored signal
+    
+    Multi-strategy signals list "Name (tf)" entries; a bare name takes the
+    signal's own timeframe. Reasons were joined with " | " in strategy order
+    (plus an optional MTF note), so they are matched up only when the counts
+    agree. Confidence is not stored on signals and is left unknown.
+    """
+    strategies = strategies or []
+    reasons = reason.split(" | ") if reason else []
+    if len(reasons) not in (len(strategies), len(strategies) + 1):
+        reasons = []
+    
+    components = []
+    for i, detail in enumerate(strategies):
+        match = _STRATEGY_DETAIL.match(detail)
+        components.append({
+            "strategy": match.group("name") if match else detail,
+            "timeframe": match.group("timeframe") if match else timeframe,
+            "confidence": None,
+            "reason": reasons[i] if reasons else None,
+        })
+    return components
+
+
+def rollup_keys(symbol: str, timeframe: str, strategies: List[str], created_at: datetime) -> List[Tuple[str, str]]:
+    """(scope, key) rows a signal counts towards"""
+    keys = [("overall", ""), ("symbol", symbol), ("timeframe", timeframe), ("day", created_at.date().isoformat())]
+    keys.extend(("strategy", name) for name in strategy_names(strategies or []))
+    return keys
+
+
+def _close_delta(pnl_percent: Optional[float], win: bool, sign: int = 1) -> Dict[str, float]:
+    """Rollup change from closing a signal (sign=-1 takes a close back)"""
+    pnl = pnl_percent or 0.0
+    delta = {"closed": sign, "wins" if win else "losses": sign, "pnl_sum": sign * pnl, "pnl_sq_sum": sign * pnl * pnl}
+    if pnl:
+        prefix = "profit" if win else "loss"
+        delta[f"{prefix}_sum"] = sign * pnl
+        delta[f"{prefix}_count"] = sign
+    return delta
+
+
+def _add_delta(deltas: Dict[Tuple[str, str], Dict[str, float]], keys: List[Tuple[str, str]], delta: Dict[str, float]):
+    for rollup_key in keys:
+        totals = deltas.setdefault(rollup_key, {})
+        for column, value in delta.items():
+            totals[column] = totals.get(column, 0) + value
+
+
+def _apply_rollup(session: Session, deltas: Dict[Tuple[str, str], Dict[str, float]]):
+    """Add deltas to the rollup rows in one executemany upsert"""
+    if not deltas:
+        return
+    rows = [
+        {"scope": scope, "key": key, **{column: delta.get(column, 0) for column in _ROLLUP_COLUMNS}}
+        for (scope, key), delta in deltas.items()
+    ]
+    upsert = sqlite_insert(StatsRollup)
+    session.execute(
+        upsert.on_conflict_do_update(
+            index_elements=[StatsRollup.scope, StatsRollup.key],
+            set_={column: getattr(StatsRollup, column) + getattr(upsert.excluded, column) for column in _ROLLUP_COLUMNS}
+        ),
+        rows
+    )
+
+
+def _stats_dict(total_signals: int, closed_signals: int, total_wins: int, total_losses: int,
+                avg_profit: Optional[float], avg_loss: Optional[float]) -> Dict:
+    """Overall statistics in the shape returned by get_overall_stats"""
+    win_rate = (total_wins / closed_signals * 100) if closed_signals > 0 else 0
+    return {
+        "total_signals": total_signals,
+        "closed_signals": closed_signals,
+        "open_signals": total_signals - closed_signals,
+        "total_wins": total_wins,
+        "total_losses": total_losses,
+        "win_rate": round(win_rate, 2),
+        "avg_profit": round(avg_profit or 0, 2),
+        "avg_loss": round(avg_loss or 0, 2),
+    }
+
+
+def sqlite_pragmas(profile: str = None) -> Dict[str, object]:
+    """PRAGMA settings applied to every connection of a storage profile"""
+    profile = profile or config.DATABASE_PROFILE
+    if profile == "default":
+        return {}
+    if profile != "production":
+        raise ValueError(f"Unknown database profile: {profile}")
+
+    return {
+        "auto_vacuum": "INCREMENTAL",  # Takes effect on new files; archival converts old ones
+        "journal_mode": config.SQLITE_JOURNAL_MODE,
+        "synchronous": config.SQLITE_SYNCHRONOUS,
+        "cache_size": -config.SQLITE_CACHE_SIZE_MB * 1024,  # Negative = KiB
+        "mmap_size": config.SQLITE_MMAP_SIZE_MB * 1024 * 1024,
+        "busy_timeout": config.SQLITE_BUSY_TIMEOUT_MS,
+        "temp_store": "MEMORY",
+    }
+
+
+def create_db_engine(db_path: str, profile: str = None) -> Engine:
+    """
+    SQLite engine for a storage profile
+
+    The production profile keeps a pool of connections per process, each
+    configured with the profile's pragmas on connect. WAL lets the signal
+    loop, bot commands and dashboard read while another process writes;
+    writers queue on the busy timeout instead of failing with
+    "database is locked".
+
+    Args:
+        db_path: SQLite file path
+        profile: "production" or "default" (plain SQLAlchemy settings)
+    """
+    pragmas = sqlite_pragmas(profile)
+    if not pragmas or db_path == ":memory:":
+        return create_engine(f"sqlite:///{db_path}", echo=False)
+
+    engine = create_engine(
+        f"sqlite:///{db_path}",
+        echo=False,
+        pool_size=config.DATABASE_POOL_SIZE,
+        max_overflow=config.DATABASE_MAX_OVERFLOW,
+        pool_timeout=config.DATABASE_POOL_TIMEOUT,
+        connect_args={"timeout": config.SQLITE_BUSY_TIMEOUT_MS / 1000},
+    )
+
+    @event.listens_for(engine, "connect")
+    def _apply_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+    return engine
+
+
 class DatabaseManager:
     """Database operations manager"""
     
-    def __init__(self, db_path: str = None):
+    def __init__(self, db_path: str = None, profile: str = None, archive_path: str = None):
         self.db_path = db_path or config.DATABASE_PATH
-        self.engine = create_engine(f"sqlite:///{self.db_path}", echo=False)
+        self.profile = profile
+        self.engine = create_db_engine(self.db_path, profile)
+        
+        # Archived signals live in a sibling file, e.g. crypto_signals_archive.db
+        db_file = Path(self.db_path)
+        self.archive_path = archive_path or str(db_file.with_name(f"{db_file.stem}_archive{db_file.suffix}"))
+        self._archive_sessions = None
         Base.metadata.create_all(self.engine)
         self.SessionLocal = sessionmaker(bind=self.engine)
+        self._ensure_indexes()
+        self._ensure_stats_rollup()
+        self._ensure_signal_strategies()
+    
+    def _ensure_indexes(self):
+        """Create indexes added to existing tables after the database was created"""
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(self.engine, checkfirst=True)
+    
+    def _ensure_stats_rollup(self):
+        """Build the rollup for databases created before it existed"""
+        with self.get_session() as session:
+            has_rollup = session.query(StatsRollup.scope).filter_by(scope="overall").first() is not None
+            has_signals = session.query(Signal.id).first() is not None
+        if has_signals and not has_rollup:
+            logger.info("Building stats rollup from existing signals...")
+            self.rebuild_stats_rollup()
+    
+    def _ensure_signal_strategies(self):
+        """Fill the strategy index for databases created before it existed"""
+        with self.get_session() as session:
+            has_rows = session.query(SignalStrategy.id).first() is not None
+            has_signals = session.query(Signal.id).first() is not None
+        if has_signals and not has_rows:
+            self.migrate_signal_strategies()
+    
+    def migrate_signal_strategies(self, batch_size: int = 5000) -> int:
+        """
+        Write signal_strategies rows for signals that have none
+        
+        Args:
+            batch_size: Signals read and written per transaction
+        
+        Returns:
+            Number of strategy rows written
+        """
+        has_rows = select(SignalStrategy.id).where(SignalStrategy.signal_id == Signal.id).exists()
+        written = 0
+        last_id = 0
+        
+        # Walk signals in id order, one batch per transaction
+        while True:
+            with self.get_session() as session:
+                signals = session.query(
+                    Signal.id, Signal.strategies, Signal.timeframe, Signal.reason, Signal.created_at
+                ).filter(Signal.id > last_id, ~has_rows).order_by(Signal.id).limit(batch_size).all()
+                if not signals:
+                    break
+                
+                rows = [
+                    {**component, "signal_id": signal_id, "created_at": created_at}
+                    for signal_id, strategies, timeframe, reason, created_at in signals
+                    for component in parse_strategy_components(strategies, timeframe, reason)
+                ]
+                if rows:
+                    session.execute(insert(SignalStrategy), rows)
+                written += len(rows)
+                last_id = signals[-1][0]
+        
+        logger.info(f"Signal strategy index: {written} rows migrated")
+        return written
     
     @contextmanager
     def get_session(self) -> Session:
@@ -83,67 +355,129 @@ class DatabaseManager:
     
     def save_signal(self, signal_data: Dict) -> int:
         """Save a new signal to database"""
+        return self.save_signals([signal_data])[0]
+    
+    def save_signals(self, signals_data: List[Dict]) -> List[int]:
+        """
+        Save a cycle's signals and update their coin metadata in one transaction
+        
+        Args:
+            signals_data: Signal dicts (ConfluentSignal.to_dict())
+        
+        Returns:
+            Assigned signal IDs, in input order
+        """
+        if not signals_data:
+            return []
+        
         with self.get_session() as session:
-            signal = Signal(**signal_data)
-            session.add(signal)
-            session.flush()
-            signal_id = signal.id
-            
-            # Update coin metadata
-            metadata = session.query(CoinMetadata).filter_by(symbol=signal_data["symbol"]).first()
-            if metadata:
-                metadata.last_signal_time = datetime.utcnow()
-                metadata.total_signals += 1
-            else:
-                metadata = CoinMetadata(
-                    symbol=signal_data["symbol"],
-                    last_signal_time=datetime.utcnow(),
-                    total_signals=1
-                )
-                session.add(metadata)
-            
-            return signal_id
+            return self.add_signals(session, signals_data)
+    
+    def add_signals(self, session: Session, signals_data: List[Dict]) -> List[int]:
+        """save_signals inside the caller's transaction (used by DatabaseWriter to batch writes)"""
+        if not signals_data:
+            return []
+        
+        now = clock.utcnow()
+        rows = [{**signal_data, "created_at": signal_data.get("created_at", now)} for signal_data in signals_data]
+        components = [
+            row.pop("components", None) or parse_strategy_components(row["strategies"], row["timeframe"], row.get("reason"))
+            for row in rows
+        ]
+        
+        # Per symbol: number of signals and the latest signal time
+        per_symbol: Dict[str, List] = {}
+        deltas: Dict[Tuple[str, str], Dict[str, float]] = {}
+        for row in rows:
+            count_and_time = per_symbol.setdefault(row["symbol"], [0, row["created_at"]])
+            count_and_time[0] += 1
+            count_and_time[1] = max(count_and_time[1], row["created_at"])
+            keys = rollup_keys(row["symbol"], row["timeframe"], row["strategies"], row["created_at"])
+            _add_delta(deltas, keys, {"signals": 1})
+        
+        signal_ids = session.scalars(
+            insert(Signal).returning(Signal.id, sort_by_parameter_order=True),
+            rows
+        ).all()
+        
+        strategy_rows = [
+            {**component, "signal_id": signal_id, "created_at": row["created_at"]}
+            for signal_id, row, signal_components in zip(signal_ids, rows, components)
+            for component in signal_components
+        ]
+        if strategy_rows:
+            session.execute(insert(SignalStrategy), strategy_rows)
+        
+        upsert = sqlite_insert(CoinMetadata).values([
+            {"symbol": symbol, "last_signal_time": last_time, "total_signals": count,
+             "total_wins": 0, "total_losses": 0}
+            for symbol, (count, last_time) in per_symbol.items()
+        ])
+        session.execute(upsert.on_conflict_do_update(
+            index_elements=[CoinMetadata.symbol],
+            set_={
+                "last_signal_time": upsert.excluded.last_signal_time,
+                "total_signals": CoinMetadata.total_signals + upsert.excluded.total_signals,
+            }
+        ))
+        _apply_rollup(session, deltas)
+        
+        return list(signal_ids)
     
-    def update_signal_performance(self, signal_id: int, exit_price: float, win: bool):
+    def update_signal_performance(self, signal_id: int, exit_price: float, win: bool, closed_at: datetime = None):
         """Update signal performance after close"""
         with self.get_session() as session:
-            signal = session.query(Signal).filter_by(id=signal_id).first()
-            if not signal:
-                return
-            
-            # Calculate PnL
-            if signal.direction == "BUY":
-                pnl_percent = ((exit_price - signal.entry_price) / signal.entry_price) * 100
-            else:
-                pnl_percent = ((signal.entry_price - exit_price) / signal.entry_price) * 100
-            
-            # Create or update performance record
-            perf = session.query(Performance).filter_by(signal_id=signal_id).first()
-            if perf:
-                perf.exit_price = exit_price
-                perf.pnl_percent = pnl_percent
-                perf.win = win
-                perf.closed_at = datetime.utcnow()
+            self.close_signal(session, signal_id, exit_price, win, closed_at)
+    
+    def close_signal(self, session: Session, signal_id: int, exit_price: float, win: bool, closed_at: datetime = None):
+        """update_signal_performance inside the caller's transaction"""
+        closed_at = closed_at or clock.utcnow()
+        signal = session.query(Signal).filter_by(id=signal_id).first()
+        if not signal:
+            return
+        
+        # Calculate PnL
+        if signal.direction == "BUY":
+            pnl_percent = ((exit_price - signal.entry_price) / signal.entry_price) * 100
+        else:
+            pnl_percent = ((signal.entry_price - exit_price) / signal.entry_price) * 100
+        
+        # Create or update performance record
+        perf = session.query(Performance).filter_by(signal_id=signal_id).first()
+        
+        # Update running statistics, replacing an earlier close of the same signal
+        deltas: Dict[Tuple[str, str], Dict[str, float]] = {}
+        keys = rollup_keys(signal.symbol, signal.timeframe, signal.strategies, signal.created_at)
+        if perf and perf.win is not None:
+            _add_delta(deltas, keys, _close_delta(perf.pnl_percent, perf.win, sign=-1))
+        _add_delta(deltas, keys, _close_delta(pnl_percent, win))
+        _apply_rollup(session, deltas)
+        
+        if perf:
+            perf.exit_price = exit_price
+            perf.pnl_percent = pnl_percent
+            perf.win = win
+            perf.closed_at = closed_at
+        else:
+            perf = Performance(
+                signal_id=signal_id,
+                exit_price=exit_price,
+                pnl_percent=pnl_percent,
+                win=win,
+                closed_at=closed_at
+            )
+            session.add(perf)
+        
+        # Update signal status
+        signal.status = "closed"
+        
+        # Update coin metadata
+        metadata = session.query(CoinMetadata).filter_by(symbol=signal.symbol).first()
+        if metadata:
+            if win:
+                metadata.total_wins += 1
             else:
-                perf = Performance(
-                    signal_id=signal_id,
-                    exit_price=exit_price,
-                    pnl_percent=pnl_percent,
-                    win=win,
-                    closed_at=datetime.utcnow()
-                )
-                session.add(perf)
-            
-            # Update signal status
-            signal.status = "closed"
-            
-            # Update coin metadata
-            metadata = session.query(CoinMetadata).filter_by(symbol=signal.symbol).first()
-            if metadata:
-                if win:
-                    metadata.total_wins += 1
-                else:
-                    metadata.total_losses += 1
+                metadata.total_losses += 1
     
     def can_send_signal(self, symbol: str, cooldown_hours: int = None) -> bool:
         """Check if we can send a signal for this coin (cooldown check)"""
@@ -155,20 +489,52 @@ class DatabaseManager:
             if not metadata or not metadata.last_signal_time:
                 return True
             
-            time_since_last = datetime.utcnow() - metadata.last_signal_time
+            time_since_last = clock.utcnow() - metadata.last_signal_time
             return time_since_last >= timedelta(hours=cooldown_hours)
     
-    def get_signal_history(self, symbol: str = None, days: int = 7) -> List[Dict]:
-        """Get recent signal history"""
+    def get_last_signal_times(self) -> Dict[str, datetime]:
+        """Last signal time of every coin, in one query"""
+        with self.get_session() as session:
+            rows = session.query(CoinMetadata.symbol, CoinMetadata.last_signal_time).filter(
+                CoinMetadata.last_signal_time.isnot(None)
+            ).all()
+            return {symbol: last_signal_time for symbol, last_signal_time in rows}
+    
+    def get_signal_history(
+        self,
+        symbol: str = None,
+        days: Optional[int] = 7,
+        limit: int = None,
+        before: Tuple[datetime, int] = None
+    ) -> List[Dict]:
+        """
+        Get recent signal history, newest first
+        
+        Pages are fetched with a keyset cursor, so a deep page costs the same
+        as the first one.
+        
+        Args:
+            symbol: Only this coin
+            days: Only signals from the last N days (None = all)
+            limit: Page size (None = everything)
+            before: page_cursor() of the previous page
+        """
         with self.get_session() as session:
             query = session.query(Signal)
             
             if symbol:
                 query = query.filter_by(symbol=symbol)
             
-            since = datetime.utcnow() - timedelta(days=days)
-            query = query.filter(Signal.created_at >= since)
-            query = query.order_by(Signal.created_at.desc())
+            if days is not None:
+                since = clock.utcnow() - timedelta(days=days)
+                query = query.filter(Signal.created_at >= since)
+            
+            if before is not None:
+                query = query.filter(tuple_(Signal.created_at, Signal.id) < tuple_(*before))
+            
+            query = query.order_by(Signal.created_at.desc(), Signal.id.desc())
+            if limit:
+                query = query.limit(limit)
             
             signals = query.all()
             
@@ -189,46 +555,301 @@ class DatabaseManager:
                 for s in signals
             ]
     
+    @staticmethod
+    def page_cursor(page: List[Dict]) -> Optional[Tuple[datetime, int]]:
+        """Cursor for the page after `page` (None when it is empty)"""
+        if not page:
+            return None
+        return page[-1]["created_at"], page[-1]["id"]
+    
     def get_overall_stats(self) -> Dict:
-        """Get overall performance statistics"""
+        """Get overall performance statistics (from the stats rollup)"""
         with self.get_session() as session:
-            total_signals = session.query(Signal).count()
-            closed_signals = session.query(Performance).filter(Performance.win.isnot(None)).count()
-            total_wins = session.query(Performance).filter_by(win=True).count()
-            total_losses = session.query(Performance).filter_by(win=False).count()
-            
-            win_rate = (total_wins / closed_signals * 100) if closed_signals > 0 else 0
-            
-            # Average PnL
-            avg_profit_query = session.query(Performance).filter(Performance.win == True)
-            avg_loss_query = session.query(Performance).filter(Performance.win == False)
-            
-            avg_profit = 0
-            avg_loss = 0
+            row = session.query(StatsRollup).filter_by(scope="overall", key="").first()
+            if row is None:
+                return _stats_dict(0, 0, 0, 0, None, None)
             
-            if total_wins > 0:
-                profits = [p.pnl_percent for p in avg_profit_query.all() if p.pnl_percent]
-                avg_profit = sum(profits) / len(profits) if profits else 0
-            
-            if total_losses > 0:
-                losses = [p.pnl_percent for p in avg_loss_query.all() if p.pnl_percent]
-                avg_loss = sum(losses) / len(losses) if losses else 0
+            return _stats_dict(
+                row.signals, row.closed, row.wins, row.losses,
+                row.profit_sum / row.profit_count if row.profit_count else None,
+                row.loss_sum / row.loss_count if row.loss_count else None,
+            )
+    
+    def compute_overall_stats(self) -> Dict:
+        """Overall statistics aggregated from the signal tables and archive (checks the rollup)"""
+        # Zero PnL closes are left out of the averages, as they always were
+        has_pnl = Performance.pnl_percent != 0
+        wins, losses = Performance.win == True, Performance.win == False
+        query = select(
+            select(func.count(Signal.id)).scalar_subquery(),
+            func.count(Performance.id).filter(Performance.win.isnot(None)),
+            func.count(Performance.id).filter(wins),
+            func.count(Performance.id).filter(losses),
+            func.coalesce(func.sum(Performance.pnl_percent).filter(wins, has_pnl), 0),
+            func.count(Performance.id).filter(wins, has_pnl),
+            func.coalesce(func.sum(Performance.pnl_percent).filter(losses, has_pnl), 0),
+            func.count(Performance.id).filter(losses, has_pnl),
+        )
+        
+        totals = [0] * 8
+        for session_factory in self._sources():
+            with session_factory() as session:
+                totals = [total + value for total, value in zip(totals, session.execute(query).one())]
+        
+        total_signals, closed, total_wins, total_losses, profit_sum, profit_count, loss_sum, loss_count = totals
+        return _stats_dict(
+            total_signals, closed, total_wins, total_losses,
+            profit_sum / profit_count if profit_count else None,
+            loss_sum / loss_count if loss_count else None,
+        )
+    
+    def get_rollup(self, scope: str) -> List[Dict]:
+        """
+        Precomputed statistics of one scope
+        
+        Args:
+            scope: One of ROLLUP_SCOPES
+        
+        Returns:
+            One dict per key with counts, win rate, PnL sum, mean and standard deviation
+        """
+        with self.get_session() as session:
+            rows = session.query(StatsRollup).filter_by(scope=scope).order_by(StatsRollup.key).all()
             
-            return {
-                "total_signals": total_signals,
-                "closed_signals": closed_signals,
-                "open_signals": total_signals - closed_signals,
-                "total_wins": total_wins,
-                "total_losses": total_losses,
-                "win_rate": round(win_rate, 2),
-                "avg_profit": round(avg_profit, 2),
-                "avg_loss": round(avg_loss, 2),
+            result = []
+            for row in rows:
+                mean = row.pnl_sum / row.closed if row.closed else 0.0
+                variance = max(row.pnl_sq_sum / row.closed - mean * mean, 0.0) if row.closed else 0.0
+                result.append({
+                    scope: row.key,
+                    "signals": row.signals,
+                    "closed": row.closed,
+                    "wins": row.wins,
+                    "losses": row.losses,
+                    "win_rate": round(row.wins / row.closed * 100, 2) if row.closed else 0.0,
+                    "total_pnl": round(row.pnl_sum, 2),
+                    "avg_pnl": round(mean, 2),
+                    "pnl_std": round(variance ** 0.5, 2),
+                })
+            return result
+    
+    def get_strategy_stats(
+        self,
+        strategy: str = None,
+        timeframe: str = None,
+        days: int = None
+    ) -> List[Dict]:
+        """
+        Win rate and PnL per (strategy, timeframe), from the strategy index
+        (hot and archived)
+        
+        Args:
+            strategy: Only this strategy (e.g. "RSI Divergence")
+            timeframe: Only this timeframe
+            days: Only signals from the last N days
+        
+        Returns:
+            One dict per (strategy, timeframe), most signals first
+        """
+        closed = Performance.win.isnot(None)
+        query = select(
+            SignalStrategy.strategy,
+            SignalStrategy.timeframe,
+            func.count(SignalStrategy.id),
+            func.count(Performance.id).filter(closed),
+            func.count(Performance.id).filter(Performance.win == True),
+            func.coalesce(func.sum(Performance.pnl_percent).filter(closed), 0),
+        ).outerjoin(Performance, Performance.signal_id == SignalStrategy.signal_id)
+        
+        if strategy:
+            query = query.where(SignalStrategy.strategy == strategy)
+        if timeframe:
+            query = query.where(SignalStrategy.timeframe == timeframe)
+        if days is not None:
+            query = query.where(SignalStrategy.created_at >= clock.utcnow() - timedelta(days=days))
+        query = query.group_by(SignalStrategy.strategy, SignalStrategy.timeframe)
+        
+        # Archived signals stay counted
+        totals: Dict[Tuple[str, str], List] = {}
+        for session_factory in self._sources():
+            with session_factory() as session:
+                for name, tf, *values in session.execute(query):
+                    row = totals.setdefault((name, tf), [0, 0, 0, 0])
+                    totals[(name, tf)] = [total + value for total, value in zip(row, values)]
+        
+        result = [
+            {
+                "strategy": name,
+                "timeframe": tf,
+                "signals": signals,
+                "closed": closed_count,
+                "wins": wins,
+                "win_rate": round(wins / closed_count * 100, 2) if closed_count else 0.0,
+                "total_pnl": round(pnl_sum, 2),
             }
+            for (name, tf), (signals, closed_count, wins, pnl_sum) in totals.items()
+        ]
+        return sorted(result, key=lambda row: -row["signals"])
+    
+    def rebuild_stats_rollup(self) -> int:
+        """
+        Recompute the stats rollup from the signal and performance tables
+        (hot and archived)
+        
+        Returns:
+            Number of rollup rows written
+        """
+        deltas: Dict[Tuple[str, str], Dict[str, float]] = {}
+        
+        # Archived signals stay counted
+        for session_factory in self._sources():
+            with session_factory() as session:
+                rows = session.query(
+                    Signal.symbol, Signal.timeframe, Signal.strategies, Signal.created_at,
+                    Performance.pnl_percent, Performance.win
+                ).outerjoin(Performance, Performance.signal_id == Signal.id).yield_per(5000)
+                
+                for symbol, timeframe, strategies, created_at, pnl_percent, win in rows:
+                    keys = rollup_keys(symbol, timeframe, strategies, created_at)
+                    _add_delta(deltas, keys, {"signals": 1})
+                    if win is not None:
+                        _add_delta(deltas, keys, _close_delta(pnl_percent, win))
+        
+        with self.get_session() as session:
+            session.execute(delete(StatsRollup))
+            _apply_rollup(session, deltas)
+        
+        logger.info(f"Stats rollup rebuilt: {len(deltas)} rows")
+        return len(deltas)
+    
+    def _archive_sessionmaker(self, create: bool = False) -> Optional[sessionmaker]:
+        """Sessions on the archive database (None if it does not exist and create is False)"""
+        if self._archive_sessions is None:
+            if not create and not Path(self.archive_path).exists():
+                return None
+            engine = create_db_engine(self.archive_path, self.profile)
+            Base.metadata.create_all(engine, tables=list(ARCHIVED_TABLES))
+            self._archive_sessions = sessionmaker(bind=engine)
+        return self._archive_sessions
+    
+    def _sources(self) -> List[sessionmaker]:
+        """Session factories of the hot database and, if present, the archive"""
+        archive = self._archive_sessionmaker()
+        return [self.SessionLocal] + ([archive] if archive else [])
+    
+    def archive_closed_signals(
+        self,
+        days: int = None,
+        batch_size: int = None,
+        vacuum_pages: int = None,
+        convert: bool = False
+    ) -> int:
+        """
+        Move closed signals to the archive database, then vacuum incrementally
+        
+        The stats rollup already holds archived signals (it is updated on
+        every close, and rebuilds read the archive too), so statistics do
+        not change. Each batch is copied into the ATTACHed archive and
+        deleted from the hot tables in one transaction. Copies ignore rows
+        already archived, so a batch interrupted between the two files'
+        commits is completed by the next run.
+        
+        Args:
+            days: Archive signals closed more than this many days ago
+            batch_size: Signals moved per transaction
+            vacuum_pages: Free pages returned to the OS afterwards (0 = all)
+            convert: Allow the one-time full VACUUM (see incremental_vacuum)
+        
+        Returns:
+            Number of signals archived
+        """
+        days = config.ARCHIVE_AFTER_DAYS if days is None else days
+        batch_size = batch_size or config.ARCHIVE_BATCH_SIZE
+        vacuum_pages = config.ARCHIVE_VACUUM_PAGES if vacuum_pages is None else vacuum_pages
+        cutoff = clock.utcnow() - timedelta(days=days)
+        
+        self._ensure_stats_rollup()
+        self._archive_sessionmaker(create=True)
+        
+        archive_metadata = MetaData()
+        archive_tables = [table.to_metadata(archive_metadata, schema="archive") for table in ARCHIVED_TABLES]
+        expired = select(Signal.id).join(Performance, Performance.signal_id == Signal.id).where(
+            Signal.status == "closed", Performance.closed_at < cutoff
+        ).order_by(Signal.id).limit(batch_size)
+        
+        archived = 0
+        with self.engine.connect() as connection:
+            connection.exec_driver_sql("ATTACH DATABASE ? AS archive", (self.archive_path,))
+            try:
+                while True:
+                    signal_ids = connection.execute(expired).scalars().all()
+                    if not signal_ids:
+                        break
+                    
+                    for table, archive_table in zip(ARCHIVED_TABLES, archive_tables):
+                        key = table.c.id if table is Signal.__table__ else table.c.signal_id
+                        connection.execute(
+                            insert(archive_table).prefix_with("OR IGNORE").from_select(
+                                [column.name for column in table.columns],
+                                select(table).where(key.in_(signal_ids))
+                            )
+                        )
+                    for table in reversed(ARCHIVED_TABLES):
+                        key = table.c.id if table is Signal.__table__ else table.c.signal_id
+                        connection.execute(delete(table).where(key.in_(signal_ids)))
+                    connection.commit()
+                    
+                    archived += len(signal_ids)
+                    logger.debug(f"Archived {archived} signals...")
+            finally:
+                connection.rollback()
+                connection.exec_driver_sql("DETACH DATABASE archive")
+        
+        logger.info(f"Archived {archived} signals closed before {cutoff:%Y-%m-%d} to {self.archive_path}")
+        self.incremental_vacuum(vacuum_pages, convert)
+        return archived
+    
+    def incremental_vacuum(self, pages: int = 0, convert: bool = False):
+        """
+        Return free pages to the OS and truncate the WAL
+        
+        Databases created before incremental auto-vacuum was enabled need a
+        one-time full VACUUM, which locks the database for as long as it
+        runs; it is only done when asked for (python manage_db.py vacuum),
+        otherwise the vacuum is skipped.
+        
+        Args:
+            pages: Maximum pages to free (0 = all)
+            convert: Run the full VACUUM if the database still needs it
+        """
+        with self.engine.connect() as connection:
+            cursor = connection.connection.dbapi_connection.cursor()
+            try:
+                if cursor.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+                    if not convert:
+                        logger.warning(
+                            "Incremental auto-vacuum is not enabled; skipping vacuum "
+                            "(run `python manage_db.py vacuum` while the system is stopped)"
+                        )
+                        return
+                    logger.info("Enabling incremental auto-vacuum (one-time full VACUUM)...")
+                    cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+                    cursor.execute("VACUUM")
+                else:
+                    free_pages = cursor.execute("PRAGMA freelist_count").fetchone()[0]
+                    # Every step of the pragma frees one page; executescript runs it to completion
+                    cursor.executescript(f"PRAGMA incremental_vacuum({int(pages)});")
+                    remaining = cursor.execute("PRAGMA freelist_count").fetchone()[0]
+                    logger.info(f"Incremental vacuum: freed {free_pages - remaining} pages")
+                cursor.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchall()
+            finally:
+                cursor.close()
     
     def get_open_signals(self) -> List[Dict]:
         """Get all open signals for performance tracking"""
         with self.get_session() as session:
-            signals = session.query(Signal).filter_by(status="open").all()
+            # Literal (not bound) value, so SQLite matches the partial index
+            signals = session.query(Signal).filter(Signal.status == literal_column("'open'")).all()
             
             # Convert to dicts to avoid detached instance errors
             return [
@@ -260,26 +881,25 @@ class DatabaseManager:
     def get_recent_signals(self, limit: int = 10) -> List[Dict]:
         """Get recent signals for bot command"""
         with self.get_session() as session:
-            signals = session.query(Signal).order_by(Signal.created_at.desc()).limit(limit).all()
-            
-            result = []
-            for s in signals:
-                # Check if has performance
-                perf = session.query(Performance).filter_by(signal_id=s.id).first()
-                
-                status = "open"
-                if perf:
-                    status = "win" if perf.win else "loss"
-                
-                result.append({
-                    'id': s.id,
-                    'symbol': s.symbol,
-                    'direction': s.direction,
-                    'entry_price': s.entry_price,
-                    'confluence_score': s.confidence_score,
-                    'created_at': s.created_at.strftime('%Y-%m-%d %H:%M'),
-                    'status': status
-                })
+            rows = session.query(
+                Signal.id, Signal.symbol, Signal.direction, Signal.entry_price,
+                Signal.confidence_score, Signal.created_at, Performance.id, Performance.win
+            ).outerjoin(
+                Performance, Performance.signal_id == Signal.id
+            ).order_by(
+                Signal.created_at.desc(), Signal.id.desc()
+            ).limit(limit).all()
             
-            return result
+            return [
+                {
+                    'id': signal_id,
+                    'symbol': symbol,
+                    'direction': direction,
+                    'entry_price': entry_price,
+                    'confluence_score': confidence_score,
+                    'created_at': created_at.strftime('%Y-%m-%d %H:%M'),
+                    'status': "open" if perf_id is None else "win" if win else "loss"
+                }
+                for signal_id, symbol, direction, entry_price, confidence_score, created_at, perf_id, win in rows
+            ]
 
@@ -0,0 +1,183 @@
+"""
+Database Writer - Write-behind persistence off the cycle thread
+
+Signal saves and performance closes are queued and applied by one writer
+thread, several operations per transaction, so disk latency does not stall
+analysis and notifications.
+"""
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+from loguru import logger
+from sqlalchemy.orm import Session
+
+from database import DatabaseManager
+import clock
+import config
+
+# Commit latencies kept for the metrics
+LATENCY_WINDOW = 200
+
+# Queue markers: commit the current batch now / and then exit
+_FLUSH = object()
+_STOP = object()
+
+
+class DatabaseWriter:
+    """
+    Bounded write-behind queue in front of a DatabaseManager
+
+    Operations are applied in submission order. A batch is committed once
+    it holds `batch_size` operations, its first operation has waited
+    `flush_seconds` or flush() is called; if the batch transaction fails,
+    its operations are retried one transaction each so a single bad write
+    does not drop the rest. Submitting blocks while the queue is full (back-pressure instead
+    of unbounded memory). With background=False, and after close(), every
+    operation is committed inline, as before write-behind existed.
+    """
+
+    def __init__(
+        self,
+        db: DatabaseManager,
+        queue_size: int = None,
+        batch_size: int = None,
+        flush_seconds: float = None,
+        background: bool = None
+    ):
+        self.db = db
+        self.batch_size = batch_size or config.DB_WRITER_BATCH_SIZE
+        self.flush_seconds = config.DB_WRITER_FLUSH_SECONDS if flush_seconds is None else flush_seconds
+        self.background = config.DB_WRITE_BEHIND if background is None else background
+
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size or config.DB_WRITER_QUEUE_SIZE)
+        self.commit_seconds: deque = deque(maxlen=LATENCY_WINDOW)
+        self.batches = 0
+        self.operations = 0
+        self.failures = 0
+        self.max_depth = 0
+
+        self._thread: Optional[threading.Thread] = None
+        if self.background:
+            self._thread = threading.Thread(target=self._run, name="db-writer", daemon=True)
+            self._thread.start()
+
+    # Operations
+
+    def submit(self, operation: Callable[[Session], object]) -> Future:
+        """
+        Queue a write
+
+        Args:
+            operation: Called with the batch's session, inside its transaction
+
+        Returns:
+            Future resolving to the operation's return value once committed
+        """
+        future: Future = Future()
+        if self._thread is None:
+            # No writer thread (write-behind off or closed): nothing would ever commit a queued write
+            self._commit([(operation, future)])
+            return future
+
+        self.queue.put((operation, future))
+        self.max_depth = max(self.max_depth, self.queue.qsize())
+        return future
+
+    def save_signals(self, signals_data: List[Dict]) -> Future:
+        """DatabaseManager.save_signals, write-behind (resolves to the signal IDs)"""
+        return self.submit(lambda session: self.db.add_signals(session, signals_data))
+
+    def update_signal_performance(self, signal_id: int, exit_price: float, win: bool) -> Future:
+        """DatabaseManager.update_signal_performance, write-behind (closed at submission time)"""
+        closed_at: datetime = clock.utcnow()
+        return self.submit(lambda session: self.db.close_signal(session, signal_id, exit_price, win, closed_at))
+
+    # Lifecycle
+
+    def flush(self):
+        """Block until everything queued so far is committed"""
+        if self._thread is not None:
+            self.queue.put(_FLUSH)
+            self.queue.join()
+
+    def close(self):
+        """Commit what is queued and stop the writer thread"""
+        if self._thread is None:
+            return
+        self.queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        logger.info(f"Database writer stopped ({self.operations} writes in {self.batches} commits)")
+
+    def stats(self) -> Dict:
+        """Queue depth and commit latency metrics"""
+        latencies = np.array(self.commit_seconds) * 1000
+        return {
+            'queue_depth': self.queue.qsize(),
+            'max_queue_depth': self.max_depth,
+            'batches': self.batches,
+            'operations': self.operations,
+            'failures': self.failures,
+            'commit_ms_mean': round(float(latencies.mean()), 2) if len(latencies) else 0.0,
+            'commit_ms_p95': round(float(np.percentile(latencies, 95)), 2) if len(latencies) else 0.0,
+            'commit_ms_max': round(float(latencies.max()), 2) if len(latencies) else 0.0,
+        }
+
+    # Writer thread
+
+    def _run(self):
+        while True:
+            item = self.queue.get()
+            if item is _FLUSH or item is _STOP:
+                self.queue.task_done()
+                if item is _STOP:
+                    return
+                continue
+
+            # Gather more operations until the batch is full, its deadline passes or a marker arrives
+            batch = [item]
+            marker = None
+            deadline = time.monotonic() + self.flush_seconds
+            while len(batch) < self.batch_size:
+                try:
+                    item = self.queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is _FLUSH or item is _STOP:
+                    marker = item
+                    break
+                batch.append(item)
+
+            self._commit(batch)
+            for _ in range(len(batch) + (marker is not None)):
+                self.queue.task_done()
+            if marker is _STOP:
+                return
+
+    def _commit(self, batch: List[Tuple[Callable[[Session], object], Future]]):
+        """Apply a batch in one transaction; fall back to one transaction per operation"""
+        start = time.perf_counter()
+        try:
+            with self.db.get_session() as session:
+                results = [operation(session) for operation, _ in batch]
+        except Exception as e:
+            if len(batch) > 1:
+                logger.warning(f"Batch of {len(batch)} writes failed ({e}); retrying one by one")
+                for item in batch:
+                    self._commit([item])
+                return
+            self.failures += 1
+            logger.error(f"Database write failed: {e}")
+            batch[0][1].set_exception(e)
+            return
+
+        self.commit_seconds.append(time.perf_counter() - start)
+        self.batches += 1
+        self.operations += len(batch)
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
@@ -0,0 +1,170 @@
+"""
+History Dataset - Memory-mapped candle history for backtests
+
+All symbols of a timeframe are stored back to back in one fixed-dtype file
+per column, with index.json mapping each (symbol, timeframe) to its offset
+and length. Readers map the files with numpy.memmap, so opening is instant
+and every backtest process shares the same page-cache copy.
+"""
+import json
+import shutil
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+from loguru import logger
+
+from strategies.ohlcv_view import OHLCVView, OHLCV_COLUMNS
+import config
+
+FORMAT_VERSION = 1
+INDEX_FILE = "index.json"
+
+# Column -> on-disk dtype (little endian, fixed width)
+COLUMN_DTYPES = {
+    'timestamp': '<i8',  # Candle open time, ns since epoch
+    **{name: '<f8' for name in OHLCV_COLUMNS},
+}
+
+
+class HistoryDataset:
+    """Read-only, memory-mapped OHLCV history"""
+
+    def __init__(self, root: Path = None):
+        self.root = Path(root or config.HISTORY_DATASET_DIR)
+        self._index: Optional[dict] = None
+        self._columns: Dict[str, Dict[str, np.ndarray]] = {}
+
+    @staticmethod
+    def _column_path(root: Path, timeframe: str, column: str) -> Path:
+        return root / timeframe / f"{column}.bin"
+
+    def exists(self) -> bool:
+        """Whether a built dataset is present"""
+        return (self.root / INDEX_FILE).exists()
+
+    def is_current(self, store, timeframes: Iterable[str] = None) -> bool:
+        """Whether the dataset was built from the whole store as it is now (see CandleStore.signature)"""
+        if not self.exists():
+            return False
+        built = self.index['timeframes']
+        return all(
+            tf in built and built[tf].get('store') == store.signature(tf)
+            for tf in timeframes or config.TIMEFRAMES
+        )
+
+    @property
+    def index(self) -> dict:
+        """Parsed index.json (loaded once)"""
+        if self._index is None:
+            with open(self.root / INDEX_FILE) as f:
+                index = json.load(f)
+            if index.get('version') != FORMAT_VERSION:
+                raise ValueError(f"Unsupported history dataset version: {index.get('version')}")
+            self._index = index
+        return self._index
+
+    def symbols(self, timeframe: str = None) -> List[str]:
+        """Symbols stored for a timeframe"""
+        timeframe = timeframe or config.TIMEFRAMES[0]
+        return sorted(self.index['timeframes'].get(timeframe, {}).get('symbols', {}))
+
+    def _mapped(self, timeframe: str) -> Dict[str, np.ndarray]:
+        """Memory-map the column files of a timeframe (once per process)"""
+        if timeframe not in self._columns:
+            length = self.index['timeframes'][timeframe]['length']
+            self._columns[timeframe] = {
+                column: np.memmap(
+                    self._column_path(self.root, timeframe, column), dtype=dtype, mode='r', shape=(length,)
+                ) if length else np.empty(0, dtype=dtype)
+                for column, dtype in COLUMN_DTYPES.items()
+            }
+        return self._columns[timeframe]
+
+    def view(self, symbol: str, timeframe: str) -> Optional[OHLCVView]:
+        """Zero-copy view of one series (None if not stored)"""
+        entry = self.index['timeframes'].get(timeframe, {}).get('symbols', {}).get(symbol)
+        if entry is None:
+            return None
+
+        offset, length = entry
+        columns = self._mapped(timeframe)
+        part = slice(offset, offset + length)
+        return OHLCVView(
+            *(columns[name][part] for name in OHLCV_COLUMNS),
+            timestamps=np.asarray(columns['timestamp'][part])
+        )
+
+    def load_symbol(self, symbol: str, timeframes: Iterable[str] = None) -> Dict[str, OHLCVView]:
+        """Views of all stored timeframes of a symbol"""
+        result = {}
+        for tf in timeframes or config.TIMEFRAMES:
+            view = self.view(symbol, tf)
+            if view is not None and len(view):
+                result[tf] = view
+        return result
+
+    def build(self, store, symbols: Iterable[str] = None, timeframes: Iterable[str] = None):
+        """
+        (Re)build the dataset from a CandleStore
+
+        Series are loaded one at a time and appended to every column file,
+        so memory holds a single series however many symbols are stored.
+        Files are written to a temporary folder that replaces the dataset
+        with two renames (the old folder is moved aside first and deleted
+        afterwards), so readers never see a half-written dataset; processes
+        that already mapped the old files keep reading them.
+
+        Args:
+            store: CandleStore to read candles from
+            symbols: Symbols to include (None = everything in the store)
+            timeframes: Timeframes to include (None = config.TIMEFRAMES)
+        """
+        timeframes = list(timeframes or config.TIMEFRAMES)
+        tmp = self.root.with_name(self.root.name + ".tmp")
+        old = self.root.with_name(self.root.name + ".old")
+        for leftover in (tmp, old):
+            if leftover.exists():
+                shutil.rmtree(leftover)
+
+        index = {'version': FORMAT_VERSION, 'timeframes': {}}
+
+        for tf in timeframes:
+            tf_symbols = list(symbols) if symbols is not None else store.symbols(tf)
+            # Taken before reading, so saves during the build make the result stale
+            signature = store.signature(tf) if symbols is None else None
+            (tmp / tf).mkdir(parents=True, exist_ok=True)
+            entries = {}
+            offset = 0
+
+            with ExitStack() as stack:
+                files = {
+                    column: stack.enter_context(open(self._column_path(tmp, tf, column), 'wb'))
+                    for column in COLUMN_DTYPES
+                }
+                for symbol in tf_symbols:
+                    df = store.load(symbol, tf)
+                    if df is None or df.empty:
+                        continue
+                    for column, dtype in COLUMN_DTYPES.items():
+                        values = df.index.asi8 if column == 'timestamp' else df[column].to_numpy()
+                        np.ascontiguousarray(values, dtype=dtype).tofile(files[column])
+                    entries[symbol] = [offset, len(df)]
+                    offset += len(df)
+
+            index['timeframes'][tf] = {'length': offset, 'symbols': entries, 'store': signature}
+            logger.debug(f"History dataset {tf}: {len(entries)} symbols, {offset} candles")
+
+        with open(tmp / INDEX_FILE, 'w') as f:
+            json.dump(index, f)
+
+        # Drop maps of the old files before replacing them
+        self._columns.clear()
+        self._index = None
+        if self.root.exists():
+            self.root.rename(old)
+        tmp.rename(self.root)
+        if old.exists():
+            shutil.rmtree(old)
+
+        logger.info(f"History dataset built at {self.root}")
@@ -4,13 +4,24 @@ Main application - Crypto Signal System
 import time
 import signal
 import sys
-from datetime import datetime
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
 from loguru import logger
 
 from data_fetcher import DataFetcher
 from signal_engine import SignalEngine
 from telegram_bot import TelegramNotifier
 from database import DatabaseManager
+from cooldown import CooldownIndex
+from open_positions import OpenPositions
+from db_writer import DatabaseWriter
+from strategies.ohlcv_view import OHLCVView
+from trade_resolver import resolve_intrabar, OUTCOME_TARGET, OUTCOME_STOP, NS_PER_MINUTE
+import clock
 import config
 
 # Configure logger
@@ -32,20 +43,49 @@ logger.add(
 class CryptoSignalSystem:
     """Main system orchestrator"""
     
-    def __init__(self):
+    def __init__(
+        self,
+        data_fetcher: DataFetcher = None,
+        signal_engine: SignalEngine = None,
+        telegram: TelegramNotifier = None,
+        db: DatabaseManager = None,
+        notification_delay: float = 0.5,
+        handle_signals: bool = True
+    ):
+        """
+        Args:
+            data_fetcher, signal_engine, telegram, db: Components to use
+                (None = the live ones); the replay harness passes local stand-ins
+            notification_delay: Seconds between Telegram messages
+            handle_signals: Install SIGINT/SIGTERM handlers for graceful shutdown
+        """
         logger.info("=== Initializing Crypto Signal System ===")
         
-        self.data_fetcher = DataFetcher()
-        self.signal_engine = SignalEngine()
-        self.telegram = TelegramNotifier()
-        self.db = DatabaseManager()
+        self.data_fetcher = data_fetcher or DataFetcher()
+        self.signal_engine = signal_engine or SignalEngine()
+        self.telegram = telegram or TelegramNotifier()
+        self.db = db or DatabaseManager()
+        self.notification_delay = notification_delay
+        self.db_writer = DatabaseWriter(self.db)
+        self.cooldowns = CooldownIndex(self.db)
+        self.open_positions = OpenPositions(self.db)
         
         self.running = False
         self.cycle_count = 0
+        self.last_archive: Optional[datetime] = None
+        
+        # Writes the database writer failed to commit, reported on the cycle thread
+        self.failed_writes = 0
+        self._write_failures: deque = deque()
+        self._close_retries: set = set()  # Signals whose close failed; retried without a second notification
+        
+        # Seconds spent in each stage of the last cycle
+        self.stage_timings: Dict[str, float] = {}
         
         # Setup graceful shutdown
-        signal.signal(signal.SIGINT, self.shutdown)
-        signal.signal(signal.SIGTERM, self.shutdown)
+        if handle_signals:
+            signal.signal(signal.SIGINT, self.shutdown)
+            signal.signal(signal.SIGTERM, self.shutdown)
         
         logger.info("System initialized successfully")
     
@@ -53,11 +93,23 @@ class CryptoSignalSystem:
         """Graceful shutdown"""
         logger.warning("Shutdown signal received. Stopping...")
         self.running = False
+        self.db_writer.close()
+        self.report_write_failures()
         sys.exit(0)
     
+    @contextmanager
+    def _stage(self, name: str):
+        """Time one stage of the current cycle"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stage_timings[name] = time.perf_counter() - start
+    
     def run_cycle(self):
         """Run one analysis cycle"""
         self.cycle_count += 1
+        self.stage_timings = {}
         cycle_start = time.time()
         
         logger.info(f"\n{'='*60}")
@@ -67,7 +119,8 @@ class CryptoSignalSystem:
         try:
             # 1. Fetch data
             logger.info("Step 1: Fetching market data...")
-            all_data = self.data_fetcher.fetch_all_pairs_data()
+            with self._stage('fetch'):
+                all_data = self.data_fetcher.fetch_all_pairs_data()
             
             if not all_data:
                 logger.warning("No data fetched. Skipping cycle.")
@@ -77,29 +130,42 @@ class CryptoSignalSystem:
             
             # 2. Analyze for signals
             logger.info("Step 2: Analyzing signals...")
-            signals = self.signal_engine.analyze_all(all_data)
+            with self._stage('analyze'):
+                signals = self.signal_engine.analyze_all(all_data)
             
             logger.info(f"Found {len(signals)} potential signals")
             
             # 3. Filter signals (cooldown, max per cycle)
             logger.info("Step 3: Filtering signals...")
-            filtered_signals = self.filter_signals(signals)
+            with self._stage('filter'):
+                filtered_signals = self.filter_signals(signals)
             
             logger.info(f"After filtering: {len(filtered_signals)} signals")
             
             # 4. Save to database and send notifications
             if filtered_signals:
                 logger.info("Step 4: Saving signals and sending notifications...")
-                self.process_signals(filtered_signals)
+                with self._stage('process'):
+                    self.process_signals(filtered_signals)
             else:
                 logger.info("No signals to process")
             
             # 5. Update performance tracking
             logger.info("Step 5: Updating signal performance...")
-            self.update_performance()
+            with self._stage('performance'):
+                self.update_performance()
+            
+            self.report_write_failures()
             
             cycle_duration = time.time() - cycle_start
-            logger.info(f"Cycle completed in {cycle_duration:.1f} seconds")
+            stages = ', '.join(f"{name} {seconds:.1f}s" for name, seconds in self.stage_timings.items())
+            logger.info(f"Cycle completed in {cycle_duration:.1f} seconds ({stages})")
+            writer = self.db_writer.stats()
+            logger.info(
+                f"DB writer: queue {writer['queue_depth']} (max {writer['max_queue_depth']}), "
+                f"commit p95 {writer['commit_ms_p95']} ms, {writer['failures']} failures, "
+                f"{self.failed_writes} failed saves/closes"
+            )
             
         except Exception as e:
             logger.error(f"Error in cycle: {e}", exc_info=True)
@@ -108,10 +174,16 @@ class CryptoSignalSystem:
     def filter_signals(self, signals):
         """Filter signals based on cooldown and limits"""
         filtered = []
+        if not signals:
+            return filtered
+        
+        # One query per cycle, then in-memory checks
+        self.cooldowns.refresh()
+        now = clock.utcnow()
         
         for signal in signals:
             # Check cooldown
-            if not self.db.can_send_signal(signal.symbol):
+            if not self.cooldowns.can_send(signal.symbol, now):
                 logger.debug(f"Skipping {signal.symbol} - cooldown active")
                 continue
             
@@ -126,12 +198,23 @@ class CryptoSignalSystem:
     
     def process_signals(self, signals):
         """Save signals and send notifications"""
+        if not signals:
+            return
+        
+        # Queue the whole cycle as one write; IDs arrive once it is committed
+        now = clock.utcnow()
+        signals_data = [{**signal.to_dict(), 'created_at': now} for signal in signals]
+        saved = self.db_writer.save_signals(signals_data)
+        saved.add_done_callback(lambda future: self._signals_saved(signals, signals_data, future))
+        
+        # Committed inline (write-behind off): do not notify about signals that were not stored
+        if saved.done() and saved.exception() is not None:
+            self.report_write_failures()
+            return
+        self.cooldowns.record((signal.symbol for signal in signals), now)
+        
         for signal in signals:
             try:
-                # Save to database
-                signal_id = self.db.save_signal(signal.to_dict())
-                logger.info(f"Saved signal #{signal_id}: {signal.symbol} {signal.direction}")
-                
                 # Send Telegram notification
                 if self.telegram.send_signal(signal):
                     logger.info(f"Sent Telegram notification for {signal.symbol}")
@@ -139,106 +222,213 @@ class CryptoSignalSystem:
                     logger.warning(f"Failed to send Telegram notification for {signal.symbol}")
                 
                 # Small delay between messages
-                time.sleep(0.5)
+                if self.notification_delay:
+                    time.sleep(self.notification_delay)
                 
             except Exception as e:
                 logger.error(f"Error processing signal for {signal.symbol}: {e}")
     
+    def _signals_saved(self, signals, signals_data, future):
+        """Track a cycle's signals once the database writer has committed them"""
+        if future.exception() is not None:
+            symbols = ', '.join(signal.symbol for signal in signals)
+            self._write_failures.append(f"Saving {len(signals)} signals failed ({symbols}): {future.exception()}")
+            return
+        
+        for signal, signal_id, signal_data in zip(signals, future.result(), signals_data):
+            logger.info(f"Saved signal #{signal_id}: {signal.symbol} {signal.direction}")
+            self.open_positions.add(signal_id, signal_data)
+    
+    def _signal_closed(self, signal: dict, future):
+        """Track a signal again if the database writer failed to commit its close, so the next cycle retries it"""
+        if future.exception() is not None:
+            self._close_retries.add(signal['id'])
+            self.open_positions.add(signal['id'], signal)
+            self._write_failures.append(
+                f"Closing signal #{signal['id']} ({signal['symbol']}) failed, retrying: {future.exception()}"
+            )
+    
+    def report_write_failures(self):
+        """Log and send a Telegram alert for writes that failed since the last report"""
+        failures = []
+        while self._write_failures:
+            failures.append(self._write_failures.popleft())
+        if not failures:
+            return
+        
+        self.failed_writes += len(failures)
+        for failure in failures:
+            logger.error(failure)
+        self.telegram.send_error_message("Database write failed:\n" + "\n".join(failures))
+    
     def update_performance(self):
         """Update performance for open signals"""
         try:
-            open_signals = self.db.get_open_signals()
+            by_symbol: Dict[str, List[dict]] = defaultdict(list)
+            for signal in self.open_positions.values():
+                by_symbol[signal['symbol']].append(signal)
             
-            for signal in open_signals:
-                # Get current price
-                current_price = self.data_fetcher.get_current_price(signal['symbol'])
-                
-                if not current_price:
+            for symbol, signals in by_symbol.items():
+                coarse = self._fetch_coarse(symbol, signals)
+                if coarse is None:
                     continue
-                
-                # Calculate duration
-                from datetime import datetime
-                created_at_str = signal.get('created_at')
-                if created_at_str:
-                    if isinstance(created_at_str, str):
-                        created_at = datetime.fromisoformat(created_at_str)
-                    else:
-                        created_at = created_at_str
-                    duration_hours = (datetime.now() - created_at).total_seconds() / 3600
-                else:
-                    duration_hours = 0
-                
-                # Check if target or stop loss hit
-                if signal['direction'] == 'BUY':
-                    if current_price >= signal['target']:
-                        profit_pct = ((current_price - signal['entry_price']) / signal['entry_price']) * 100
-                        self.db.update_signal_performance(signal['id'], current_price, win=True)
-                        logger.info(f"Signal #{signal['id']} ({signal['symbol']}) HIT TARGET! 🎯")
-                        
-                        # Send Telegram notification
-                        self.telegram.send_target_hit_notification(
-                            signal_id=signal['id'],
-                            symbol=signal['symbol'],
-                            direction=signal['direction'],
-                            entry_price=signal['entry_price'],
-                            target_price=signal['target'],
-                            current_price=current_price,
-                            profit_pct=profit_pct,
-                            duration_hours=duration_hours
-                        )
-                    elif current_price <= signal['stop_loss']:
-                        loss_pct = ((signal['entry_price'] - current_price) / signal['entry_price']) * 100
-                        self.db.update_signal_performance(signal['id'], current_price, win=False)
-                        logger.info(f"Signal #{signal['id']} ({signal['symbol']}) hit stop loss ❌")
-                        
-                        # Send Telegram notification
-                        self.telegram.send_stop_loss_notification(
-                            signal_id=signal['id'],
-                            symbol=signal['symbol'],
-                            direction=signal['direction'],
-                            entry_price=signal['entry_price'],
-                            stop_loss=signal['stop_loss'],
-                            current_price=current_price,
-                            loss_pct=loss_pct,
-                            duration_hours=duration_hours
-                        )
-                else:  # SELL
-                    if current_price <= signal['target']:
-                        profit_pct = ((signal['entry_price'] - current_price) / signal['entry_price']) * 100
-                        self.db.update_signal_performance(signal['id'], current_price, win=True)
-                        logger.info(f"Signal #{signal['id']} ({signal['symbol']}) HIT TARGET! 🎯")
-                        
-                        # Send Telegram notification
-                        self.telegram.send_target_hit_notification(
-                            signal_id=signal['id'],
-                            symbol=signal['symbol'],
-                            direction=signal['direction'],
-                            entry_price=signal['entry_price'],
-                            target_price=signal['target'],
-                            current_price=current_price,
-                            profit_pct=profit_pct,
-                            duration_hours=duration_hours
-                        )
-                    elif current_price >= signal['stop_loss']:
-                        loss_pct = ((current_price - signal['entry_price']) / signal['entry_price']) * 100
-                        self.db.update_signal_performance(signal['id'], current_price, win=False)
-                        logger.info(f"Signal #{signal['id']} ({signal['symbol']}) hit stop loss ❌")
-                        
-                        # Send Telegram notification
-                        self.telegram.send_stop_loss_notification(
-                            signal_id=signal['id'],
-                            symbol=signal['symbol'],
-                            direction=signal['direction'],
-                            entry_price=signal['entry_price'],
-                            stop_loss=signal['stop_loss'],
-                            current_price=current_price,
-                            loss_pct=loss_pct,
-                            duration_hours=duration_hours
-                        )
+                for signal in signals:
+                    outcome = self._check_outcome(signal, coarse)
+                    if outcome is not None:
+                        self._close_signal(signal, *outcome)
                 
         except Exception as e:
             logger.error(f"Error updating performance: {e}")
     
+    def _close_signal(self, signal: dict, win: bool, exit_price: float):
+        """Book a closed signal and send its Telegram notification"""
+        # Calculate duration
+        created_at_str = signal.get('created_at')
+        if created_at_str:
+            if isinstance(created_at_str, str):
+                created_at = datetime.fromisoformat(created_at_str)
+            else:
+                created_at = created_at_str
+            duration_hours = (clock.utcnow() - created_at).total_seconds() / 3600
+        else:
+            duration_hours = 0
+        
+        if signal['direction'] == 'BUY':
+            pnl_pct = ((exit_price - signal['entry_price']) / signal['entry_price']) * 100
+        else:
+            pnl_pct = ((signal['entry_price'] - exit_price) / signal['entry_price']) * 100
+        
+        # Read before queueing: an inline commit runs the callback right away
+        retry = signal['id'] in self._close_retries
+        self._close_retries.discard(signal['id'])
+        
+        self.open_positions.remove(signal['id'])
+        closed = self.db_writer.update_signal_performance(signal['id'], exit_price, win=win)
+        closed.add_done_callback(lambda future: self._signal_closed(signal, future))
+        
+        if retry:
+            return  # Already notified when the close was first attempted
+        
+        if win:
+            logger.info(f"Signal #{signal['id']} ({signal['symbol']}) HIT TARGET! 🎯")
+            
+            # Send Telegram notification
+            self.telegram.send_target_hit_notification(
+                signal_id=signal['id'],
+                symbol=signal['symbol'],
+                direction=signal['direction'],
+                entry_price=signal['entry_price'],
+                target_price=signal['target'],
+                current_price=exit_price,
+                profit_pct=pnl_pct,
+                duration_hours=duration_hours
+            )
+        else:
+            logger.info(f"Signal #{signal['id']} ({signal['symbol']}) hit stop loss ❌")
+            
+            # Send Telegram notification
+            self.telegram.send_stop_loss_notification(
+                signal_id=signal['id'],
+                symbol=signal['symbol'],
+                direction=signal['direction'],
+                entry_price=signal['entry_price'],
+                stop_loss=signal['stop_loss'],
+                current_price=exit_price,
+                loss_pct=-pnl_pct,
+                duration_hours=duration_hours
+            )
+    
+    def _scan_from(self, signal: dict) -> int:
+        """Open time (ns) of the first PERFORMANCE_TIMEFRAME candle still to scan for a signal"""
+        watermark = self.open_positions.watermark(signal['id'])
+        if watermark is not None:
+            return watermark
+        since = pd.Timestamp(signal['created_at']).value
+        coarse_ns = config.TIMEFRAME_MINUTES[config.PERFORMANCE_TIMEFRAME] * NS_PER_MINUTE
+        return since - since % coarse_ns
+    
+    def _fetch_coarse(self, symbol: str, signals: List[dict]) -> Optional[OHLCVView]:
+        """One ranged fetch of PERFORMANCE_TIMEFRAME candles covering every open signal of a symbol"""
+        start = min(self._scan_from(signal) for signal in signals)
+        df = self.data_fetcher.fetch_ohlcv_range(symbol, config.PERFORMANCE_TIMEFRAME, start // 1_000_000)
+        if df is None or df.empty:
+            return None
+        return OHLCVView.from_frame(df)
+    
+    def _check_outcome(self, signal: dict, coarse: OHLCVView) -> Optional[Tuple[bool, float]]:
+        """
+        Check whether an open signal touched its target or stop since the last check
+        
+        Candles are looked up in the symbol's PERFORMANCE_TIMEFRAME candles
+        from the signal's scan watermark (its creation on the first check);
+        only candles touching both levels (and the one the signal was created
+        in) are re-checked on PERFORMANCE_DRILL_TIMEFRAME candles. While the
+        signal stays open the watermark moves to the last candle, which may
+        still be forming.
+        
+        Args:
+            signal: Open signal
+            coarse: Candles of the signal's symbol, starting at or before its watermark
+        
+        Returns:
+            (win, exit price) once closed, None while still open
+        """
+        symbol = signal['symbol']
+        since = pd.Timestamp(signal['created_at']).value
+        fine_ns = config.TIMEFRAME_MINUTES[config.PERFORMANCE_DRILL_TIMEFRAME] * NS_PER_MINUTE
+        
+        first = int(np.searchsorted(coarse.timestamps, self._scan_from(signal), side='left'))
+        if first >= len(coarse):
+            return None
+        
+        def load_fine(start: int, end: int) -> Optional[OHLCVView]:
+            fine = self.data_fetcher.fetch_ohlcv_range(
+                symbol, config.PERFORMANCE_DRILL_TIMEFRAME,
+                (start - start % fine_ns) // 1_000_000, end // 1_000_000
+            )
+            return OHLCVView.from_frame(fine) if fine is not None and not fine.empty else None
+        
+        outcome, _ = resolve_intrabar(
+            is_buy=signal['direction'] == 'BUY',
+            target=signal['target'],
+            stop_loss=signal['stop_loss'],
+            coarse=coarse.slice(first),
+            coarse_minutes=config.TIMEFRAME_MINUTES[config.PERFORMANCE_TIMEFRAME],
+            load_fine=load_fine,
+            since=since
+        )
+        
+        if outcome == OUTCOME_TARGET:
+            return True, signal['target']
+        if outcome == OUTCOME_STOP:
+            return False, signal['stop_loss']
+        
+        self.open_positions.advance(signal['id'], int(coarse.timestamps[-1]))
+        return None
+    
+    def run_maintenance(self):
+        """
+        Archive old closed signals every ARCHIVE_INTERVAL_HOURS
+        
+        Queued writes are committed first so the archive transactions and the
+        vacuum do not compete with the database writer for the file (this
+        thread is the only one queueing writes). The one-time full VACUUM is
+        left to `python manage_db.py vacuum`.
+        """
+        if not config.ARCHIVE_INTERVAL_HOURS:
+            return
+        
+        now = clock.utcnow()
+        if self.last_archive and now - self.last_archive < timedelta(hours=config.ARCHIVE_INTERVAL_HOURS):
+            return
+        self.last_archive = now
+        
+        try:
+            self.db_writer.flush()
+            self.db.archive_closed_signals()
+        except Exception as e:
+            logger.error(f"Error archiving signals: {e}", exc_info=True)
+    
     def run(self):
         """Main run loop"""
         logger.info("Starting Crypto Signal System...")
@@ -255,6 +445,7 @@ class CryptoSignalSystem:
         while self.running:
             try:
                 self.run_cycle()
+                self.run_maintenance()
                 
                 # Wait for next cycle
                 logger.info(f"\nWaiting {config.CYCLE_INTERVAL_MINUTES} minutes until next cycle...")
@@ -267,6 +458,8 @@ class CryptoSignalSystem:
                 logger.error(f"Unexpected error: {e}", exc_info=True)
                 time.sleep(60)  # Wait 1 minute before retry
         
+        self.db_writer.close()
+        self.report_write_failures()
         logger.info("System stopped")
 
 
@@ -0,0 +1,77 @@
+"""
+Database maintenance commands
+
+    python manage_db.py rebuild-stats        Recompute the stats rollup from scratch
+    python manage_db.py check-stats          Compare the rollup with a full aggregate
+    python manage_db.py rollup <scope>       Print one rollup scope
+    python manage_db.py migrate-strategies   Index strategies of signals saved before signal_strategies
+    python manage_db.py strategies [--strategy NAME] [--timeframe TF] [--days N]
+    python manage_db.py archive [--days N]   Move old closed signals to the archive database
+    python manage_db.py vacuum               Enable incremental auto-vacuum (one-time full VACUUM)
+"""
+import argparse
+import sys
+import pandas as pd
+
+from database import DatabaseManager, ROLLUP_SCOPES
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Crypto Signal System database maintenance")
+    parser.add_argument("--db", help="SQLite file (default DATABASE_PATH)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("rebuild-stats", help="Recompute the stats rollup from the signal tables")
+    commands.add_parser("check-stats", help="Compare the rollup's overall row with a full aggregate")
+    rollup = commands.add_parser("rollup", help="Print one rollup scope")
+    rollup.add_argument("scope", choices=ROLLUP_SCOPES)
+    commands.add_parser("migrate-strategies", help="Fill signal_strategies for signals that have no rows")
+    strategies = commands.add_parser("strategies", help="Win rate per strategy and timeframe")
+    strategies.add_argument("--strategy")
+    strategies.add_argument("--timeframe")
+    strategies.add_argument("--days", type=int)
+    archive = commands.add_parser("archive", help="Move closed signals to the archive database and vacuum")
+    archive.add_argument("--days", type=int, help="Closed more than N days ago (default ARCHIVE_AFTER_DAYS)")
+    commands.add_parser("vacuum", help="Convert to incremental auto-vacuum if needed and return free pages")
+
+    args = parser.parse_args(argv)
+    db = DatabaseManager(args.db)
+
+    if args.command == "rebuild-stats":
+        rows = db.rebuild_stats_rollup()
+        print(f"Stats rollup rebuilt: {rows} rows")
+
+    elif args.command == "check-stats":
+        stored, computed = db.get_overall_stats(), db.compute_overall_stats()
+        for name, value in computed.items():
+            marker = "" if stored[name] == value else "  <-- differs"
+            print(f"{name:>16}: rollup {stored[name]}, computed {value}{marker}")
+        if stored != computed:
+            print("Rollup is out of date; run `python manage_db.py rebuild-stats`")
+            return 1
+
+    elif args.command == "rollup":
+        table = pd.DataFrame(db.get_rollup(args.scope))
+        print(table.to_string(index=False) if not table.empty else "No rows")
+
+    elif args.command == "migrate-strategies":
+        rows = db.migrate_signal_strategies()
+        print(f"Signal strategy index: {rows} rows written")
+
+    elif args.command == "strategies":
+        table = pd.DataFrame(db.get_strategy_stats(args.strategy, args.timeframe, args.days))
+        print(table.to_string(index=False) if not table.empty else "No rows")
+
+    elif args.command == "archive":
+        archived = db.archive_closed_signals(days=args.days, convert=True)
+        print(f"Archived {archived} signals to {db.archive_path}")
+
+    elif args.command == "vacuum":
+        db.incremental_vacuum(convert=True)
+        print("Vacuum done")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""
+Open Positions - In-memory set of open signals for performance tracking
+"""
+import threading
+from typing import Dict, List, Optional
+from loguru import logger
+
+from database import DatabaseManager
+
+
+class OpenPositions:
+    """
+    Open signals kept in memory by the performance tracker
+
+    Loaded once from the database (through the partial index on open
+    signals), then updated as signals are saved and closed, so each cycle
+    costs no query and scales with the number of open positions. Saves are
+    reported from the database writer thread, hence the lock.
+
+    Each position also keeps a scan watermark: the open time (ns) of the
+    first candle not yet known to be clear of both levels, so the tracker
+    only looks at candles from there on.
+    """
+
+    def __init__(self, db: DatabaseManager):
+        self.db = db
+        self.positions: Dict[int, Dict] = {}
+        self.watermarks: Dict[int, int] = {}
+        self.loaded = False
+        self._lock = threading.Lock()
+
+    def load(self):
+        """Reload open signals from the database"""
+        with self._lock:
+            self.positions = {signal['id']: signal for signal in self.db.get_open_signals()}
+            self.watermarks = {}
+            self.loaded = True
+        logger.debug(f"Open positions loaded: {len(self.positions)}")
+
+    def values(self) -> List[Dict]:
+        """Open signals, in the shape of DatabaseManager.get_open_signals()"""
+        if not self.loaded:
+            self.load()
+        with self._lock:
+            return list(self.positions.values())
+
+    def add(self, signal_id: int, signal_data: Dict):
+        """Track a freshly saved (committed) signal"""
+        with self._lock:
+            if not self.loaded:
+                return  # Picked up by the first load
+            self.positions[signal_id] = {
+                'id': signal_id,
+                'symbol': signal_data['symbol'],
+                'direction': signal_data['direction'],
+                'entry_price': signal_data['entry_price'],
+                'target': signal_data['target'],
+                'stop_loss': signal_data['stop_loss'],
+                'created_at': signal_data['created_at'],
+            }
+
+    def remove(self, signal_id: int):
+        """Stop tracking a closed signal"""
+        with self._lock:
+            self.positions.pop(signal_id, None)
+            self.watermarks.pop(signal_id, None)
+
+    def watermark(self, signal_id: int) -> Optional[int]:
+        """Open time (ns) to resume scanning a signal's candles from (None = its creation)"""
+        with self._lock:
+            return self.watermarks.get(signal_id)
+
+    def advance(self, signal_id: int, candle_open: int):
+        """Record that candles before `candle_open` (ns) touched neither level"""
+        with self._lock:
+            if signal_id in self.positions:
+                self.watermarks[signal_id] = max(candle_open, self.watermarks.get(signal_id, candle_open))
+
+    def __len__(self) -> int:
+        return len(self.positions)
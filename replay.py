@@ -0,0 +1,256 @@
+"""
+Replay Harness - Runs the live pipeline over recorded history on a simulated clock
+
+CryptoSignalSystem.run_cycle is driven cycle by cycle over candles from the
+history dataset: fetching is served from memory-mapped candles, Telegram
+messages are formatted but recorded locally, signals go to a scratch SQLite
+database, and every timestamp comes from a simulated clock. Cycles run back
+to back, so the run doubles as an end-to-end throughput benchmark.
+"""
+import tempfile
+import time
+from collections import Counter, deque
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+import clock
+from clock import SimulatedClock
+from database import DatabaseManager
+from history_dataset import HistoryDataset
+from main import CryptoSignalSystem
+from strategies.ohlcv_view import OHLCVView, OHLCV_COLUMNS
+from telegram_bot import TelegramNotifier
+from trade_resolver import NS_PER_MINUTE
+import config
+
+
+class ReplayDataFetcher:
+    """
+    DataFetcher stand-in serving recorded candles as of the simulated time
+
+    Only candles that have closed by the current time are returned (the live
+    feed also includes the still-forming candle, which history cannot
+    reproduce without look-ahead).
+    """
+
+    def __init__(self, dataset: HistoryDataset, symbols: List[str], sim_clock: SimulatedClock):
+        self.clock = sim_clock
+        self.views: Dict[str, Dict[str, OHLCVView]] = {
+            symbol: dataset.load_symbol(symbol) for symbol in symbols
+        }
+
+    def _now_ns(self) -> int:
+        return pd.Timestamp(self.clock.utcnow()).value
+
+    def _closed_count(self, view: OHLCVView, timeframe: str) -> int:
+        """Number of candles closed by the simulated time"""
+        close_times = view.timestamps + config.TIMEFRAME_MINUTES[timeframe] * NS_PER_MINUTE
+        return int(np.searchsorted(close_times, self._now_ns(), side='right'))
+
+    @staticmethod
+    def _frame(view: OHLCVView, start: int, stop: int) -> pd.DataFrame:
+        """Candles [start, stop) as a DataFrame shaped like DataFetcher's"""
+        return pd.DataFrame(
+            {name: view.column(name)[start:stop] for name in OHLCV_COLUMNS},
+            index=pd.DatetimeIndex(view.timestamps[start:stop], name='timestamp')
+        )
+
+    def get_usdt_pairs(self, force_refresh: bool = False) -> List[str]:
+        return list(self.views)
+
+    def fetch_ohlcv(self, symbol: str, timeframe: str, limit: int = None) -> Optional[pd.DataFrame]:
+        limit = limit or config.OHLCV_LIMIT
+        view = self.views.get(symbol, {}).get(timeframe)
+        if view is None:
+            return None
+        stop = self._closed_count(view, timeframe)
+        if stop == 0:
+            return None
+        return self._frame(view, max(0, stop - limit), stop)
+
+    def fetch_ohlcv_range(self, symbol: str, timeframe: str, since: int, until: int = None) -> Optional[pd.DataFrame]:
+        view = self.views.get(symbol, {}).get(timeframe)
+        if view is None:
+            return None
+        stop = self._closed_count(view, timeframe)
+        if until is not None:
+            stop = min(stop, int(np.searchsorted(view.timestamps, until * 1_000_000, side='left')))
+        start = int(np.searchsorted(view.timestamps, since * 1_000_000, side='left'))
+        if start >= stop:
+            return None
+        return self._frame(view, start, stop)
+
+    def fetch_symbol_data(self, symbol: str, timeframes: List[str] = None) -> Dict[str, pd.DataFrame]:
+        result = {}
+        for tf in timeframes or config.TIMEFRAMES:
+            df = self.fetch_ohlcv(symbol, tf)
+            if df is not None and not df.empty:
+                result[tf] = df
+        return result
+
+    def fetch_all_pairs_data(
+        self,
+        pairs: List[str] = None,
+        timeframes: List[str] = None,
+        max_workers: int = None
+    ) -> Dict[str, Dict[str, pd.DataFrame]]:
+        all_data = {}
+        for symbol in pairs or self.get_usdt_pairs():
+            data = self.fetch_symbol_data(symbol, timeframes)
+            if data:
+                all_data[symbol] = data
+        return all_data
+
+    def get_current_price(self, symbol: str) -> Optional[float]:
+        df = self.fetch_ohlcv(symbol, config.TIMEFRAMES[0], limit=1)
+        return float(df['close'].iloc[-1]) if df is not None else None
+
+
+class ReplayNotifier(TelegramNotifier):
+    """TelegramNotifier that formats every message but only records it"""
+
+    def __init__(self, keep: int = 50):
+        self.bot_token = self.chat_id = ""
+        self.bot = None
+        self.enabled = True
+        self.counts: Counter = Counter()
+        self.messages: deque = deque(maxlen=keep)  # Most recent messages
+
+    def send_message(self, message: str) -> bool:
+        self.counts['messages'] += 1
+        self.messages.append(message)
+        return True
+
+    def send_signal(self, signal) -> bool:
+        self.counts['signals'] += 1
+        return super().send_signal(signal)
+
+    def send_target_hit_notification(self, *args, **kwargs) -> bool:
+        self.counts['targets'] += 1
+        return super().send_target_hit_notification(*args, **kwargs)
+
+    def send_stop_loss_notification(self, *args, **kwargs) -> bool:
+        self.counts['stops'] += 1
+        return super().send_stop_loss_notification(*args, **kwargs)
+
+    def send_error_message(self, error: str) -> bool:
+        self.counts['errors'] += 1
+        return super().send_error_message(error)
+
+
+class ReplayHarness:
+    """Drives CryptoSignalSystem over recorded history as fast as possible"""
+
+    def __init__(self, dataset: HistoryDataset = None, symbols: List[str] = None, db_path: str = None):
+        self.dataset = dataset or HistoryDataset()
+        self.symbols = symbols or self.dataset.symbols()
+        self.db_path = db_path or str(Path(tempfile.mkdtemp(prefix="replay_")) / "replay.db")
+
+    def run(
+        self,
+        start: datetime,
+        end: datetime,
+        interval_minutes: float = None
+    ) -> Dict:
+        """
+        Replay cycles from start to end
+
+        Args:
+            start: Simulated time of the first cycle (naive UTC)
+            end: No cycle runs after this time
+            interval_minutes: Simulated time between cycles (default CYCLE_INTERVAL_MINUTES)
+
+        Returns:
+            Benchmark report: cycles, cycles/second, stage latencies, notifications
+        """
+        interval = timedelta(minutes=interval_minutes or config.CYCLE_INTERVAL_MINUTES)
+        sim_clock = SimulatedClock(start)
+        clock.install(sim_clock)
+
+        try:
+            notifier = ReplayNotifier()
+            system = CryptoSignalSystem(
+                data_fetcher=ReplayDataFetcher(self.dataset, self.symbols, sim_clock),
+                telegram=notifier,
+                db=DatabaseManager(self.db_path),
+                notification_delay=0,
+                handle_signals=False
+            )
+
+            timings: Dict[str, List[float]] = {}
+            cycle_seconds = []
+            wall_start = time.perf_counter()
+
+            while sim_clock.utcnow() <= end:
+                cycle_start = time.perf_counter()
+                system.run_cycle()
+                cycle_seconds.append(time.perf_counter() - cycle_start)
+
+                for stage, seconds in system.stage_timings.items():
+                    timings.setdefault(stage, []).append(seconds)
+
+                # Land the cycle's writes before simulated time moves on (the
+                # live loop has minutes for this); timed apart from the cycle
+                flush_start = time.perf_counter()
+                system.db_writer.flush()
+                timings.setdefault('db_flush', []).append(time.perf_counter() - flush_start)
+                sim_clock.advance(interval)
+
+            wall_seconds = time.perf_counter() - wall_start
+            system.db_writer.close()
+        finally:
+            clock.install(None)
+
+        cycles = len(cycle_seconds)
+        report = {
+            'symbols': len(self.symbols),
+            'cycles': cycles,
+            'simulated_hours': round((end - start).total_seconds() / 3600, 2),
+            'wall_seconds': round(wall_seconds, 3),
+            'cycles_per_second': round(cycles / wall_seconds, 2) if wall_seconds else 0.0,
+            'cycle_ms': self._latency(cycle_seconds),
+            'stage_ms': {stage: self._latency(values) for stage, values in timings.items()},
+            'notifications': dict(notifier.counts),
+            'db_writer': system.db_writer.stats(),
+            'database': self.db_path,
+        }
+        logger.info(f"Replay: {cycles} cycles in {wall_seconds:.1f}s ({report['cycles_per_second']} cycles/s)")
+        return report
+
+    @staticmethod
+    def _latency(seconds: List[float]) -> Dict[str, float]:
+        """Mean / p50 / p95 / max in milliseconds"""
+        if not seconds:
+            return {}
+        values = np.array(seconds) * 1000
+        return {
+            'mean': round(float(values.mean()), 2),
+            'p50': round(float(np.percentile(values, 50)), 2),
+            'p95': round(float(np.percentile(values, 95)), 2),
+            'max': round(float(values.max()), 2),
+        }
+
+
+if __name__ == "__main__":
+    import json
+
+    dataset = HistoryDataset()
+    if not dataset.exists():
+        raise SystemExit("No history dataset found. Run `python backtest.py` first to download candles.")
+
+    symbols = dataset.symbols()[:config.REPLAY_SYMBOLS]
+    last_close = max(
+        pd.Timestamp(int(view.timestamps[-1]) + config.TIMEFRAME_MINUTES[config.TIMEFRAMES[0]] * NS_PER_MINUTE)
+        for view in (dataset.view(symbol, config.TIMEFRAMES[0]) for symbol in symbols)
+        if view is not None and len(view)
+    ).to_pydatetime()
+
+    report = ReplayHarness(dataset, symbols).run(
+        start=last_close - timedelta(hours=config.REPLAY_HOURS),
+        end=last_close
+    )
+    print(json.dumps(report, indent=2))
@@ -0,0 +1,161 @@
+"""
+Result Cache - Content-addressed on-disk cache of per-series strategy output
+
+Each cell is one strategy evaluated over one (symbol, timeframe) series and is
+keyed by a hash of the candle data, the strategy's source code, its
+parameters and the config settings its target/stop levels depend on. Changing
+one strategy or one symbol's candles only invalidates the cells that depend
+on them. Cells not used for RESULT_CACHE_MAX_AGE_DAYS are pruned.
+"""
+import hashlib
+import inspect
+import json
+import os
+import sys
+import time
+from functools import lru_cache
+from importlib import metadata
+from pathlib import Path
+from typing import Optional
+import numpy as np
+import pandas as pd
+import scipy
+from loguru import logger
+
+from strategies.base_strategy import BaseStrategy, SeriesSignals
+from strategies.ohlcv_view import OHLCVView, OHLCV_COLUMNS
+from strategies import indicator_cache, ohlcv_view
+import config
+
+# Bump when the stored layout or the key recipe changes
+FORMAT_VERSION = 2
+
+# Config settings read by analyze_series (target/stop levels)
+CONFIG_KEYS = ('DEFAULT_STOP_LOSS_PERCENT', 'DEFAULT_RISK_REWARD_RATIO')
+
+
+def data_digest(view: OHLCVView) -> str:
+    """sha256 of a series' timestamps and OHLCV columns"""
+    digest = hashlib.sha256()
+    if view.timestamps is not None:
+        digest.update(np.ascontiguousarray(view.timestamps, dtype='<i8'))
+    for name in OHLCV_COLUMNS:
+        digest.update(np.ascontiguousarray(view.column(name), dtype='<f8'))
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _module_digest(name: str) -> str:
+    """sha256 of one module's source (read once per process)"""
+    module = sys.modules.get(name)
+    if module is None:
+        return ""
+    return hashlib.sha256(inspect.getsource(module).encode()).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def code_version(strategy_cls: type) -> str:
+    """sha256 of the library versions and the source of every module a strategy's series output depends on"""
+    modules = {cls.__module__ for cls in strategy_cls.__mro__ if cls is not object}
+    modules.update((indicator_cache.__name__, ohlcv_view.__name__))
+
+    versions = (
+        f"{FORMAT_VERSION}|numpy {np.__version__}|pandas {pd.__version__}"
+        f"|scipy {scipy.__version__}|ta {metadata.version('ta')}"
+    )
+    digest = hashlib.sha256(versions.encode())
+    for name in sorted(modules):
+        digest.update(f"{name}|{_module_digest(name)}".encode())
+    return digest.hexdigest()
+
+
+class SeriesResultCache:
+    """Stores SeriesSignals on disk under a content hash"""
+
+    def __init__(self, root: Path = None):
+        self.root = Path(root or config.RESULT_CACHE_DIR)
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, data_key: str, strategy: BaseStrategy) -> str:
+        """Cell key from the data digest, strategy code, parameters and config settings"""
+        params = json.dumps(strategy.params, sort_keys=True, default=str)
+        settings = json.dumps({name: getattr(config, name) for name in CONFIG_KEYS}, sort_keys=True)
+        payload = '|'.join((data_key, strategy.name, code_version(type(strategy)), params, settings))
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.npz"
+
+    def load(self, key: str, strategy: str) -> Optional[SeriesSignals]:
+        """Load a cell (None if not cached or unreadable)"""
+        path = self._path(key)
+        if not path.exists():
+            self.misses += 1
+            return None
+
+        try:
+            with np.load(path, allow_pickle=False) as stored:
+                reasons = np.full(len(stored['direction']), None, dtype=object)
+                reasons[stored['reason_bars']] = stored['reasons'].tolist()
+                result = SeriesSignals(
+                    strategy=strategy,
+                    direction=stored['direction'],
+                    price=stored['price'],
+                    target=stored['target'],
+                    stop_loss=stored['stop_loss'],
+                    confidence=stored['confidence'],
+                    reasons=reasons,
+                )
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable result cache entry {path.name}: {e}")
+            self.misses += 1
+            return None
+
+        # Mark the cell as used, so prune() keeps it
+        os.utime(path)
+        self.hits += 1
+        return result
+
+    def save(self, key: str, result: SeriesSignals):
+        """Store a cell (written to a temp file, then renamed into place)"""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        reason_bars = np.flatnonzero(result.reasons != None)  # noqa: E711 (element-wise)
+        tmp = path.with_name(f"{path.stem}.{os.getpid()}.tmp.npz")
+        np.savez(
+            tmp,
+            direction=result.direction,
+            price=result.price,
+            target=result.target,
+            stop_loss=result.stop_loss,
+            confidence=result.confidence,
+            reason_bars=reason_bars,
+            reasons=np.array([str(reason) for reason in result.reasons[reason_bars]], dtype=str),
+        )
+        os.replace(tmp, path)
+
+    def prune(self, max_age_days: float = None) -> int:
+        """
+        Delete cells not written or loaded in the last max_age_days
+
+        Every candle download changes the data digest of the series, so
+        cells of older candles are never loaded again.
+
+        Returns:
+            Number of cells deleted
+        """
+        max_age_days = config.RESULT_CACHE_MAX_AGE_DAYS if max_age_days is None else max_age_days
+        cutoff = time.time() - max_age_days * 86400
+        removed = 0
+        for path in self.root.glob("*/*.npz"):
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                continue  # Removed by another process
+        if removed:
+            logger.info(f"Result cache: pruned {removed} unused cells")
+        return removed
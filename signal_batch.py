@@ -0,0 +1,187 @@
+"""
+Signal Batch - Columnar storage for a cycle's candidate signals
+"""
+from dataclasses import dataclass
+from typing import Iterable, List
+import numpy as np
+
+from strategies.base_strategy import Signal
+
+DIRECTIONS = ('BUY', 'SELL')
+
+
+@dataclass(slots=True)
+class ConfluenceGroup:
+    """Aggregates for one (symbol, direction) group of candidate signals"""
+    symbol: str
+    direction: str
+    rows: np.ndarray  # Batch row indices, in insertion order
+    avg_price: float
+    avg_target: float
+    avg_stop_loss: float
+    avg_confidence: float
+
+
+class SignalBatch:
+    """
+    Array-backed batch of candidate signals
+
+    Signals are appended column by column and frozen into NumPy arrays on
+    first use, so grouping and averaging run as vectorized group-bys instead
+    of per-signal Python loops.
+    """
+
+    def __init__(self, signals: Iterable[Signal] = ()):
+        self.symbols: List[str] = []
+        self.timeframes: List[str] = []
+        self.strategies: List[str] = []
+        self.reasons: List[str] = []
+        self._directions: List[int] = []
+        self._prices: List[float] = []
+        self._targets: List[float] = []
+        self._stop_losses: List[float] = []
+        self._confidences: List[float] = []
+        self._arrays = None
+
+        for signal in signals:
+            self.append(signal)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def append(self, signal: Signal):
+        """Add a candidate signal"""
+        self.add(
+            signal.symbol, signal.timeframe, signal.strategy, signal.direction,
+            signal.price, signal.target, signal.stop_loss, signal.confidence, signal.reason
+        )
+
+    def add(
+        self,
+        symbol: str,
+        timeframe: str,
+        strategy: str,
+        direction: str,
+        price: float,
+        target: float,
+        stop_loss: float,
+        confidence: float,
+        reason: str
+    ):
+        """Add a candidate signal from its fields (no Signal object needed)"""
+        self.symbols.append(symbol)
+        self.timeframes.append(timeframe)
+        self.strategies.append(strategy)
+        self.reasons.append(reason)
+        self._directions.append(DIRECTIONS.index(direction))
+        self._prices.append(price)
+        self._targets.append(target)
+        self._stop_losses.append(stop_loss)
+        self._confidences.append(confidence)
+        self._arrays = None
+
+    def extend(self, other: 'SignalBatch'):
+        """Append all rows of another batch"""
+        self.symbols.extend(other.symbols)
+        self.timeframes.extend(other.timeframes)
+        self.strategies.extend(other.strategies)
+        self.reasons.extend(other.reasons)
+        self._directions.extend(other._directions)
+        self._prices.extend(other._prices)
+        self._targets.extend(other._targets)
+        self._stop_losses.extend(other._stop_losses)
+        self._confidences.extend(other._confidences)
+        self._arrays = None
+
+    @classmethod
+    def concat(cls, batches: Iterable['SignalBatch']) -> 'SignalBatch':
+        """Merge several batches into one, preserving row order"""
+        merged = cls()
+        for batch in batches:
+            merged.extend(batch)
+        return merged
+
+    def _freeze(self) -> dict:
+        """Convert numeric columns to NumPy arrays (cached until next append)"""
+        if self._arrays is None:
+            self._arrays = {
+                'direction': np.array(self._directions, dtype=np.int8),
+                'price': np.array(self._prices, dtype=np.float64),
+                'target': np.array(self._targets, dtype=np.float64),
+                'stop_loss': np.array(self._stop_losses, dtype=np.float64),
+                'confidence': np.array(self._confidences, dtype=np.float64),
+            }
+        return self._arrays
+
+    def column(self, name: str) -> np.ndarray:
+        """Get a numeric column (direction, price, target, stop_loss, confidence)"""
+        return self._freeze()[name]
+
+    def record(self, row: int) -> Signal:
+        """Materialize one row as a Signal"""
+        return Signal(
+            symbol=self.symbols[row],
+            timeframe=self.timeframes[row],
+            strategy=self.strategies[row],
+            direction=DIRECTIONS[self._directions[row]],
+            price=self._prices[row],
+            target=self._targets[row],
+            stop_loss=self._stop_losses[row],
+            confidence=self._confidences[row],
+            reason=self.reasons[row],
+        )
+
+    def confluence_groups(self, min_score: int) -> List[ConfluenceGroup]:
+        """
+        Group rows by (symbol, direction) and aggregate them
+
+        Args:
+            min_score: Minimum number of signals a group needs to survive
+
+        Returns:
+            Surviving groups ordered by first appearance of the symbol, BUY before SELL
+        """
+        if not self.symbols:
+            return []
+
+        arrays = self._freeze()
+
+        # Symbol codes in order of first appearance
+        _, first_seen, symbol_codes = np.unique(
+            np.array(self.symbols, dtype=object), return_index=True, return_inverse=True
+        )
+        appearance_rank = np.empty(len(first_seen), dtype=np.int64)
+        appearance_rank[np.argsort(first_seen, kind='stable')] = np.arange(len(first_seen))
+
+        keys = appearance_rank[symbol_codes] * len(DIRECTIONS) + arrays['direction']
+        n_groups = len(first_seen) * len(DIRECTIONS)
+
+        counts = np.bincount(keys, minlength=n_groups)
+        survivors = np.flatnonzero(counts >= max(min_score, 1))
+        if len(survivors) == 0:
+            return []
+
+        # bincount accumulates in row order, matching a sequential sum per group
+        sums = {
+            name: np.bincount(keys, weights=arrays[name], minlength=n_groups)
+            for name in ('price', 'target', 'stop_loss', 'confidence')
+        }
+
+        order = np.argsort(keys, kind='stable')
+        bounds = np.concatenate(([0], np.cumsum(counts)))
+
+        groups = []
+        for key in survivors:
+            rows = order[bounds[key]:bounds[key + 1]]
+            count = counts[key]
+            groups.append(ConfluenceGroup(
+                symbol=self.symbols[rows[0]],
+                direction=DIRECTIONS[key % len(DIRECTIONS)],
+                rows=rows,
+                avg_price=float(sums['price'][key] / count),
+                avg_target=float(sums['target'][key] / count),
+                avg_stop_loss=float(sums['stop_loss'][key] / count),
+                avg_confidence=float(sums['confidence'][key] / count),
+            ))
+
+        return groups
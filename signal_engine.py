@@ -1,13 +1,19 @@
 """
 Signal Engine - Runs all strategies and combines signals
 """
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Union
 from dataclasses import dataclass, field
+import threading
+import numpy as np
 import pandas as pd
 from loguru import logger
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
-from strategies.base_strategy import Signal
+from strategies.base_strategy import Signal, SeriesSignals
+from strategies.ohlcv_view import OHLCVView
+from strategies.indicator_cache import IndicatorCache
+from signal_batch import SignalBatch, ConfluenceGroup
+from result_cache import SeriesResultCache, data_digest
 from strategies.channel_breakout import ChannelBreakoutStrategy
 from strategies.rsi_divergence import RSIDivergenceStrategy
 from strategies.volume_spike import VolumeSpikeStrategy
@@ -32,6 +38,7 @@ class ConfluentSignal:
     confluence_score: int
     confidence: float
     reasons: List[str]
+    components: List[Dict] = field(default_factory=list)  # Per strategy: strategy, timeframe, confidence, reason
     
     def to_dict(self) -> dict:
         """Convert to database format"""
@@ -44,7 +51,8 @@ class ConfluentSignal:
             'target': self.target,
             'stop_loss': self.stop_loss,
             'confidence_score': self.confluence_score,
-            'reason': ' | '.join(self.reasons)
+            'reason': ' | '.join(self.reasons),
+            'components': self.components,
         }
 
 
@@ -62,6 +70,13 @@ class SignalEngine:
             MACDStrategy(),
             BollingerBandsStrategy(),
         ]
+        
+        # (symbol, timeframe) -> (series version, raw strategy signals)
+        self._series_cache: Dict[Tuple[str, str], Tuple[tuple, List[Signal]]] = {}
+        self._series_cache_lock = threading.Lock()
+        self.series_cache_hits = 0
+        self.series_cache_misses = 0
+        
         logger.info(f"Initialized {len(self.strategies)} strategies")
     
     def analyze_symbol(
@@ -79,33 +94,111 @@ class SignalEngine:
         Returns:
             List of confluent signals
         """
+        return self.calculate_confluence(self.collect_signals(symbol, data))
+    
+    def collect_signals(
+        self,
+        symbol: str,
+        data: Dict[str, pd.DataFrame]
+    ) -> SignalBatch:
+        """
+        Run every strategy on every timeframe of a symbol
+        
+        Args:
+            symbol: Trading pair (e.g., BTC/USDT)
+            data: Dict of {timeframe: DataFrame}
+        
+        Returns:
+            Batch of candidate signals aligned with the market trend
+        """
         # 1. Market Structure Filter (Global Trend)
         market_trend = self._get_market_trend(data)
         
-        all_signals = []
+        batch = SignalBatch()
         
         # Run each strategy on each timeframe
         for timeframe, df in data.items():
             if df is None or df.empty:
                 continue
             
-            for strategy in self.strategies:
-                try:
-                    signal = strategy.analyze(df, symbol, timeframe)
-                    if signal:
-                        # 2. Filter signal based on market trend
-                        if self._is_aligned_with_market(signal, market_trend):
-                            all_signals.append(signal)
-                        else:
-                            logger.info(f"Filtered {signal.direction} signal for {symbol} due to market trend mismatch ({market_trend})")
-                except Exception as e:
-                    logger.error(f"Error in {strategy.name} for {symbol} {timeframe}: {e}")
-        
-        # 3. Calculate confluence and MTF
-        confluent_signals = self._calculate_confluence(all_signals)
+            for signal in self._analyze_series(symbol, timeframe, df):
+                # 2. Filter signal based on market trend
+                if self._is_aligned_with_market(signal, market_trend):
+                    batch.append(signal)
+                else:
+                    logger.info(f"Filtered {signal.direction} signal for {symbol} due to market trend mismatch ({market_trend})")
         
-        return confluent_signals
+        return batch
 
+    def _analyze_series(self, symbol: str, timeframe: str, df: pd.DataFrame) -> List[Signal]:
+        """Run all strategies on one series, reusing the last result if the series is unchanged"""
+        # One read-only view per series, shared by all strategies
+        view = OHLCVView.from_frame(df)
+        version = self._series_version(view)
+        key = (symbol, timeframe)
+        
+        if version is not None:
+            with self._series_cache_lock:
+                cached = self._series_cache.get(key)
+                if cached and cached[0] == version:
+                    self.series_cache_hits += 1
+                    return cached[1]
+        
+        signals = []
+        for strategy in self.strategies:
+            try:
+                signal = strategy.analyze_view(view, symbol, timeframe)
+                if signal:
+                    signals.append(signal)
+            except Exception as e:
+                logger.error(f"Error in {strategy.name} for {symbol} {timeframe}: {e}")
+        
+        with self._series_cache_lock:
+            self.series_cache_misses += 1
+            if version is not None:
+                self._series_cache[key] = (version, signals)
+        
+        return signals
+    
+    def analyze_history(self, view: OHLCVView, result_cache: SeriesResultCache = None) -> List[SeriesSignals]:
+        """
+        Evaluate every strategy on every bar of a history in one pass
+        
+        Bar i of each result matches analyze_view() on the first i + 1 bars.
+        All strategies share one indicator cache for the series. With a
+        result cache, strategies whose (data, code, params) were evaluated
+        before are loaded from disk instead.
+        """
+        cache = IndicatorCache(view)
+        if result_cache is None:
+            return [strategy.analyze_series(view, cache=cache) for strategy in self.strategies]
+        
+        data_key = data_digest(view)
+        results = []
+        for strategy in self.strategies:
+            key = result_cache.key(data_key, strategy)
+            series = result_cache.load(key, strategy.name)
+            if series is None:
+                series = strategy.analyze_series(view, cache=cache)
+                result_cache.save(key, series)
+            results.append(series)
+        return results
+    
+    def _series_version(self, view: OHLCVView) -> Optional[tuple]:
+        """
+        Version of a series: last closed candle timestamp plus a hash of the forming bar
+        
+        The last row from the exchange is the still-forming candle; strategies
+        only see different data when a candle closes or the forming bar moves.
+        """
+        if view.timestamps is None or len(view) < 2:
+            return None
+        
+        forming_bar = hash((
+            view.at('open'), view.at('high'), view.at('low'), view.at('close'), view.at('volume')
+        ))
+        return (int(view.timestamps[-2]), len(view), forming_bar)
+    
     def _get_market_trend(self, data: Dict[str, pd.DataFrame]) -> str:
         """Determine global market trend using BTC (if available) or current symbol"""
         # In a real scenario, we'd fetch BTC/USDT specifically. 
@@ -124,6 +217,10 @@ class SignalEngine:
         
         return 'NEUTRAL'
 
+    def trend_ema(self, view: OHLCVView) -> np.ndarray:
+        """EMA200 used by the market trend filter, for every bar of a series"""
+        return EMAIndicator(close=view.series('close'), window=200).ema_indicator().to_numpy()
+    
     def _is_aligned_with_market(self, signal: Signal, market_trend: str) -> bool:
         """Check if signal direction aligns with global market trend"""
         if market_trend == 'NEUTRAL':
@@ -134,64 +231,58 @@ class SignalEngine:
             return True
         return False
     
-    def _calculate_confluence(self, signals: List[Signal]) -> List[ConfluentSignal]:
-        """Group signals by direction and calculate confluence"""
-        if not signals:
-            return []
+    def calculate_confluence(self, signals: Union[SignalBatch, List[Signal]]) -> List[ConfluentSignal]:
+        """Group signals by symbol and direction and calculate confluence"""
+        batch = signals if isinstance(signals, SignalBatch) else SignalBatch(signals)
         
-        # Group by direction
-        buy_signals = [s for s in signals if s.direction == 'BUY']
-        sell_signals = [s for s in signals if s.direction == 'SELL']
-        
-        confluent_signals = []
-        
-        # Process BUY signals
-        if len(buy_signals) >= config.MIN_CONFLUENCE_SCORE:
-            confluent_signals.append(self._merge_signals(buy_signals, 'BUY'))
-        
-        # Process SELL signals
-        if len(sell_signals) >= config.MIN_CONFLUENCE_SCORE:
-            confluent_signals.append(self._merge_signals(sell_signals, 'SELL'))
-        
-        return confluent_signals
+        # 3. Calculate confluence and MTF; only survivors become ConfluentSignals
+        return [
+            self._merge_group(batch, group)
+            for group in batch.confluence_groups(config.MIN_CONFLUENCE_SCORE)
+        ]
     
-    def _merge_signals(self, signals: List[Signal], direction: str) -> ConfluentSignal:
-        """Merge multiple signals into one confluent signal"""
-        # Get unique strategies and timeframes
-        strategies = list(set(s.strategy for s in signals))
-        timeframes = list(set(s.timeframe for s in signals))
+    def _merge_group(self, batch: SignalBatch, group: ConfluenceGroup) -> ConfluentSignal:
+        """Merge one confluence group into a confluent signal"""
+        rows = group.rows
+        timeframes = sorted(set(batch.timeframes[i] for i in rows))
         
         # Create strategy-timeframe pairs for better display
-        strategy_details = []
-        for s in signals:
-            detail = f"{s.strategy} ({s.timeframe})" if len(signals) > 1 else s.strategy
-            strategy_details.append(detail)
-        
-        # Average price, target, stop_loss
-        avg_price = sum(s.price for s in signals) / len(signals)
-        avg_target = sum(s.target for s in signals) / len(signals)
-        avg_stop_loss = sum(s.stop_loss for s in signals) / len(signals)
-        avg_confidence = sum(s.confidence for s in signals) / len(signals)
+        if len(rows) > 1:
+            strategy_details = [f"{batch.strategies[i]} ({batch.timeframes[i]})" for i in rows]
+        else:
+            strategy_details = [batch.strategies[i] for i in rows]
+        reasons = [batch.reasons[i] for i in rows]
+        confidences = batch.column('confidence')
+        components = [
+            {
+                'strategy': batch.strategies[i],
+                'timeframe': batch.timeframes[i],
+                'confidence': float(confidences[i]),
+                'reason': batch.reasons[i],
+            }
+            for i in rows
+        ]
         
         # Check for MTF (Multiple Timeframe Confirmation)
         is_mtf = len(timeframes) >= 2
         
-        merged_confidence = avg_confidence
+        merged_confidence = group.avg_confidence
         if is_mtf:
-            merged_confidence = min(1.0, avg_confidence + 0.1)  # Bonus for MTF
+            merged_confidence = min(1.0, group.avg_confidence + 0.1)  # Bonus for MTF
             reasons.append(f"MTF Confirmation ({', '.join(timeframes)})")
             
         return ConfluentSignal(
-            symbol=signals[0].symbol,
-            timeframe=', '.join(sorted(timeframes)),
+            symbol=group.symbol,
+            timeframe=', '.join(timeframes),
             strategies=strategy_details,
-            direction=direction,
-            price=avg_price,
-            target=avg_target,
-            stop_loss=avg_stop_loss,
-            confluence_score=len(signals),
+            direction=group.direction,
+            price=group.avg_price,
+            target=group.avg_target,
+            stop_loss=group.avg_stop_loss,
+            confluence_score=len(rows),
             confidence=merged_confidence,
-            reasons=reasons
+            reasons=reasons,
+            components=components
         )
     
     def analyze_all(
@@ -209,14 +300,15 @@ class SignalEngine:
         Returns:
             List of all confluent signals
         """
-        all_signals = []
+        batch = SignalBatch()
         total_symbols = len(all_data)
+        hits_before, misses_before = self.series_cache_hits, self.series_cache_misses
         
         logger.info(f"Analyzing {total_symbols} symbols...")
         
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
             future_to_symbol = {
-                executor.submit(self.analyze_symbol, symbol, data): symbol
+                executor.submit(self.collect_signals, symbol, data): symbol
                 for symbol, data in all_data.items()
             }
             
@@ -226,14 +318,21 @@ class SignalEngine:
                 completed += 1
                 
                 try:
-                    signals = future.result()
-                    all_signals.extend(signals)
+                    batch.extend(future.result())
                     
                     if completed % 100 == 0:
-                        logger.info(f"Analyzed {completed}/{total_symbols} symbols, found {len(all_signals)} signals so far")
+                        logger.info(f"Analyzed {completed}/{total_symbols} symbols, {len(batch)} candidate signals so far")
                         
                 except Exception as e:
                     logger.error(f"Error analyzing {symbol}: {e}")
         
+        # One vectorized confluence pass over the whole cycle
+        all_signals = self.calculate_confluence(batch)
+        
+        logger.info(
+            f"Series: {self.series_cache_misses - misses_before} re-evaluated, "
+            f"{self.series_cache_hits - hits_before} unchanged since last cycle"
+        )
+        
         logger.info(f"Analysis complete: {len(all_signals)} signals from {total_symbols} symbols")
         return all_signals
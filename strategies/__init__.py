@@ -1,4 +1,6 @@
 """Strategy module"""
-from .base_strategy import BaseStrategy, Signal
+from .base_strategy import BaseStrategy, Signal, SeriesSignals
+from .ohlcv_view import OHLCVView
+from .indicator_cache import IndicatorCache
 
-__all__ = ['BaseStrategy', 'Signal']
+__all__ = ['BaseStrategy', 'Signal', 'SeriesSignals', 'OHLCVView', 'IndicatorCache']
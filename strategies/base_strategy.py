@@ -1,16 +1,20 @@
 """
 Base strategy class - All strategies inherit from this
 """
-from abc import ABC, abstractmethod
+import copy
+from abc import ABC
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Callable, Optional, Union
+import numpy as np
 import pandas as pd
+from .ohlcv_view import OHLCVView
+from .indicator_cache import IndicatorCache
 
 
-@dataclass
+@dataclass(slots=True)
 class Signal:
-    """Signal dataclass"""
+    """Signal dataclass (slotted record)"""
     symbol: str
     timeframe: str
     strategy: str
@@ -20,11 +24,7 @@ class Signal:
     stop_loss: float
     confidence: float  # 0.0 - 1.0
     reason: str
-    timestamp: datetime = None
-    
-    def __post_init__(self):
-        if self.timestamp is None:
-            self.timestamp = datetime.utcnow()
+    timestamp: Optional[datetime] = None  # Left unset; the cycle time is tracked by the engine
     
     def to_dict(self) -> dict:
         """Convert to dictionary for database storage"""
@@ -41,6 +41,65 @@ class Signal:
         }
 
 
+@dataclass
+class SeriesSignals:
+    """Per-bar strategy output over a whole OHLCV history"""
+    strategy: str
+    direction: np.ndarray  # int8: 1 = BUY, -1 = SELL, 0 = no signal
+    price: np.ndarray
+    target: np.ndarray
+    stop_loss: np.ndarray
+    confidence: np.ndarray
+    reasons: np.ndarray  # object array, None where there is no signal
+    
+    @classmethod
+    def empty(cls, length: int, strategy: str) -> 'SeriesSignals':
+        """Create a result with no signals"""
+        return cls(
+            strategy=strategy,
+            direction=np.zeros(length, dtype=np.int8),
+            price=np.full(length, np.nan),
+            target=np.full(length, np.nan),
+            stop_loss=np.full(length, np.nan),
+            confidence=np.full(length, np.nan),
+            reasons=np.full(length, None, dtype=object),
+        )
+    
+    def __len__(self) -> int:
+        return len(self.direction)
+    
+    @property
+    def triggered(self) -> np.ndarray:
+        """Indices of bars with a signal"""
+        return np.flatnonzero(self.direction)
+    
+    def set_signal(self, index: int, signal: Signal):
+        """Store a scalar Signal at a bar"""
+        self.direction[index] = 1 if signal.direction == 'BUY' else -1
+        self.price[index] = signal.price
+        self.target[index] = signal.target
+        self.stop_loss[index] = signal.stop_loss
+        self.confidence[index] = signal.confidence
+        self.reasons[index] = signal.reason
+    
+    def signal_at(self, index: int, symbol: str, timeframe: str) -> Optional[Signal]:
+        """Build the Signal for a bar (None if the bar has no signal)"""
+        direction = self.direction[index]
+        if direction == 0:
+            return None
+        return Signal(
+            symbol=symbol,
+            timeframe=timeframe,
+            strategy=self.strategy,
+            direction='BUY' if direction > 0 else 'SELL',
+            price=float(self.price[index]),
+            target=float(self.target[index]),
+            stop_loss=float(self.stop_loss[index]),
+            confidence=float(self.confidence[index]),
+            reason=self.reasons[index],
+        )
+
+
 class BaseStrategy(ABC):
     """Abstract base class for all trading strategies"""
     
@@ -48,7 +107,11 @@ class BaseStrategy(ABC):
         self.params = params or {}
         self.name = self.__class__.__name__
     
-    @abstractmethod
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.analyze is BaseStrategy.analyze and cls.analyze_view is BaseStrategy.analyze_view:
+            raise TypeError(f"{cls.__name__} must implement analyze() or analyze_view()")
+    
     def analyze(self, df: pd.DataFrame, symbol: str, timeframe: str) -> Optional[Signal]:
         """
         Analyze data and return signal if conditions are met
@@ -61,7 +124,65 @@ class BaseStrategy(ABC):
         Returns:
             Signal object if conditions are met, None otherwise
         """
-        pass
+        return self.analyze_view(OHLCVView.from_frame(df), symbol, timeframe)
+    
+    def analyze_view(self, view: OHLCVView, symbol: str, timeframe: str) -> Optional[Signal]:
+        """
+        Analyze a read-only OHLCV view and return signal if conditions are met
+        
+        Strategies built on the view read NumPy arrays directly and avoid
+        DataFrame copies. The default falls back to the DataFrame path.
+        
+        Args:
+            view: Read-only OHLCV view
+            symbol: Trading pair symbol (e.g., BTC/USDT)
+            timeframe: Timeframe string (e.g., '1h')
+        
+        Returns:
+            Signal object if conditions are met, None otherwise
+        """
+        return self.analyze(view.frame, symbol, timeframe)
+    
+    def analyze_series(
+        self,
+        view: OHLCVView,
+        params: dict = None,
+        cache: IndicatorCache = None
+    ) -> SeriesSignals:
+        """
+        Evaluate the strategy on every bar of a history
+        
+        The result at bar i matches analyze_view() on the first i + 1 bars.
+        This default runs analyze_view() once per bar; strategies override it
+        with a vectorized pass over cached indicator arrays.
+        
+        Args:
+            view: Read-only OHLCV view of the full history
+            params: Parameter overrides (merged over self.params)
+            cache: Indicator cache for the view, shared across calls
+        
+        Returns:
+            SeriesSignals with one entry per bar
+        """
+        return self._evaluate_bars(view, np.arange(len(view)), params)
+    
+    def _evaluate_bars(self, view: OHLCVView, bars: np.ndarray, params: dict = None) -> SeriesSignals:
+        """Run analyze_view() on the prefix ending at each of the given bars"""
+        strategy = self.with_params(params)
+        result = SeriesSignals.empty(len(view), self.name)
+        for i in bars:
+            signal = strategy.analyze_view(view.slice(0, i + 1), '', '')
+            if signal:
+                result.set_signal(i, signal)
+        return result
+    
+    def with_params(self, params: dict = None) -> 'BaseStrategy':
+        """Get a copy of the strategy with parameter overrides applied"""
+        if not params:
+            return self
+        strategy = copy.copy(self)
+        strategy.params = {**self.params, **params}
+        return strategy
     
     def get_name(self) -> str:
         """Get strategy name"""
@@ -104,3 +225,64 @@ class BaseStrategy(ABC):
                 target = entry_price * (1 - (stop_percent * rr_ratio) / 100)
         
         return round(target, 8), round(stop_loss, 8)
+    
+    def calculate_target_stop_series(
+        self,
+        entry_prices: np.ndarray,
+        direction: str,
+        rr_ratio: float = 2.0,
+        stop_percent: float = 1.5
+    ) -> tuple:
+        """
+        Vectorized calculate_target_stop() for percentage stops
+        
+        Returns:
+            (target_prices, stop_loss_prices)
+        """
+        if direction == 'BUY':
+            stop_loss = entry_prices * (1 - stop_percent / 100)
+            target = entry_prices * (1 + (stop_percent * rr_ratio) / 100)
+        else:  # SELL
+            stop_loss = entry_prices * (1 + stop_percent / 100)
+            target = entry_prices * (1 - (stop_percent * rr_ratio) / 100)
+        
+        return np.round(target, 8), np.round(stop_loss, 8)
+    
+    @staticmethod
+    def _previous(values: np.ndarray) -> np.ndarray:
+        """Values shifted one bar forward (NaN at the first bar)"""
+        previous = np.empty(len(values))
+        previous[:1] = np.nan
+        previous[1:] = values[:-1]
+        return previous
+    
+    @staticmethod
+    def _min_length_mask(length: int, required: int) -> np.ndarray:
+        """Bars whose history (bar index + 1) is at least `required` long"""
+        return np.arange(1, length + 1) >= required
+    
+    def _fill_series(
+        self,
+        result: SeriesSignals,
+        mask: np.ndarray,
+        direction: str,
+        prices: np.ndarray,
+        confidence: Union[float, np.ndarray],
+        reason: Callable[[int], str],
+        stop_percent: float
+    ):
+        """Store vectorized signals for the bars selected by mask"""
+        indices = np.flatnonzero(mask)
+        if len(indices) == 0:
+            return
+        
+        entry = prices[indices]
+        target, stop_loss = self.calculate_target_stop_series(entry, direction, stop_percent=stop_percent)
+        
+        result.direction[indices] = 1 if direction == 'BUY' else -1
+        result.price[indices] = entry
+        result.target[indices] = target
+        result.stop_loss[indices] = stop_loss
+        result.confidence[indices] = confidence[indices] if isinstance(confidence, np.ndarray) else confidence
+        for i in indices:
+            result.reasons[i] = reason(i)
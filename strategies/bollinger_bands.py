@@ -1,10 +1,12 @@
 """
 Bollinger Bands Squeeze and Breakout Strategy
 """
-import pandas as pd
+import numpy as np
 from typing import Optional
 from ta.volatility import BollingerBands
-from .base_strategy import BaseStrategy, Signal
+from .base_strategy import BaseStrategy, Signal, SeriesSignals
+from .ohlcv_view import OHLCVView
+from .indicator_cache import IndicatorCache
 import config
 
 class BollingerBandsStrategy(BaseStrategy):
@@ -15,35 +17,32 @@ class BollingerBandsStrategy(BaseStrategy):
         super().__init__(params)
         self.name = "BollingerBandsStrategy"
     
-    def analyze(self, df: pd.DataFrame, symbol: str, timeframe: str) -> Optional[Signal]:
+    def analyze_view(self, view: OHLCVView, symbol: str, timeframe: str) -> Optional[Signal]:
         """Analyze for BB squeeze and breakout"""
-        if len(df) < self.params['period'] + 5:
+        if len(view) < self.params['period'] + 5:
             return None
             
         bb = BollingerBands(
-            close=df['close'],
+            close=view.series('close'),
             window=self.params['period'],
             window_dev=self.params['std_dev']
         )
         
-        df_copy = df.copy()
-        df_copy['bb_high'] = bb.bollinger_hband()
-        df_copy['bb_low'] = bb.bollinger_lband()
-        df_copy['bb_mid'] = bb.bollinger_mavg()
+        bb_high = bb.bollinger_hband().to_numpy()
+        bb_low = bb.bollinger_lband().to_numpy()
+        bb_mid = bb.bollinger_mavg().to_numpy()
         
-        # Calculate bandwidth for squeeze detection
-        df_copy['bandwidth'] = (df_copy['bb_high'] - df_copy['bb_low']) / df_copy['bb_mid']
-        
-        current = df_copy.iloc[-1]
-        previous = df_copy.iloc[-2]
+        current_close = view.at('close')
+        previous_close = view.at('close', -2)
         
         # Squeeze detection: bandwidth is low
-        is_squeeze = current['bandwidth'] < self.params['squeeze_threshold']
+        bandwidth = (bb_high[-1] - bb_low[-1]) / bb_mid[-1]
+        is_squeeze = bandwidth < self.params['squeeze_threshold']
         
         # Bullish Breakout
-        if current['close'] > current['bb_high'] and previous['close'] <= previous['bb_high']:
+        if current_close > bb_high[-1] and previous_close <= bb_high[-2]:
             target, stop_loss = self.calculate_target_stop(
-                current['close'],
+                current_close,
                 'BUY',
                 stop_percent=config.DEFAULT_STOP_LOSS_PERCENT
             )
@@ -54,7 +53,7 @@ class BollingerBandsStrategy(BaseStrategy):
                 timeframe=timeframe,
                 strategy=self.name,
                 direction='BUY',
-                price=float(current['close']),
+                price=float(current_close),
                 target=float(target),
                 stop_loss=float(stop_loss),
                 confidence=0.85 if is_squeeze else 0.75,
@@ -62,9 +61,9 @@ class BollingerBandsStrategy(BaseStrategy):
             )
             
         # Bearish Breakout
-        if current['close'] < current['bb_low'] and previous['close'] >= previous['bb_low']:
+        if current_close < bb_low[-1] and previous_close >= bb_low[-2]:
             target, stop_loss = self.calculate_target_stop(
-                current['close'],
+                current_close,
                 'SELL',
                 stop_percent=config.DEFAULT_STOP_LOSS_PERCENT
             )
@@ -75,7 +74,7 @@ class BollingerBandsStrategy(BaseStrategy):
                 timeframe=timeframe,
                 strategy=self.name,
                 direction='SELL',
-                price=float(current['close']),
+                price=float(current_close),
                 target=float(target),
                 stop_loss=float(stop_loss),
                 confidence=0.85 if is_squeeze else 0.75,
@@ -83,3 +82,33 @@ class BollingerBandsStrategy(BaseStrategy):
             )
             
         return None
+    
+    def analyze_series(self, view: OHLCVView, params: dict = None, cache: IndicatorCache = None) -> SeriesSignals:
+        """Vectorized Bollinger breakout detection over every bar"""
+        params = self.with_params(params).params
+        cache = cache or IndicatorCache(view)
+        result = SeriesSignals.empty(len(view), self.name)
+        
+        bb_high, bb_low, bb_mid = cache.bollinger(params['period'], params['std_dev'])
+        close = view.close
+        prev_close = self._previous(close)
+        valid = self._min_length_mask(len(view), params['period'] + 5)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            is_squeeze = (bb_high - bb_low) / bb_mid < params['squeeze_threshold']
+        confidence = np.where(is_squeeze, 0.85, 0.75)
+        
+        buy = valid & (close > bb_high) & (prev_close <= self._previous(bb_high))
+        sell = valid & (close < bb_low) & (prev_close >= self._previous(bb_low)) & ~buy
+        
+        self._fill_series(
+            result, buy, 'BUY', close, confidence,
+            lambda i: f"Bollinger Top Breakout{' after Squeeze' if is_squeeze[i] else ''}",
+            config.DEFAULT_STOP_LOSS_PERCENT
+        )
+        self._fill_series(
+            result, sell, 'SELL', close, confidence,
+            lambda i: f"Bollinger Bottom Breakout{' after Squeeze' if is_squeeze[i] else ''}",
+            config.DEFAULT_STOP_LOSS_PERCENT
+        )
+        return result
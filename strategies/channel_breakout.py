@@ -2,11 +2,12 @@
 Channel Breakout Strategy
 Detects falling/rising channels and breakout signals
 """
-import pandas as pd
 import numpy as np
 from typing import Optional
 from scipy import stats
-from .base_strategy import BaseStrategy, Signal
+from .base_strategy import BaseStrategy, Signal, SeriesSignals
+from .ohlcv_view import OHLCVView
+from .indicator_cache import IndicatorCache
 import config
 
 
@@ -17,20 +18,18 @@ class ChannelBreakoutStrategy(BaseStrategy):
         params = config.STRATEGY_PARAMS['channel_breakout']
         super().__init__(params)
     
-    def analyze(self, df: pd.DataFrame, symbol: str, timeframe: str) -> Optional[Signal]:
+    def analyze_view(self, view: OHLCVView, symbol: str, timeframe: str) -> Optional[Signal]:
         """Analyze for channel breakout"""
-        if len(df) < self.params['lookback_period']:
+        if len(view) < self.params['lookback_period']:
             return None
         
         # Get recent data
         lookback = self.params['lookback_period']
-        recent = df.tail(lookback).copy()
-        recent['index_col'] = range(len(recent))
         
         # Calculate upper and lower channel using linear regression
-        highs = recent['high'].values
-        lows = recent['low'].values
-        x = recent['index_col'].values
+        highs = view.last('high', lookback)
+        lows = view.last('low', lookback)
+        x = np.arange(lookback)
         
         # Upper channel (resistance)
         slope_high, intercept_high, r_high, _, _ = stats.linregress(x, highs)
@@ -54,20 +53,20 @@ class ChannelBreakoutStrategy(BaseStrategy):
             return None
         
         # Get current and previous candles
-        current = df.iloc[-1]
-        previous = df.iloc[-2]
+        current_close = view.at('close')
+        previous_close = view.at('close', -2)
         
         # Calculate average volume
-        avg_volume = df['volume'].tail(20).mean()
-        volume_ratio = current['volume'] / avg_volume
+        avg_volume = view.last('volume', 20).mean()
+        volume_ratio = view.at('volume') / avg_volume
         
         # Check for upward breakout (Falling or Rising channel breakout to upside)
-        if (previous['close'] <= current_upper and 
-            current['close'] > current_upper and
+        if (previous_close <= current_upper and 
+            current_close > current_upper and
             volume_ratio >= self.params['volume_multiplier']):
             
             target, stop_loss = self.calculate_target_stop(
-                current['close'],
+                current_close,
                 'BUY',
                 stop_percent=config.DEFAULT_STOP_LOSS_PERCENT
             )
@@ -79,7 +78,7 @@ class ChannelBreakoutStrategy(BaseStrategy):
                 timeframe=timeframe,
                 strategy=self.name,
                 direction='BUY',
-                price=float(current['close']),
+                price=float(current_close),
                 target=float(target),
                 stop_loss=float(stop_loss),
                 confidence=0.75,
@@ -87,12 +86,12 @@ class ChannelBreakoutStrategy(BaseStrategy):
             )
         
         # Check for downward breakout
-        if (previous['close'] >= current_lower and 
-            current['close'] < current_lower and
+        if (previous_close >= current_lower and 
+            current_close < current_lower and
             volume_ratio >= self.params['volume_multiplier']):
             
             target, stop_loss = self.calculate_target_stop(
-                current['close'],
+                current_close,
                 'SELL',
                 stop_percent=config.DEFAULT_STOP_LOSS_PERCENT
             )
@@ -104,7 +103,7 @@ class ChannelBreakoutStrategy(BaseStrategy):
                 timeframe=timeframe,
                 strategy=self.name,
                 direction='SELL',
-                price=float(current['close']),
+                price=float(current_close),
                 target=float(target),
                 stop_loss=float(stop_loss),
                 confidence=0.75,
@@ -112,3 +111,26 @@ class ChannelBreakoutStrategy(BaseStrategy):
             )
         
         return None
+    
+    def analyze_series(self, view: OHLCVView, params: dict = None, cache: IndicatorCache = None) -> SeriesSignals:
+        """
+        Channel breakout detection over every bar
+        
+        The volume and direction gates are evaluated for all bars at once; the
+        channel regression only runs on the bars that pass them.
+        """
+        params = self.with_params(params).params
+        cache = cache or IndicatorCache(view)
+        
+        close = view.close
+        prev_close = self._previous(close)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            volume_ratio = view.volume / cache.tail_mean('volume', 20)
+        
+        # A breakout needs the volume surge and a close that moved through the line
+        candidates = (
+            self._min_length_mask(len(view), max(params['lookback_period'], 2))
+            & (volume_ratio >= params['volume_multiplier'])
+            & (close != prev_close)
+        )
+        return self._evaluate_bars(view, np.flatnonzero(candidates), params)
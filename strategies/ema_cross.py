@@ -2,10 +2,11 @@
 EMA Cross Strategy
 Golden Cross and Death Cross with ADX trend filter
 """
-import pandas as pd
 from typing import Optional
 from ta.trend import EMAIndicator, ADXIndicator
-from .base_strategy import BaseStrategy, Signal
+from .base_strategy import BaseStrategy, Signal, SeriesSignals
+from .ohlcv_view import OHLCVView
+from .indicator_cache import IndicatorCache
 import config
 
 
@@ -16,42 +17,35 @@ class EMACrossStrategy(BaseStrategy):
         params = config.STRATEGY_PARAMS['ema_cross']
         super().__init__(params)
     
-    def analyze(self, df: pd.DataFrame, symbol: str, timeframe: str) -> Optional[Signal]:
+    def analyze_view(self, view: OHLCVView, symbol: str, timeframe: str) -> Optional[Signal]:
         """Analyze for EMA crossover"""
         required_length = max(self.params['slow_period'], self.params['adx_period']) + 5
-        if len(df) < required_length:
+        if len(view) < required_length:
             return None
         
         # Calculate EMAs
-        ema_fast = EMAIndicator(close=df['close'], window=self.params['fast_period'])
-        ema_slow = EMAIndicator(close=df['close'], window=self.params['slow_period'])
-        
-        df_copy = df.copy()
-        df_copy['ema_fast'] = ema_fast.ema_indicator()
-        df_copy['ema_slow'] = ema_slow.ema_indicator()
+        close = view.series('close')
+        ema_fast = EMAIndicator(close=close, window=self.params['fast_period']).ema_indicator().to_numpy()
+        ema_slow = EMAIndicator(close=close, window=self.params['slow_period']).ema_indicator().to_numpy()
         
         # Calculate ADX for trend strength
         adx = ADXIndicator(
-            high=df['high'],
-            low=df['low'],
-            close=df['close'],
+            high=view.series('high'),
+            low=view.series('low'),
+            close=close,
             window=self.params['adx_period']
         )
-        df_copy['adx'] = adx.adx()
-        
-        # Get current and previous values
-        current = df_copy.iloc[-1]
-        previous = df_copy.iloc[-2]
+        current_adx = adx.adx().to_numpy()[-1]
         
         # Check ADX trend strength
-        if current['adx'] < self.params['min_adx']:
+        if current_adx < self.params['min_adx']:
             return None  # No strong trend
         
-        current_price = current['close']
+        current_price = view.at('close')
         
         # Golden Cross (bullish)
-        if (previous['ema_fast'] <= previous['ema_slow'] and 
-            current['ema_fast'] > current['ema_slow']):
+        if (ema_fast[-2] <= ema_slow[-2] and 
+            ema_fast[-1] > ema_slow[-1]):
             
             target, stop_loss = self.calculate_target_stop(
                 current_price,
@@ -68,12 +62,12 @@ class EMACrossStrategy(BaseStrategy):
                 target=float(target),
                 stop_loss=float(stop_loss),
                 confidence=0.85,
-                reason=f"Golden Cross (EMA 50/200, ADX: {current['adx']:.1f})"
+                reason=f"Golden Cross (EMA 50/200, ADX: {current_adx:.1f})"
             )
         
         # Death Cross (bearish)
-        if (previous['ema_fast'] >= previous['ema_slow'] and 
-            current['ema_fast'] < current['ema_slow']):
+        if (ema_fast[-2] >= ema_slow[-2] and 
+            ema_fast[-1] < ema_slow[-1]):
             
             target, stop_loss = self.calculate_target_stop(
                 current_price,
@@ -90,7 +84,41 @@ class EMACrossStrategy(BaseStrategy):
                 target=float(target),
                 stop_loss=float(stop_loss),
                 confidence=0.85,
-                reason=f"Death Cross (EMA 50/200, ADX: {current['adx']:.1f})"
+                reason=f"Death Cross (EMA 50/200, ADX: {current_adx:.1f})"
             )
         
         return None
+    
+    def analyze_series(self, view: OHLCVView, params: dict = None, cache: IndicatorCache = None) -> SeriesSignals:
+        """Vectorized EMA crossover detection over every bar"""
+        params = self.with_params(params).params
+        cache = cache or IndicatorCache(view)
+        result = SeriesSignals.empty(len(view), self.name)
+        
+        # ta's ADX needs at least two windows of data (analyze_view raises below that)
+        required_length = max(params['slow_period'], params['adx_period']) + 5
+        required_length = max(required_length, 2 * params['adx_period'])
+        if len(view) < required_length:
+            return result
+        
+        ema_fast = cache.ema(params['fast_period'])
+        ema_slow = cache.ema(params['slow_period'])
+        adx = cache.adx(params['adx_period'])
+        prev_fast, prev_slow = self._previous(ema_fast), self._previous(ema_slow)
+        
+        trending = self._min_length_mask(len(view), required_length) & ~(adx < params['min_adx'])
+        
+        buy = trending & (prev_fast <= prev_slow) & (ema_fast > ema_slow)
+        sell = trending & (prev_fast >= prev_slow) & (ema_fast < ema_slow) & ~buy
+        
+        self._fill_series(
+            result, buy, 'BUY', view.close, 0.85,
+            lambda i: f"Golden Cross (EMA 50/200, ADX: {adx[i]:.1f})",
+            config.DEFAULT_STOP_LOSS_PERCENT
+        )
+        self._fill_series(
+            result, sell, 'SELL', view.close, 0.85,
+            lambda i: f"Death Cross (EMA 50/200, ADX: {adx[i]:.1f})",
+            config.DEFAULT_STOP_LOSS_PERCENT
+        )
+        return result
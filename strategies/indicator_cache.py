@@ -0,0 +1,103 @@
+"""
+Indicator Cache
+Computes each distinct indicator once per OHLCV series and shares it
+between strategies and parameter sets
+"""
+from typing import Callable, Dict, Hashable, Tuple
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from ta.momentum import RSIIndicator
+from ta.trend import ADXIndicator
+from .ohlcv_view import OHLCVView
+
+
+class IndicatorCache:
+    """
+    Memoizes indicator arrays computed over one OHLCV view
+
+    Indicators are computed over the whole view with the same `ta` formulas
+    the strategies use. They are causal, so the value at bar i equals the
+    value a strategy would see when analyzing the first i + 1 bars.
+    """
+
+    def __init__(self, view: OHLCVView):
+        self.view = view
+        self._values: Dict[Hashable, object] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, compute: Callable[[], object]):
+        """Get a cached value, computing it on first use"""
+        if key in self._values:
+            self.hits += 1
+            return self._values[key]
+        self.misses += 1
+        value = compute()
+        self._values[key] = value
+        return value
+
+    def ema_series(self, period: int) -> pd.Series:
+        """EMA of close as a Series (shared by EMA and MACD indicators)"""
+        return self.get(
+            ('ema_series', period),
+            lambda: self.view.series('close').ewm(span=period, min_periods=period, adjust=False).mean()
+        )
+
+    def ema(self, period: int) -> np.ndarray:
+        """EMA of close"""
+        return self.get(('ema', period), lambda: self.ema_series(period).to_numpy())
+
+    def rsi(self, period: int) -> np.ndarray:
+        """RSI of close"""
+        return self.get(
+            ('rsi', period),
+            lambda: RSIIndicator(close=self.view.series('close'), window=period).rsi().to_numpy()
+        )
+
+    def adx(self, period: int) -> np.ndarray:
+        """ADX trend strength"""
+        return self.get(
+            ('adx', period),
+            lambda: ADXIndicator(
+                high=self.view.series('high'),
+                low=self.view.series('low'),
+                close=self.view.series('close'),
+                window=period
+            ).adx().to_numpy()
+        )
+
+    def macd(self, fast: int, slow: int, signal: int) -> Tuple[np.ndarray, np.ndarray]:
+        """MACD line and signal line"""
+        def compute():
+            macd = self.ema_series(fast) - self.ema_series(slow)
+            macd_signal = macd.ewm(span=signal, min_periods=signal, adjust=False).mean()
+            return macd.to_numpy(), macd_signal.to_numpy()
+        return self.get(('macd', fast, slow, signal), compute)
+
+    def rolling_close(self, period: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Rolling mean and population std of close"""
+        def compute():
+            rolling = self.view.series('close').rolling(period, min_periods=period)
+            return rolling.mean().to_numpy(), rolling.std(ddof=0).to_numpy()
+        return self.get(('rolling_close', period), compute)
+
+    def bollinger(self, period: int, std_dev: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Bollinger high band, low band and middle band"""
+        def compute():
+            mavg, mstd = self.rolling_close(period)
+            return mavg + std_dev * mstd, mavg - std_dev * mstd, mavg
+        return self.get(('bollinger', period, std_dev), compute)
+
+    def tail_mean(self, column: str, period: int) -> np.ndarray:
+        """Mean of the last `period` values at each bar, same as view.last(column, period).mean()"""
+        def compute():
+            values = self.view.column(column)
+            result = np.empty(len(values))
+            # Bars before the first full window average everything seen so far
+            for i in range(min(period - 1, len(values))):
+                result[i] = values[:i + 1].mean()
+            if len(values) >= period:
+                result[period - 1:] = sliding_window_view(values, period).mean(axis=1)
+            return result
+        return self.get(('tail_mean', column, period), compute)
@@ -2,10 +2,11 @@
 MACD Confirmation Strategy
 Detects MACD line and Signal line crossovers
 """
-import pandas as pd
 from typing import Optional
 from ta.trend import MACD
-from .base_strategy import BaseStrategy, Signal
+from .base_strategy import BaseStrategy, Signal, SeriesSignals
+from .ohlcv_view import OHLCVView
+from .indicator_cache import IndicatorCache
 import config
 
 class MACDStrategy(BaseStrategy):
@@ -16,31 +17,28 @@ class MACDStrategy(BaseStrategy):
         super().__init__(params)
         self.name = "MACDStrategy"
     
-    def analyze(self, df: pd.DataFrame, symbol: str, timeframe: str) -> Optional[Signal]:
+    def analyze_view(self, view: OHLCVView, symbol: str, timeframe: str) -> Optional[Signal]:
         """Analyze for MACD crossover"""
-        if len(df) < self.params['slow_period'] + 10:
+        if len(view) < self.params['slow_period'] + 10:
             return None
         
         # Calculate MACD
         macd_ind = MACD(
-            close=df['close'],
+            close=view.series('close'),
             window_fast=self.params['fast_period'],
             window_slow=self.params['slow_period'],
             window_sign=self.params['signal_period']
         )
         
-        df_copy = df.copy()
-        df_copy['macd'] = macd_ind.macd()
-        df_copy['signal'] = macd_ind.macd_signal()
-        df_copy['diff'] = macd_ind.macd_diff()
+        macd = macd_ind.macd().to_numpy()
+        macd_signal = macd_ind.macd_signal().to_numpy()
         
-        current = df_copy.iloc[-1]
-        previous = df_copy.iloc[-2]
+        current_close = view.at('close')
         
         # Bullish Crossover (MACD crosses above Signal)
-        if previous['macd'] <= previous['signal'] and current['macd'] > current['signal']:
+        if macd[-2] <= macd_signal[-2] and macd[-1] > macd_signal[-1]:
             target, stop_loss = self.calculate_target_stop(
-                current['close'],
+                current_close,
                 'BUY',
                 stop_percent=config.DEFAULT_STOP_LOSS_PERCENT
             )
@@ -50,17 +48,17 @@ class MACDStrategy(BaseStrategy):
                 timeframe=timeframe,
                 strategy=self.name,
                 direction='BUY',
-                price=float(current['close']),
+                price=float(current_close),
                 target=float(target),
                 stop_loss=float(stop_loss),
                 confidence=0.80,
-                reason=f"Bullish MACD Cross (MACD: {current['macd']:.4f})"
+                reason=f"Bullish MACD Cross (MACD: {macd[-1]:.4f})"
             )
             
         # Bearish Crossover (MACD crosses below Signal)
-        if previous['macd'] >= previous['signal'] and current['macd'] < current['signal']:
+        if macd[-2] >= macd_signal[-2] and macd[-1] < macd_signal[-1]:
             target, stop_loss = self.calculate_target_stop(
-                current['close'],
+                current_close,
                 'SELL',
                 stop_percent=config.DEFAULT_STOP_LOSS_PERCENT
             )
@@ -70,11 +68,36 @@ class MACDStrategy(BaseStrategy):
                 timeframe=timeframe,
                 strategy=self.name,
                 direction='SELL',
-                price=float(current['close']),
+                price=float(current_close),
                 target=float(target),
                 stop_loss=float(stop_loss),
                 confidence=0.80,
-                reason=f"Bearish MACD Cross (MACD: {current['macd']:.4f})"
+                reason=f"Bearish MACD Cross (MACD: {macd[-1]:.4f})"
             )
             
         return None
+    
+    def analyze_series(self, view: OHLCVView, params: dict = None, cache: IndicatorCache = None) -> SeriesSignals:
+        """Vectorized MACD crossover detection over every bar"""
+        params = self.with_params(params).params
+        cache = cache or IndicatorCache(view)
+        result = SeriesSignals.empty(len(view), self.name)
+        
+        macd, macd_signal = cache.macd(params['fast_period'], params['slow_period'], params['signal_period'])
+        prev_macd, prev_signal = self._previous(macd), self._previous(macd_signal)
+        valid = self._min_length_mask(len(view), params['slow_period'] + 10)
+        
+        buy = valid & (prev_macd <= prev_signal) & (macd > macd_signal)
+        sell = valid & (prev_macd >= prev_signal) & (macd < macd_signal) & ~buy
+        
+        self._fill_series(
+            result, buy, 'BUY', view.close, 0.80,
+            lambda i: f"Bullish MACD Cross (MACD: {macd[i]:.4f})",
+            config.DEFAULT_STOP_LOSS_PERCENT
+        )
+        self._fill_series(
+            result, sell, 'SELL', view.close, 0.80,
+            lambda i: f"Bearish MACD Cross (MACD: {macd[i]:.4f})",
+            config.DEFAULT_STOP_LOSS_PERCENT
+        )
+        return result
@@ -0,0 +1,107 @@
+"""
+Read-only OHLCV view
+Zero-copy NumPy access to candle data for strategies
+"""
+from typing import Optional
+import numpy as np
+import pandas as pd
+
+OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+def _readonly(values) -> np.ndarray:
+    """Return a non-writeable float64 array sharing memory with values"""
+    arr = np.asarray(values, dtype=np.float64)
+    if arr.flags.writeable:
+        arr = arr.view()
+        arr.flags.writeable = False
+    return arr
+
+
+class OHLCVView:
+    """
+    Lightweight read-only view over OHLCV columns
+
+    Columns are exposed as non-writeable NumPy arrays that share memory with
+    the source, so building a view or slicing it never copies candle data.
+    """
+    __slots__ = ('open', 'high', 'low', 'close', 'volume', 'timestamps', '_frame')
+
+    def __init__(
+        self,
+        open: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        close: np.ndarray,
+        volume: np.ndarray,
+        timestamps: Optional[np.ndarray] = None,
+        frame: Optional[pd.DataFrame] = None
+    ):
+        self.open = _readonly(open)
+        self.high = _readonly(high)
+        self.low = _readonly(low)
+        self.close = _readonly(close)
+        self.volume = _readonly(volume)
+        self.timestamps = timestamps
+        self._frame = frame
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'OHLCVView':
+        """Build a view over an OHLCV DataFrame without copying its columns"""
+        timestamps = df.index.asi8 if isinstance(df.index, pd.DatetimeIndex) else None
+        return cls(
+            *(df[col].to_numpy(dtype=np.float64, copy=False) for col in OHLCV_COLUMNS),
+            timestamps=timestamps,
+            frame=df
+        )
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    def column(self, name: str) -> np.ndarray:
+        """Get a column array by name (open, high, low, close, volume)"""
+        if name not in OHLCV_COLUMNS:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def at(self, name: str, index: int = -1) -> np.float64:
+        """Get a single value, e.g. at('close', -2) for the previous close"""
+        return self.column(name)[index]
+
+    def last(self, name: str, n: int) -> np.ndarray:
+        """Get the last n values of a column as a read-only slice"""
+        return self.column(name)[-n:]
+
+    def series(self, name: str) -> pd.Series:
+        """Wrap a column as a pandas Series (for indicator libraries)"""
+        if self._frame is not None:
+            return self._frame[name]
+        return pd.Series(self.column(name), copy=False)
+
+    def slice(self, start: Optional[int] = None, stop: Optional[int] = None) -> 'OHLCVView':
+        """Get a view over bars [start:stop] sharing memory with this view"""
+        window = slice(start, stop)
+        return OHLCVView(
+            self.open[window],
+            self.high[window],
+            self.low[window],
+            self.close[window],
+            self.volume[window],
+            timestamps=self.timestamps[window] if self.timestamps is not None else None,
+            frame=self._frame.iloc[window] if self._frame is not None else None
+        )
+
+    def tail(self, n: int) -> 'OHLCVView':
+        """Get a view over the last n bars"""
+        return self.slice(max(len(self) - n, 0), None)
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        """DataFrame form of the view (compatibility path, may allocate)"""
+        if self._frame is None:
+            index = pd.to_datetime(self.timestamps) if self.timestamps is not None else None
+            self._frame = pd.DataFrame(
+                {col: getattr(self, col) for col in OHLCV_COLUMNS},
+                index=index
+            )
+        return self._frame
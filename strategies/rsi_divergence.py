@@ -2,11 +2,13 @@
 RSI Divergence Strategy
 Detects regular and hidden divergences
 """
-import pandas as pd
 import numpy as np
-from typing import Optional
+from typing import Optional, Tuple
+from numpy.lib.stride_tricks import sliding_window_view
 from ta.momentum import RSIIndicator
-from .base_strategy import BaseStrategy, Signal
+from .base_strategy import BaseStrategy, Signal, SeriesSignals
+from .ohlcv_view import OHLCVView
+from .indicator_cache import IndicatorCache
 import config
 
 
@@ -17,30 +19,28 @@ class RSIDivergenceStrategy(BaseStrategy):
         params = config.STRATEGY_PARAMS['rsi_divergence']
         super().__init__(params)
     
-    def analyze(self, df: pd.DataFrame, symbol: str, timeframe: str) -> Optional[Signal]:
+    def analyze_view(self, view: OHLCVView, symbol: str, timeframe: str) -> Optional[Signal]:
         """Analyze for RSI divergence"""
-        if len(df) < self.params['divergence_lookback'] + self.params['rsi_period']:
+        if len(view) < self.params['divergence_lookback'] + self.params['rsi_period']:
             return None
         
         # Calculate RSI
-        rsi = RSIIndicator(close=df['close'], window=self.params['rsi_period'])
-        df_copy = df.copy()
-        df_copy['rsi'] = rsi.rsi()
+        rsi = RSIIndicator(close=view.series('close'), window=self.params['rsi_period']).rsi().to_numpy()
         
         # Get recent window
         lookback = self.params['divergence_lookback']
-        recent = df_copy.tail(lookback)
+        recent_rsi = rsi[-lookback:]
         
         # Find price swings
-        price_lows = self._find_swing_lows(recent['low'].values)
-        price_highs = self._find_swing_highs(recent['high'].values)
+        price_lows = self._find_swing_lows(view.last('low', lookback))
+        price_highs = self._find_swing_highs(view.last('high', lookback))
         
         # Find RSI swings
-        rsi_lows = self._find_swing_lows(recent['rsi'].values)
-        rsi_highs = self._find_swing_highs(recent['rsi'].values)
+        rsi_lows = self._find_swing_lows(recent_rsi)
+        rsi_highs = self._find_swing_highs(recent_rsi)
         
-        current_rsi = df_copy['rsi'].iloc[-1]
-        current_price = df_copy['close'].iloc[-1]
+        current_rsi = rsi[-1]
+        current_price = view.at('close')
         
         # Bullish Regular Divergence (price lower low, RSI higher low)
         if len(price_lows) >= 2 and len(rsi_lows) >= 2:
@@ -113,3 +113,92 @@ class RSIDivergenceStrategy(BaseStrategy):
             if data[i] == max(data[i-window:i+window+1]):
                 swings.append(data[i])
         return swings
+    
+    def analyze_series(self, view: OHLCVView, params: dict = None, cache: IndicatorCache = None) -> SeriesSignals:
+        """Vectorized RSI divergence detection over every bar"""
+        params = self.with_params(params).params
+        cache = cache or IndicatorCache(view)
+        result = SeriesSignals.empty(len(view), self.name)
+        
+        lookback = params['divergence_lookback']
+        rsi = cache.rsi(params['rsi_period'])
+        valid = self._min_length_mask(len(view), lookback + params['rsi_period'])
+        
+        low_1, low_2, has_lows = self._last_two_swings(view.low, lookback, np.minimum)
+        rsi_low_1, rsi_low_2, has_rsi_lows = self._last_two_swings(rsi, lookback, np.minimum)
+        high_1, high_2, has_highs = self._last_two_swings(view.high, lookback, np.maximum)
+        rsi_high_1, rsi_high_2, has_rsi_highs = self._last_two_swings(rsi, lookback, np.maximum)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            low_move = np.abs((low_1 - low_2) / low_2)
+            high_move = np.abs((high_1 - high_2) / high_2)
+        
+        # Bullish Regular Divergence (price lower low, RSI higher low)
+        buy = (
+            valid & has_lows & has_rsi_lows
+            & (low_1 < low_2) & (rsi_low_1 > rsi_low_2)
+            & (rsi < params['rsi_oversold'])
+            & (low_move >= params['min_price_swing'])
+        )
+        # Bearish Regular Divergence (price higher high, RSI lower high)
+        sell = (
+            valid & has_highs & has_rsi_highs
+            & (high_1 > high_2) & (rsi_high_1 < rsi_high_2)
+            & (rsi > params['rsi_overbought'])
+            & (high_move >= params['min_price_swing'])
+            & ~buy
+        )
+        
+        self._fill_series(
+            result, buy, 'BUY', view.close, 0.80,
+            lambda i: f"Bullish RSI Divergence (RSI: {rsi[i]:.1f})",
+            config.DEFAULT_STOP_LOSS_PERCENT
+        )
+        self._fill_series(
+            result, sell, 'SELL', view.close, 0.80,
+            lambda i: f"Bearish RSI Divergence (RSI: {rsi[i]:.1f})",
+            config.DEFAULT_STOP_LOSS_PERCENT
+        )
+        return result
+    
+    def _last_two_swings(
+        self,
+        data: np.ndarray,
+        lookback: int,
+        extreme: np.ufunc,
+        window: int = 3
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Last two swing values inside the trailing lookback window of every bar
+        
+        A swing at bar k only depends on bars k - window .. k + window, so swing
+        flags are computed once and each bar picks the two latest swings that
+        fit inside its own window (same points as _find_swing_lows/highs).
+        
+        Returns:
+            (last_swing, previous_swing, has_two_swings)
+        """
+        n = len(data)
+        last = np.full(n, np.nan)
+        previous = np.full(n, np.nan)
+        if n < 2 * window + 1:
+            return last, previous, np.zeros(n, dtype=bool)
+        
+        is_swing = np.zeros(n, dtype=bool)
+        centered = extreme.reduce(sliding_window_view(data, 2 * window + 1), axis=1)
+        is_swing[window:n - window] = data[window:n - window] == centered
+        
+        # Latest swing index at or before each bar (-1 if none)
+        latest = np.maximum.accumulate(np.where(is_swing, np.arange(n), -1))
+        
+        bars = np.arange(n)
+        first_allowed = bars - lookback + 1 + window
+        last_allowed = bars - window
+        
+        k1 = np.where(last_allowed >= 0, latest[np.clip(last_allowed, 0, None)], -1)
+        k2 = np.where(k1 >= 1, latest[np.clip(k1 - 1, 0, None)], -1)
+        has_two = (k1 >= first_allowed) & (k2 >= first_allowed) & (k2 >= 0)
+        
+        last[has_two] = data[k1[has_two]]
+        previous[has_two] = data[k2[has_two]]
+        return last, previous, has_two
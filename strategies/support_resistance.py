@@ -2,10 +2,11 @@
 Support/Resistance Breakout Strategy
 Detects key levels and breakouts with volume confirmation
 """
-import pandas as pd
 import numpy as np
 from typing import Optional, List
-from .base_strategy import BaseStrategy, Signal
+from .base_strategy import BaseStrategy, Signal, SeriesSignals
+from .ohlcv_view import OHLCVView
+from .indicator_cache import IndicatorCache
 import config
 
 
@@ -16,36 +17,34 @@ class SupportResistanceStrategy(BaseStrategy):
         params = config.STRATEGY_PARAMS['support_resistance']
         super().__init__(params)
     
-    def analyze(self, df: pd.DataFrame, symbol: str, timeframe: str) -> Optional[Signal]:
+    def analyze_view(self, view: OHLCVView, symbol: str, timeframe: str) -> Optional[Signal]:
         """Analyze for support/resistance breakout"""
-        if len(df) < self.params['swing_lookback'] + 10:
+        if len(view) < self.params['swing_lookback'] + 10:
             return None
         
         # Find support and resistance levels
         lookback = self.params['swing_lookback']
-        recent = df.tail(lookback)
         
-        resistance_levels = self._find_resistance_levels(recent)
-        support_levels = self._find_support_levels(recent)
+        resistance_levels = self._find_resistance_levels(view.last('high', lookback))
+        support_levels = self._find_support_levels(view.last('low', lookback))
         
         if not resistance_levels and not support_levels:
             return None
         
         # Get current candle
-        current = df.iloc[-1]
-        previous = df.iloc[-2]
-        current_price = current['close']
+        current_price = view.at('close')
+        previous_close = view.at('close', -2)
         
         # Calculate volume confirmation
-        avg_volume = df['volume'].tail(20).mean()
-        volume_ratio = current['volume'] / avg_volume
+        avg_volume = view.last('volume', 20).mean()
+        volume_ratio = view.at('volume') / avg_volume
         
         # Check resistance breakout (bullish)
         for resistance in resistance_levels:
             proximity = abs(current_price - resistance) / resistance
             
-            if (previous['close'] < resistance and 
-                current['close'] > resistance and
+            if (previous_close < resistance and 
+                current_price > resistance and
                 proximity <= self.params['proximity_threshold'] and
                 volume_ratio >= self.params['breakout_volume_multiplier']):
                 
@@ -71,8 +70,8 @@ class SupportResistanceStrategy(BaseStrategy):
         for support in support_levels:
             proximity = abs(current_price - support) / support
             
-            if (previous['close'] > support and 
-                current['close'] < support and
+            if (previous_close > support and 
+                current_price < support and
                 proximity <= self.params['proximity_threshold'] and
                 volume_ratio >= self.params['breakout_volume_multiplier']):
                 
@@ -96,9 +95,31 @@ class SupportResistanceStrategy(BaseStrategy):
         
         return None
     
-    def _find_resistance_levels(self, df: pd.DataFrame) -> List[float]:
+    def analyze_series(self, view: OHLCVView, params: dict = None, cache: IndicatorCache = None) -> SeriesSignals:
+        """
+        Support/resistance breakout detection over every bar
+        
+        The volume and direction gates are evaluated for all bars at once; level
+        detection only runs on the bars that pass them.
+        """
+        params = self.with_params(params).params
+        cache = cache or IndicatorCache(view)
+        
+        close = view.close
+        prev_close = self._previous(close)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            volume_ratio = view.volume / cache.tail_mean('volume', 20)
+        
+        # A breakout needs the volume surge and a close that crossed a level
+        candidates = (
+            self._min_length_mask(len(view), params['swing_lookback'] + 10)
+            & (volume_ratio >= params['breakout_volume_multiplier'])
+            & (close != prev_close)
+        )
+        return self._evaluate_bars(view, np.flatnonzero(candidates), params)
+    
+    def _find_resistance_levels(self, highs: np.ndarray) -> List[float]:
         """Find resistance levels from swing highs"""
-        highs = df['high'].values
         levels = []
         
         # Find swing highs
@@ -112,15 +133,14 @@ class SupportResistanceStrategy(BaseStrategy):
         # Filter by minimum touches
         validated_levels = []
         for level in levels:
-            touches = self._count_touches(df, level, is_resistance=True)
+            touches = self._count_touches(highs, level)
             if touches >= self.params['min_touches']:
                 validated_levels.append(level)
         
         return validated_levels
     
-    def _find_support_levels(self, df: pd.DataFrame) -> List[float]:
+    def _find_support_levels(self, lows: np.ndarray) -> List[float]:
         """Find support levels from swing lows"""
-        lows = df['low'].values
         levels = []
         
         # Find swing lows
@@ -134,7 +154,7 @@ class SupportResistanceStrategy(BaseStrategy):
         # Filter by minimum touches
         validated_levels = []
         for level in levels:
-            touches = self._count_touches(df, level, is_resistance=False)
+            touches = self._count_touches(lows, level)
             if touches >= self.params['min_touches']:
                 validated_levels.append(level)
         
@@ -159,17 +179,7 @@ class SupportResistanceStrategy(BaseStrategy):
         clustered.append(np.mean(current_cluster))
         return clustered
     
-    def _count_touches(self, df: pd.DataFrame, level: float, is_resistance: bool) -> int:
+    def _count_touches(self, prices: np.ndarray, level: float) -> int:
         """Count how many times price touched a level"""
         threshold = self.params['proximity_threshold']
-        touches = 0
-        
-        for _, row in df.iterrows():
-            if is_resistance:
-                if abs(row['high'] - level) / level <= threshold:
-                    touches += 1
-            else:
-                if abs(row['low'] - level) / level <= threshold:
-                    touches += 1
-        
-        return touches
+        return int(np.count_nonzero(np.abs(prices - level) / level <= threshold))
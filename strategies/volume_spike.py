@@ -2,9 +2,11 @@
 Volume Spike Strategy
 Detects unusual volume spikes with directional price action
 """
-import pandas as pd
+import numpy as np
 from typing import Optional
-from .base_strategy import BaseStrategy, Signal
+from .base_strategy import BaseStrategy, Signal, SeriesSignals
+from .ohlcv_view import OHLCVView
+from .indicator_cache import IndicatorCache
 import config
 
 
@@ -15,17 +17,20 @@ class VolumeSpikeStrategy(BaseStrategy):
         params = config.STRATEGY_PARAMS['volume_spike']
         super().__init__(params)
     
-    def analyze(self, df: pd.DataFrame, symbol: str, timeframe: str) -> Optional[Signal]:
+    def analyze_view(self, view: OHLCVView, symbol: str, timeframe: str) -> Optional[Signal]:
         """Analyze for volume spikes"""
-        if len(df) < self.params['volume_period'] + 2:
+        if len(view) < self.params['volume_period'] + 2:
             return None
         
         # Calculate average volume
-        avg_volume = df['volume'].tail(self.params['volume_period']).mean()
+        avg_volume = view.last('volume', self.params['volume_period']).mean()
         
         # Current candle
-        current = df.iloc[-1]
-        current_volume = current['volume']
+        current_open = view.at('open')
+        current_high = view.at('high')
+        current_low = view.at('low')
+        current_close = view.at('close')
+        current_volume = view.at('volume')
         
         # Check for volume spike
         volume_ratio = current_volume / avg_volume
@@ -33,8 +38,8 @@ class VolumeSpikeStrategy(BaseStrategy):
             return None
         
         # Calculate candle body
-        candle_body = abs(current['close'] - current['open'])
-        candle_range = current['high'] - current['low']
+        candle_body = abs(current_close - current_open)
+        candle_range = current_high - current_low
         
         if candle_range == 0:
             return None
@@ -47,14 +52,14 @@ class VolumeSpikeStrategy(BaseStrategy):
             return None
         
         # Calculate price change percentage
-        price_change = (current['close'] - current['open']) / current['open']
+        price_change = (current_close - current_open) / current_open
         
         # Bullish volume spike (strong upward candle)
-        if (current['close'] > current['open'] and 
+        if (current_close > current_open and 
             abs(price_change) >= min_body_percent):
             
             target, stop_loss = self.calculate_target_stop(
-                current['close'],
+                current_close,
                 'BUY',
                 stop_percent=config.DEFAULT_STOP_LOSS_PERCENT
             )
@@ -64,7 +69,7 @@ class VolumeSpikeStrategy(BaseStrategy):
                 timeframe=timeframe,
                 strategy=self.name,
                 direction='BUY',
-                price=float(current['close']),
+                price=float(current_close),
                 target=float(target),
                 stop_loss=float(stop_loss),
                 confidence=0.70,
@@ -72,11 +77,11 @@ class VolumeSpikeStrategy(BaseStrategy):
             )
         
         # Bearish volume spike (strong downward candle)
-        if (current['close'] < current['open'] and 
+        if (current_close < current_open and 
             abs(price_change) >= min_body_percent):
             
             target, stop_loss = self.calculate_target_stop(
-                current['close'],
+                current_close,
                 'SELL',
                 stop_percent=config.DEFAULT_STOP_LOSS_PERCENT
             )
@@ -86,7 +91,7 @@ class VolumeSpikeStrategy(BaseStrategy):
                 timeframe=timeframe,
                 strategy=self.name,
                 direction='SELL',
-                price=float(current['close']),
+                price=float(current_close),
                 target=float(target),
                 stop_loss=float(stop_loss),
                 confidence=0.70,
@@ -94,3 +99,41 @@ class VolumeSpikeStrategy(BaseStrategy):
             )
         
         return None
+    
+    def analyze_series(self, view: OHLCVView, params: dict = None, cache: IndicatorCache = None) -> SeriesSignals:
+        """Vectorized volume spike detection over every bar"""
+        params = self.with_params(params).params
+        cache = cache or IndicatorCache(view)
+        result = SeriesSignals.empty(len(view), self.name)
+        
+        open_, high, low, close = view.open, view.high, view.low, view.close
+        avg_volume = cache.tail_mean('volume', params['volume_period'])
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            volume_ratio = view.volume / avg_volume
+            candle_range = high - low
+            body_ratio = np.abs(close - open_) / candle_range
+            price_change = (close - open_) / open_
+        
+        # Same rejections as analyze_view, written so NaN behaves identically
+        candidate = (
+            self._min_length_mask(len(view), params['volume_period'] + 2)
+            & ~(volume_ratio < params['spike_multiplier'])
+            & (candle_range != 0)
+            & ~(body_ratio < 0.3)
+            & (np.abs(price_change) >= params['min_candle_body'])
+        )
+        buy = candidate & (close > open_)
+        sell = candidate & (close < open_) & ~buy
+        
+        self._fill_series(
+            result, buy, 'BUY', close, 0.70,
+            lambda i: f"Bullish Volume Spike ({volume_ratio[i]:.1f}x avg, +{price_change[i]*100:.1f}%)",
+            config.DEFAULT_STOP_LOSS_PERCENT
+        )
+        self._fill_series(
+            result, sell, 'SELL', close, 0.70,
+            lambda i: f"Bearish Volume Spike ({volume_ratio[i]:.1f}x avg, {price_change[i]*100:.1f}%)",
+            config.DEFAULT_STOP_LOSS_PERCENT
+        )
+        return result
@@ -0,0 +1,14 @@
+"""
+Strategy Details - Parsing of the "Name (timeframe)" entries of confluent signals
+
+Kept free of heavy imports so the storage layer and the backtest can share it.
+"""
+import re
+from typing import List
+
+_TIMEFRAME_SUFFIX = re.compile(r" \([^)]*\)$")
+
+
+def strategy_names(details: List[str]) -> List[str]:
+    """Strategy names of a confluent signal, without timeframe suffixes, each once"""
+    return list(dict.fromkeys(_TIMEFRAME_SUFFIX.sub('', detail) for detail in details))
@@ -0,0 +1,158 @@
+"""
+Parameter Sweep Engine
+Evaluates grids of STRATEGY_PARAMS over historical data, computing each
+distinct indicator once and reusing it for every threshold combination
+"""
+import itertools
+from typing import Dict, List, Tuple
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from strategies.base_strategy import BaseStrategy, SeriesSignals
+from strategies.ohlcv_view import OHLCVView
+from strategies.indicator_cache import IndicatorCache
+from strategies.channel_breakout import ChannelBreakoutStrategy
+from strategies.rsi_divergence import RSIDivergenceStrategy
+from strategies.volume_spike import VolumeSpikeStrategy
+from strategies.ema_cross import EMACrossStrategy
+from strategies.support_resistance import SupportResistanceStrategy
+from strategies.macd_conf import MACDStrategy
+from strategies.bollinger_bands import BollingerBandsStrategy
+from trade_resolver import horizon_bars
+import config
+
+# config.STRATEGY_PARAMS key -> strategy class
+STRATEGY_CLASSES = {
+    "channel_breakout": ChannelBreakoutStrategy,
+    "rsi_divergence": RSIDivergenceStrategy,
+    "volume_spike": VolumeSpikeStrategy,
+    "ema_cross": EMACrossStrategy,
+    "support_resistance": SupportResistanceStrategy,
+    "macd": MACDStrategy,
+    "bollinger_bands": BollingerBandsStrategy,
+}
+
+
+def expand_grid(grid: Dict[str, list]) -> List[dict]:
+    """Expand {param: [values]} into a list of parameter dicts"""
+    names = sorted(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+def trade_returns(series: SeriesSignals, view: OHLCVView, horizon: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Entry bars and direction-adjusted % returns of a series' signals
+
+    Each signal is held for `horizon` bars; signals without enough bars
+    left are dropped.
+    """
+    indices = series.triggered
+    indices = indices[indices + horizon < len(view)]
+    entry = series.price[indices]
+    exit_price = view.close[indices + horizon]
+    return indices, series.direction[indices] * (exit_price - entry) / entry * 100
+
+
+class ParameterSweep:
+    """Sweep strategy parameter grids with shared indicator computation"""
+
+    def __init__(self, grid: Dict[str, Dict[str, list]] = None):
+        self.grid = grid or config.SWEEP_GRID
+        unknown = set(self.grid) - set(STRATEGY_CLASSES)
+        if unknown:
+            raise ValueError(f"Unknown strategies in sweep grid: {sorted(unknown)}")
+
+        self.strategies: Dict[str, BaseStrategy] = {key: STRATEGY_CLASSES[key]() for key in self.grid}
+        self.combinations = {key: expand_grid(params) for key, params in self.grid.items()}
+
+        total = sum(len(combos) for combos in self.combinations.values())
+        logger.info(f"Parameter sweep: {total} configurations across {len(self.grid)} strategies")
+
+    def run(
+        self,
+        history: Dict[str, Dict[str, pd.DataFrame]],
+        min_trades: int = None
+    ) -> pd.DataFrame:
+        """
+        Evaluate every configuration on every series
+
+        Args:
+            history: {symbol: {timeframe: DataFrame}}
+            min_trades: Drop configurations with fewer trades from the table
+
+        Returns:
+            Ranked table, best total PnL first
+        """
+        min_trades = config.SWEEP_MIN_TRADES if min_trades is None else min_trades
+        totals: Dict[Tuple[str, tuple], np.ndarray] = {}
+        hits = misses = 0
+
+        for symbol, timeframes in history.items():
+            for timeframe, df in timeframes.items():
+                if df is None or df.empty:
+                    continue
+
+                view = OHLCVView.from_frame(df)
+                cache = IndicatorCache(view)
+                horizon = horizon_bars(timeframe)
+
+                for key, combos in self.combinations.items():
+                    strategy = self.strategies[key]
+                    for params in combos:
+                        series = strategy.analyze_series(view, params=params, cache=cache)
+                        stats = self._score(series, view, horizon)
+                        config_key = (key, tuple(sorted(params.items())))
+                        totals[config_key] = totals.get(config_key, 0) + stats
+
+                hits += cache.hits
+                misses += cache.misses
+
+        logger.info(f"Sweep complete: {misses} indicator computations, {hits} reused from cache")
+        return self._rank(totals, min_trades)
+
+    def _score(self, series: SeriesSignals, view: OHLCVView, horizon: int) -> np.ndarray:
+        """Score signals by direction-adjusted return after the review horizon"""
+        _, pnl = trade_returns(series, view, horizon)
+        if len(pnl) == 0:
+            return np.zeros(3)
+        return np.array([len(pnl), np.count_nonzero(pnl > 0), pnl.sum()])
+
+    def _rank(self, totals: Dict[Tuple[str, tuple], np.ndarray], min_trades: int) -> pd.DataFrame:
+        """Build the ranked results table"""
+        rows = []
+        for (key, params), (trades, wins, pnl_sum) in totals.items():
+            if trades < max(min_trades, 1):
+                continue
+            rows.append({
+                'strategy': key,
+                'params': ', '.join(f"{name}={value}" for name, value in params),
+                'trades': int(trades),
+                'wins': int(wins),
+                'win_rate': round(wins / trades * 100, 2),
+                'avg_pnl': round(pnl_sum / trades, 3),
+                'total_pnl': round(pnl_sum, 2),
+            })
+
+        columns = ['strategy', 'params', 'trades', 'wins', 'win_rate', 'avg_pnl', 'total_pnl']
+        table = pd.DataFrame(rows, columns=columns)
+        table = table.sort_values(['total_pnl', 'win_rate'], ascending=False, kind='stable')
+        return table.reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    from data_fetcher import DataFetcher
+
+    fetcher = DataFetcher()
+    symbols = fetcher.get_usdt_pairs()[:config.SWEEP_SYMBOLS]
+
+    history = {}
+    for symbol in symbols:
+        history[symbol] = {}
+        for tf in config.TIMEFRAMES:
+            df = fetcher.fetch_ohlcv(symbol, tf, limit=config.SWEEP_HISTORY_LIMIT)
+            if df is not None:
+                history[symbol][tf] = df
+
+    table = ParameterSweep().run(history)
+    print(table.head(30).to_string())
@@ -0,0 +1,222 @@
+"""
+Trade Resolver - Vectorized target/stop first-touch resolution
+"""
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from strategies.ohlcv_view import OHLCVView
+import config
+
+# Outcome codes
+OUTCOME_STOP = -1
+OUTCOME_TIMEOUT = 0
+OUTCOME_TARGET = 1
+OUTCOME_OPEN = 2  # Not enough bars after entry to resolve
+
+OUTCOME_NAMES = {
+    OUTCOME_STOP: 'STOP',
+    OUTCOME_TIMEOUT: 'TIMEOUT',
+    OUTCOME_TARGET: 'TARGET',
+    OUTCOME_OPEN: 'OPEN',
+}
+
+# Trades resolved per chunk; bounds the (trades x horizon) window matrix
+CHUNK_SIZE = 4096
+
+NS_PER_MINUTE = 60 * 1_000_000_000
+
+
+def horizon_bars(timeframe: str, hours: float = None) -> int:
+    """Number of bars of a timeframe covering the given hours"""
+    hours = hours if hours is not None else config.PERFORMANCE_REVIEW_HOURS
+    return max(1, int(hours * 60 // config.TIMEFRAME_MINUTES[timeframe]))
+
+
+@dataclass(slots=True)
+class TradeOutcomes:
+    """Resolved trades, one row per entry"""
+    outcome: np.ndarray  # int8 OUTCOME_* code
+    exit_bar: np.ndarray  # Bar index of the exit (-1 while open)
+    exit_price: np.ndarray  # NaN while open
+    pnl_percent: np.ndarray  # Direction-adjusted, NaN while open
+
+    def __len__(self) -> int:
+        return len(self.outcome)
+
+    @property
+    def resolved(self) -> np.ndarray:
+        """Indices of trades that closed"""
+        return np.flatnonzero(self.outcome != OUTCOME_OPEN)
+
+
+def resolve_trades(
+    entry_bars: np.ndarray,
+    direction: np.ndarray,
+    entry_price: np.ndarray,
+    target: np.ndarray,
+    stop_loss: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    horizon: int
+) -> TradeOutcomes:
+    """
+    Find which level every trade touches first
+
+    Bars entry + 1 .. entry + horizon are checked for each trade. A bar that
+    touches both levels counts as a stop (worst case). Trades that touch
+    neither are closed at the close of the last bar; trades whose window runs
+    past the data stay open.
+
+    Args:
+        entry_bars: Bar index of each signal
+        direction: 1 for BUY, -1 for SELL
+        entry_price, target, stop_loss: Levels per trade
+        high, low, close: Price arrays of the series the bars index into
+        horizon: Bars to wait before timing out
+
+    Returns:
+        TradeOutcomes aligned with the inputs
+    """
+    entry_bars = np.asarray(entry_bars, dtype=np.int64)
+    direction = np.asarray(direction)
+    entry_price = np.asarray(entry_price, dtype=np.float64)
+    target = np.asarray(target, dtype=np.float64)
+    stop_loss = np.asarray(stop_loss, dtype=np.float64)
+    count = len(entry_bars)
+
+    outcome = np.full(count, OUTCOME_OPEN, dtype=np.int8)
+    exit_bar = np.full(count, -1, dtype=np.int64)
+    exit_price = np.full(count, np.nan)
+
+    # Window k of each view covers bars k .. k + horizon - 1
+    high_windows = sliding_window_view(high, horizon) if len(high) >= horizon else None
+    low_windows = sliding_window_view(low, horizon) if len(low) >= horizon else None
+
+    complete = np.flatnonzero(entry_bars + horizon < len(close))
+
+    for start in range(0, len(complete), CHUNK_SIZE):
+        rows = complete[start:start + CHUNK_SIZE]
+        first_bar = entry_bars[rows] + 1
+
+        # (trades x horizon) future highs and lows
+        highs = high_windows[first_bar]
+        lows = low_windows[first_bar]
+
+        is_buy = (direction[rows] > 0)[:, None]
+        hit_target = np.where(is_buy, highs >= target[rows, None], lows <= target[rows, None])
+        hit_stop = np.where(is_buy, lows <= stop_loss[rows, None], highs >= stop_loss[rows, None])
+
+        # First touching bar offset, horizon when never touched
+        target_at = np.where(hit_target.any(axis=1), hit_target.argmax(axis=1), horizon)
+        stop_at = np.where(hit_stop.any(axis=1), hit_stop.argmax(axis=1), horizon)
+
+        stopped = (stop_at < horizon) & (stop_at <= target_at)
+        reached = (target_at < horizon) & ~stopped
+
+        outcome[rows] = np.select([stopped, reached], [OUTCOME_STOP, OUTCOME_TARGET], OUTCOME_TIMEOUT)
+        offset = np.select([stopped, reached], [stop_at, target_at], horizon - 1)
+        exit_bar[rows] = first_bar + offset
+        exit_price[rows] = np.select(
+            [stopped, reached],
+            [stop_loss[rows], target[rows]],
+            close[first_bar + horizon - 1]
+        )
+
+    sign = np.where(direction > 0, 1.0, -1.0)
+    pnl_percent = sign * (exit_price - entry_price) / entry_price * 100
+
+    return TradeOutcomes(
+        outcome=outcome,
+        exit_bar=exit_bar,
+        exit_price=exit_price,
+        pnl_percent=pnl_percent,
+    )
+
+
+def first_touch(
+    is_buy: bool,
+    target: float,
+    stop_loss: float,
+    high: np.ndarray,
+    low: np.ndarray
+) -> Tuple[int, int, bool]:
+    """
+    First bar of one trade touching target or stop
+
+    Returns:
+        (OUTCOME_* code, bar index, whether that bar touched both levels);
+        (OUTCOME_OPEN, -1, False) if neither level was touched
+    """
+    hit_target = high >= target if is_buy else low <= target
+    hit_stop = low <= stop_loss if is_buy else high >= stop_loss
+
+    touched = np.flatnonzero(hit_target | hit_stop)
+    if len(touched) == 0:
+        return OUTCOME_OPEN, -1, False
+
+    bar = int(touched[0])
+    both = bool(hit_target[bar] and hit_stop[bar])
+    return (OUTCOME_STOP if hit_stop[bar] else OUTCOME_TARGET), bar, both
+
+
+def resolve_intrabar(
+    is_buy: bool,
+    target: float,
+    stop_loss: float,
+    coarse: OHLCVView,
+    coarse_minutes: int,
+    load_fine: Callable[[int, int], Optional[OHLCVView]],
+    since: int = None
+) -> Tuple[int, Optional[int]]:
+    """
+    Resolve one trade on coarse candles, drilling into finer ones only where needed
+
+    A coarse bar touching both levels, or the bar the trade opened in (which
+    also holds prices from before the entry), is re-checked on the fine
+    candles overlapping it. A fine bar touching both levels still counts as a
+    stop. Without fine data an ambiguous bar counts as a stop.
+
+    Args:
+        is_buy: Trade direction
+        target, stop_loss: Levels
+        coarse: Candles from the one containing `since` onwards
+        coarse_minutes: Coarse timeframe length
+        load_fine: Callback (start_ns, end_ns) -> fine candles overlapping that span
+        since: Entry time in ns (None = the trade covers every coarse bar)
+
+    Returns:
+        (OUTCOME_* code, open time in ns of the exit candle, None while open)
+    """
+    bar_ns = coarse_minutes * NS_PER_MINUTE
+    start = 0
+
+    while start < len(coarse):
+        outcome, offset, both = first_touch(
+            is_buy, target, stop_loss, coarse.high[start:], coarse.low[start:]
+        )
+        if outcome == OUTCOME_OPEN:
+            return OUTCOME_OPEN, None
+
+        bar = start + offset
+        bar_open = int(coarse.timestamps[bar])
+        partial = since is not None and bar_open < since
+        if not (both or partial):
+            return outcome, bar_open
+
+        fine = load_fine(max(bar_open, since or bar_open), bar_open + bar_ns)
+        if fine is None:
+            return (OUTCOME_STOP if both else outcome), bar_open
+
+        fine_outcome, fine_bar, _ = first_touch(is_buy, target, stop_loss, fine.high, fine.low)
+        if fine_outcome != OUTCOME_OPEN:
+            return fine_outcome, int(fine.timestamps[fine_bar])
+
+        if not partial:
+            return OUTCOME_STOP, bar_open
+
+        # Only prices before the entry touched a level; keep scanning
+        start = bar + 1
+
+    return OUTCOME_OPEN, None
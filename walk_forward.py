@@ -0,0 +1,212 @@
+"""
+Walk-Forward Optimization
+Picks strategy parameters on rolling train windows and checks them on the
+following test window
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+import numpy as np
+import pandas as pd
+from loguru import logger
+
+from strategies.ohlcv_view import OHLCVView
+from strategies.indicator_cache import IndicatorCache
+from sweep import ParameterSweep, trade_returns
+from trade_resolver import horizon_bars, NS_PER_MINUTE
+import config
+
+NS_PER_DAY = 1440 * NS_PER_MINUTE
+
+# Params key of the configured STRATEGY_PARAMS baseline
+CONFIGURED = None
+
+
+@dataclass(slots=True)
+class Fold:
+    """One train/test split, as [start, end) times in ns"""
+    train_start: int
+    train_end: int
+    test_end: int
+
+
+def make_folds(end: int, folds: int, train_days: float, test_days: float) -> List[Fold]:
+    """
+    Rolling folds ending at `end`
+
+    Test windows are consecutive and each train window covers the
+    `train_days` right before its test window.
+    """
+    test_ns = int(test_days * NS_PER_DAY)
+    train_ns = int(train_days * NS_PER_DAY)
+    first_test = end - folds * test_ns
+    return [
+        Fold(
+            train_start=first_test + k * test_ns - train_ns,
+            train_end=first_test + k * test_ns,
+            test_end=first_test + (k + 1) * test_ns,
+        )
+        for k in range(folds)
+    ]
+
+
+class WalkForward(ParameterSweep):
+    """
+    Walk-forward evaluation of the sweep grid
+
+    Strategy output is causal, so every (series, parameter set) is evaluated
+    once over the whole history with one shared indicator cache; folds only
+    select which trades fall inside their windows. Overlapping train windows
+    therefore never recompute indicators.
+    """
+
+    def run(
+        self,
+        history: Dict[str, Dict[str, OHLCVView]],
+        folds: int = None,
+        train_days: float = None,
+        test_days: float = None,
+        min_trades: int = None
+    ) -> pd.DataFrame:
+        """
+        Run the walk-forward
+
+        Args:
+            history: {symbol: {timeframe: OHLCVView}} with timestamps
+            folds: Number of train/test splits
+            train_days: Length of each train window
+            test_days: Length of each test window (folds step by this much)
+            min_trades: Train trades a configuration needs to be selectable
+
+        Returns:
+            One row per (fold, strategy): selected params with their train and
+            test results, next to the configured STRATEGY_PARAMS on the same test window
+        """
+        folds = folds or config.WALK_FORWARD_FOLDS
+        train_days = train_days or config.WALK_FORWARD_TRAIN_DAYS
+        test_days = test_days or config.WALK_FORWARD_TEST_DAYS
+        min_trades = config.SWEEP_MIN_TRADES if min_trades is None else min_trades
+
+        series_list = [
+            (timeframe, view)
+            for timeframes in history.values()
+            for timeframe, view in timeframes.items()
+            if view is not None and len(view)
+        ]
+        if not series_list:
+            return pd.DataFrame()
+
+        end = max(
+            int(view.timestamps[-1]) + config.TIMEFRAME_MINUTES[tf] * NS_PER_MINUTE for tf, view in series_list
+        )
+        fold_list = make_folds(end, folds, train_days, test_days)
+
+        # config key -> [fold, train/test, (trades, wins, pnl sum)]
+        totals: Dict[Tuple[str, tuple], np.ndarray] = {}
+        hits = misses = 0
+
+        for timeframe, view in series_list:
+            cache = IndicatorCache(view)
+            horizon = horizon_bars(timeframe)
+            bar_ns = config.TIMEFRAME_MINUTES[timeframe] * NS_PER_MINUTE
+
+            for key, combos in self.combinations.items():
+                strategy = self.strategies[key]
+                for params in [CONFIGURED] + combos:
+                    series = strategy.analyze_series(view, params=params, cache=cache)
+                    indices, pnl = trade_returns(series, view, horizon)
+
+                    # A trade opens at its signal bar's close and ends at the exit bar's close
+                    opened = view.timestamps[indices] + bar_ns
+                    closed = view.timestamps[indices + horizon] + bar_ns
+
+                    config_key = (key, CONFIGURED if params is None else tuple(sorted(params.items())))
+                    totals[config_key] = totals.get(config_key, 0) + self._fold_stats(
+                        fold_list, opened, closed, pnl
+                    )
+
+            hits += cache.hits
+            misses += cache.misses
+
+        logger.info(f"Walk-forward: {misses} indicator computations, {hits} reused from cache")
+        return self._select(fold_list, totals, min_trades)
+
+    def _fold_stats(
+        self,
+        fold_list: List[Fold],
+        opened: np.ndarray,
+        closed: np.ndarray,
+        pnl: np.ndarray
+    ) -> np.ndarray:
+        """Trades, wins and PnL of the trades fully inside each train and test window"""
+        stats = np.zeros((len(fold_list), 2, 3))
+        for k, fold in enumerate(fold_list):
+            windows = ((fold.train_start, fold.train_end), (fold.train_end, fold.test_end))
+            for part, (start, stop) in enumerate(windows):
+                inside = pnl[(opened >= start) & (closed <= stop)]
+                stats[k, part] = (len(inside), np.count_nonzero(inside > 0), inside.sum())
+        return stats
+
+    def _select(
+        self,
+        fold_list: List[Fold],
+        totals: Dict[Tuple[str, tuple], np.ndarray],
+        min_trades: int
+    ) -> pd.DataFrame:
+        """Pick the best train configuration per fold and strategy"""
+        rows = []
+        for k, fold in enumerate(fold_list):
+            for key in self.combinations:
+                candidates = [
+                    (params, stats[k]) for (strategy, params), stats in totals.items()
+                    if strategy == key and params is not CONFIGURED and stats[k, 0, 0] >= max(min_trades, 1)
+                ]
+                if not candidates:
+                    continue
+
+                # Best train PnL, then train win rate; grid order breaks ties
+                params, stats = max(
+                    candidates, key=lambda item: (item[1][0, 2], item[1][0, 1] / item[1][0, 0])
+                )
+                baseline = totals[(key, CONFIGURED)][k, 1]
+
+                rows.append({
+                    'fold': k + 1,
+                    'test_start': pd.Timestamp(fold.train_end),
+                    'strategy': key,
+                    'params': ', '.join(f"{name}={value}" for name, value in params),
+                    'train_trades': int(stats[0, 0]),
+                    'train_win_rate': self._win_rate(stats[0]),
+                    'train_pnl': round(stats[0, 2], 2),
+                    'test_trades': int(stats[1, 0]),
+                    'test_win_rate': self._win_rate(stats[1]),
+                    'test_pnl': round(stats[1, 2], 2),
+                    'configured_test_trades': int(baseline[0]),
+                    'configured_test_pnl': round(baseline[2], 2),
+                })
+
+        return pd.DataFrame(rows)
+
+    @staticmethod
+    def _win_rate(stats: np.ndarray) -> float:
+        return round(stats[1] / stats[0] * 100, 2) if stats[0] else 0.0
+
+
+if __name__ == "__main__":
+    from backtest import BacktestEngine
+
+    engine = BacktestEngine()
+    symbols = engine.data_fetcher.get_usdt_pairs()[:config.WALK_FORWARD_SYMBOLS]
+    days = config.WALK_FORWARD_TRAIN_DAYS + config.WALK_FORWARD_FOLDS * config.WALK_FORWARD_TEST_DAYS
+
+    engine.prepare_data(symbols, days)
+    if not engine.dataset.is_current(engine.store):
+        engine.dataset.build(engine.store)
+    history = {symbol: engine.dataset.load_symbol(symbol) for symbol in symbols}
+
+    table = WalkForward().run(history)
+    if table.empty:
+        print("No folds with enough trades")
+    else:
+        print(table.to_string())
+        print("\nOut-of-sample PnL per strategy (selected vs configured):")
+        print(table.groupby('strategy')[['test_pnl', 'configured_test_pnl']].sum().to_string())